@@ -1,7 +1,14 @@
 #!/usr/bin/env python3
-import json
 import sys
 import os
+import glob
+from concurrent.futures import ProcessPoolExecutor
+
+import aggregates
+import game_rules
+import storage
+import verification
+from names import norm
 
 # --------------------------------------
 # IO
@@ -9,12 +16,16 @@ import os
 def load_json(filename):
     if not os.path.exists(filename) or os.path.getsize(filename) == 0:
         return {"leagues by ID": {}}
-    with open(filename, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return storage.open_store(filename).load()
 
 def save_json(filename, data):
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    storage.open_store(filename).save(data)
+
+def load_season_data(store, league_id, year, weeks=None, transactions=True):
+    """Document holding (at least) this season; empty when the master doesn't exist yet."""
+    if not os.path.exists(store.path) or os.path.getsize(store.path) == 0:
+        return {"leagues by ID": {}}
+    return store.load_season(league_id, year, weeks=weeks, transactions=transactions)
 
 # --------------------------------------
 # Helpers / normalization
@@ -45,7 +56,10 @@ def clean_record_str(record_str: str) -> str:
     return cleaned
 
 def maybe_update_team_record(season, team):
-    """If the ingested record has more games played, update team record in teams list."""
+    """
+    If the ingested record has more games played, update team record in teams list.
+    Returns the updated team entry (or None if nothing changed).
+    """
     teams_section = season.get("teams", [])
     tid = team.get("team_id")
     new_record = team.get("record", "")
@@ -63,7 +77,9 @@ def maybe_update_team_record(season, team):
             if new_total > old_total:
                 t["record"] = new_record
                 print(f"🔄 Updated {t['name']} record: {old_w}-{old_l}-{old_t} → {new_record}")
+                return t
             break
+    return None
 
 def apply_team_update(season, update):
     """
@@ -90,21 +106,7 @@ def normalize_position(pos_raw):
 
 def calculate_team_totals(team: dict):
     """Recalculate team totals and warn if starters differ by >10 points."""
-    starters = team.get("starters", [])
-    bench = team.get("bench", [])
-
-    # unrounded sums
-    s_proj_sum = sum((p.get("player", {}) or {}).get("proj", 0.0) for p in starters)
-    s_fpts_sum = sum((p.get("player", {}) or {}).get("fpts", 0.0) for p in starters)
-    b_proj_sum = sum((p.get("player", {}) or {}).get("proj", 0.0) for p in bench)
-    b_fpts_sum = sum((p.get("player", {}) or {}).get("fpts", 0.0) for p in bench)
-
-    recomputed = {
-        "proj": round(s_proj_sum, 2),
-        "fpts": round(s_fpts_sum, 2),
-        "bench_proj": round(b_proj_sum, 2),
-        "bench_fpts": round(b_fpts_sum, 2),
-    }
+    recomputed = game_rules.roster_totals(team)
 
     # detect large mismatches (starters only)
     big_diff = False
@@ -206,8 +208,7 @@ def normalize_team(team: dict, side: str, game_id: str, alias_to_id: dict):
     team["record"] = clean_record_str(team.get("record", ""))
 
     # ✅ Assign team_id from aliases
-    name_key = team["name"].strip().lower()
-    team_id = alias_to_id.get(name_key)
+    team_id = alias_to_id.get(norm(team["name"]))
     if not team_id:
         raise ValueError(f"[{game_id} {side}] Unknown team name '{team['name']}'. Add to team_aliases.")
     team["team_id"] = team_id
@@ -280,69 +281,15 @@ def normalize_team(team: dict, side: str, game_id: str, alias_to_id: dict):
     return team, loud_warnings
 
 
-def verify_game(game: dict, game_id: str):
+def verify_game(game: dict, game_id: str, league=None):
     """
-    Abort on:
+    Abort on (game_rules.py, "ingest" profile + the league's "validation" block):
       - missing team names (manager ignored now)
       - broken starter row (missing name/team/position)
       - ESPN missing projections: proj == 0 while fpts > 0
-      - totals mismatch > ±0.05 (starters and bench)
+    Totals aren't re-summed: calculate_team_totals just built them from the rows.
     """
-    issues = []
-
-    def chk_team(side_key):
-        side = game.get(side_key, {})
-        name = norm_str(side.get("name", ""))
-        if not name:
-            issues.append(f"{game_id} {side_key}: Missing team name")
-
-        starters = side.get("starters", [])
-        bench = side.get("bench", [])
-        totals = side.get("totals", {})
-
-        # Broken starter rows
-        for i, s in enumerate(starters):
-            p = s.get("player", {})
-            nm = norm_str(p.get("name", ""))
-            tm = norm_str(p.get("team", ""))
-            pos = norm_str(p.get("position", ""))
-            if not (nm and tm and pos):
-                issues.append(f"{game_id} {side_key}: Broken starter row #{i+1} (name/team/position missing)")
-            # ESPN missing projections
-            proj = p.get("proj", 0.0)
-            fpts = p.get("fpts", 0.0)
-            if r2(proj) == 0.0 and r2(fpts) > 0.0:
-                issues.append(f"{game_id} {side_key}: ESPN missing projection for '{nm}' (proj=0.0, fpts={r2(fpts)})")
-
-        # Totals checks (recompute now, unrounded then round once)
-        s_proj_sum = sum((x.get("player", {}) or {}).get("proj", 0.0) for x in starters)
-        s_fpts_sum = sum((x.get("player", {}) or {}).get("fpts", 0.0) for x in starters)
-        b_proj_sum = sum((x.get("player", {}) or {}).get("proj", 0.0) for x in bench)
-        b_fpts_sum = sum((x.get("player", {}) or {}).get("fpts", 0.0) for x in bench)
-
-        t_proj = r2(s_proj_sum)
-        t_fpts = r2(s_fpts_sum)
-        tb_proj = r2(b_proj_sum)
-        tb_fpts = r2(b_fpts_sum)
-
-        def near(a, b, tol=0.05):
-            try:
-                return abs(float(a) - float(b)) <= tol
-            except Exception:
-                return False
-
-        if not near(totals.get("proj", None), t_proj):
-            issues.append(f"{game_id} {side_key}: Starters projected total mismatch (totals={totals.get('proj')}, sum={t_proj})")
-        if not near(totals.get("fpts", None), t_fpts):
-            issues.append(f"{game_id} {side_key}: Starters fpts total mismatch (totals={totals.get('fpts')}, sum={t_fpts})")
-        if not near(totals.get("bench_proj", None), tb_proj):
-            issues.append(f"{game_id} {side_key}: Bench projected total mismatch (totals={totals.get('bench_proj')}, sum={tb_proj})")
-        if not near(totals.get("bench_fpts", None), tb_fpts):
-            issues.append(f"{game_id} {side_key}: Bench fpts total mismatch (totals={totals.get('bench_fpts')}, sum={tb_fpts})")
-
-    chk_team("team_a")
-    chk_team("team_b")
-    return issues
+    return [i["message"] for i in game_rules.checker("ingest", league)(game, game_id)]
 
 # --------------------------------------
 # Game add/remove
@@ -353,7 +300,8 @@ def ensure_week_bucket(data, league_id, year, week, date_str):
 
     seasons = league.setdefault("seasons by ID", {})
     season_id = f"{league_id}S{year}"
-    season = seasons.setdefault(season_id, {"season_id": season_id, "year": int(year)})
+    season = seasons.setdefault(season_id, {"season_id": season_id, "year": int(year),
+                                            "aggregates": aggregates.empty_block()})
 
     games = season.setdefault("games", {})
     weeks = games.setdefault("weeks", {})
@@ -374,69 +322,77 @@ def generate_game_id(games, league_id, year, week):
     return f"{league_id}S{year}W{week}G{next_gnum}"
 
 
-def add_game(master_file, new_game_file, league_id, full_date, week):
-    # 1. Extract year from the full date string
-    year = full_date.split("-")[0]
-
-    # 2. Load JSON
-    data = load_json(master_file)
-
-    # 3. Ensure the week bucket exists and set the date
-    games = ensure_week_bucket(data, league_id, year, week, full_date)
-
-    # 4. Grab the season node
-    season_id = f"{league_id}S{year}"
-    season = data["leagues by ID"][league_id]["seasons by ID"][season_id]
-
-    # 5. Build alias → team_id mapping from season teams
+def build_alias_map(season):
+    """alias/name (lowercased) → team_id for one season."""
     alias_to_id = {}
-    teams_section = season.get("teams", [])
-    for team in teams_section:
+    for team in season.get("teams", []):
         tid = team.get("team_id")
-        name = team.get("name", "").strip().lower()
+        name = norm(team.get("name", ""))
         if tid and name:
             alias_to_id[name] = tid
         for alias in team.get("aliases", []):
-            alias_to_id[alias.strip().lower()] = tid
+            alias_to_id[norm(alias)] = tid
+    return alias_to_id
 
-    # 6. Use a temp ID for context while normalizing
-    temp_id = f"S{year}W{week}G?"
-
-    # 7. Load the new game file
-    new_game_data = load_json(new_game_file)
+def prepare_game(new_game_data, temp_id, alias_to_id):
+    """Normalize a raw new_game document → (team_a, team_b, warnings)."""
     if not isinstance(new_game_data, dict):
         raise ValueError("new_game.json must be an object")
     if not {"team_a", "team_b"} <= set(new_game_data.keys()):
         raise ValueError("new_game.json must contain 'team_a' and 'team_b'")
 
-    # 8. Strip out any 'score' fields
+    # Strip out any 'score' fields
     new_game_data["team_a"].pop("score", None)
     new_game_data["team_b"].pop("score", None)
 
-    # 9. Normalize both teams
     team_a, warn_a = normalize_team(new_game_data["team_a"], "team_a", temp_id, alias_to_id)
     team_b, warn_b = normalize_team(new_game_data["team_b"], "team_b", temp_id, alias_to_id)
 
-    # 10. Recalculate totals
     calculate_team_totals(team_a)
     calculate_team_totals(team_b)
+    return team_a, team_b, warn_a + warn_b
+
+def add_game(master_file, new_game_file, league_id, full_date, week, stage=False):
+    # 1. Extract year from the full date string
+    year = full_date.split("-")[0]
+
+    # 2. Load the season from the master store
+    store = storage.open_store(master_file, stage=stage)
+    data = load_season_data(store, league_id, year, weeks=[week], transactions=False)
+
+    # 3. Ensure the week bucket exists and set the date
+    games = ensure_week_bucket(data, league_id, year, week, full_date)
+
+    # 4. Grab the season node
+    season_id = f"{league_id}S{year}"
+    season = data["leagues by ID"][league_id]["seasons by ID"][season_id]
+
+    # 5. Build alias → team_id mapping from season teams
+    alias_to_id = build_alias_map(season)
+
+    # 6.-10. Load the new game file and normalize both teams (temp ID for context)
+    temp_id = f"S{year}W{week}G?"
+    team_a, team_b, warnings = prepare_game(load_json(new_game_file), temp_id, alias_to_id)
 
     # 11. Update records if needed (now season-scoped!)
-    maybe_update_team_record(season, team_a)
-    maybe_update_team_record(season, team_b)
+    changes = []
+    for team in (team_a, team_b):
+        updated = maybe_update_team_record(season, team)
+        if updated:
+            changes.append({"op": "set_team", "season_id": season_id, "team": updated})
 
     # 12. Build the final game entry
     game_id = generate_game_id(games,league_id, year, week)
     new_game = {"game_id": game_id, "team_a": team_a, "team_b": team_b}
 
     # 13. Verify and fail fast on issues
-    issues = verify_game(new_game, game_id)
+    issues = verify_game(new_game, game_id, data["leagues by ID"][league_id])
     if issues:
         out = "\n - " + "\n - ".join(issues)
         raise ValueError(f"Verification FAILED:{out}")
 
     # 14. Print any non-fatal warnings
-    for w in (warn_a + warn_b):
+    for w in warnings:
         print(w)
 
     # 15. Check for duplicate matchups
@@ -446,10 +402,147 @@ def add_game(master_file, new_game_file, league_id, full_date, week):
 
     # 16. Save and log
     games.append(new_game)
-    save_json(master_file, data)
+    aggregates.add_game(season, new_game, week)
+    changes.append({"op": "add_game", "season_id": season_id, "week": week,
+                    "date": full_date, "game": new_game})
+    store.commit(data, changes)
+    if not stage:
+        verification.remember(master_file, season, [new_game], data["leagues by ID"][league_id])
     print(f"✅ Game {game_id} added for Week {week}, {year} ({full_date}): "
           f"{team_a['name']} vs {team_b['name']} → saved to {master_file}")
 
+# --------------------------------------
+# Batch add
+# --------------------------------------
+POOL_MIN_FILES = 8  # below this, process startup costs more than it saves
+
+def collect_game_files(source):
+    """A directory (every *.json inside) or a glob pattern → sorted file list."""
+    if os.path.isdir(source):
+        files = glob.glob(os.path.join(source, "*.json"))
+    else:
+        files = glob.glob(source)
+    return sorted(f for f in files if os.path.isfile(f))
+
+def read_game_files(files):
+    """{path: parsed game, or the exception that reading it raised} - each file is parsed once."""
+    raws = {}
+    for path in files:
+        try:
+            raws[path] = load_json(path)
+        except Exception as e:
+            raws[path] = e
+    return raws
+
+def _prepare_file(job):
+    """Pool worker: normalize one parsed game file. Never raises."""
+    path, raw, temp_id, alias_to_id = job
+    try:
+        if isinstance(raw, Exception):
+            raise raw
+        week, date = (raw.get("week"), raw.get("date")) if isinstance(raw, dict) else (None, None)
+        team_a, team_b, warnings = prepare_game(raw, temp_id, alias_to_id)
+        return {"file": path, "week": week, "date": date,
+                "team_a": team_a, "team_b": team_b, "warnings": warnings, "error": None}
+    except Exception as e:
+        return {"file": path, "error": str(e)}
+
+def print_batch_report(results):
+    print("📋 Batch report:")
+    for r in results:
+        name = os.path.basename(r["file"])
+        if r.get("issues"):
+            print(f"  ❌ {name}")
+            for issue in r["issues"]:
+                print(f"     - {issue}")
+        else:
+            print(f"  ✅ {name} → {r['game_id']}")
+
+def add_games_batch(master_file, source, league_id, full_date, week, workers=None, stage=False):
+    """
+    Add every game file in `source` (directory or glob) in one pass: load the
+    season once, normalize in a process pool, verify all, commit once.
+    A file may carry its own "week"/"date" keys (season backfills); otherwise
+    the CLI week/date apply. Any failure rejects the whole batch.
+    """
+    files = collect_game_files(source)
+    if not files:
+        raise ValueError(f"No game files found for '{source}'")
+
+    year = full_date.split("-")[0]
+    season_id = f"{league_id}S{year}"
+
+    # Parse every file once; their weeks decide which buckets are loaded
+    raws = read_game_files(files)
+    weeks_needed = {week}
+    for raw in raws.values():
+        if isinstance(raw, dict) and raw.get("week") is not None:
+            weeks_needed.add(int(raw["week"]))
+
+    store = storage.open_store(master_file, stage=stage)
+    data = load_season_data(store, league_id, year, weeks=sorted(weeks_needed), transactions=False)
+    league = data.setdefault("leagues by ID", {}).setdefault(league_id, {"league_id": league_id})
+    season = league.setdefault("seasons by ID", {}).setdefault(
+        season_id, {"season_id": season_id, "year": int(year), "aggregates": aggregates.empty_block()})
+    alias_to_id = build_alias_map(season)
+
+    # 1. Normalize (in parallel for big backfills; map keeps file order)
+    jobs = [(path, raws[path], f"S{year}W?G? {os.path.basename(path)}", alias_to_id) for path in files]
+    if workers != 1 and len(files) >= POOL_MIN_FILES:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            prepared = list(pool.map(_prepare_file, jobs))
+    else:
+        prepared = [_prepare_file(job) for job in jobs]
+
+    # 2. Assign IDs in file order, verify, check duplicates
+    results, changes, warnings = [], [], []
+    for r in prepared:
+        r["issues"] = [r["error"]] if r["error"] else []
+        results.append(r)
+        if r["error"]:
+            continue
+
+        wk = int(r["week"]) if r["week"] is not None else week
+        date = r["date"] or full_date
+        games = ensure_week_bucket(data, league_id, year, wk, date)
+        team_a, team_b = r["team_a"], r["team_b"]
+
+        game_id = generate_game_id(games, league_id, year, wk)
+        new_game = {"game_id": game_id, "team_a": team_a, "team_b": team_b}
+        r["game_id"], r["game_new"] = game_id, new_game
+
+        r["issues"] = verify_game(new_game, game_id, league)
+        for g in games:
+            if g.get("team_a", {}).get("name") == team_a["name"] and g.get("team_b", {}).get("name") == team_b["name"]:
+                r["issues"].append(f"Duplicate matchup in Week {wk}: {team_a['name']} vs {team_b['name']}")
+                break
+        if r["issues"]:
+            continue
+
+        warnings.extend(r["warnings"])
+        for team in (team_a, team_b):
+            updated = maybe_update_team_record(season, team)
+            if updated:
+                changes.append({"op": "set_team", "season_id": season_id, "team": updated})
+        games.append(new_game)
+        aggregates.add_game(season, new_game, wk)
+        changes.append({"op": "add_game", "season_id": season_id, "week": wk,
+                        "date": date, "game": new_game})
+
+    print_batch_report(results)
+    failed = [r for r in results if r["issues"]]
+    if failed:
+        raise ValueError(f"Batch REJECTED: {len(failed)} of {len(results)} file(s) failed. No changes written.")
+
+    for w in warnings:
+        print(w)
+
+    # 3. One commit for the whole batch
+    store.commit(data, changes)
+    if not stage:
+        verification.remember(master_file, season, [r["game_new"] for r in results], league)
+    print(f"✅ Added {len(results)} game(s) to {season_id} in one commit → saved to {master_file}")
+
 def preview_remove(games, game_id, season_id, week):
     idx = next((i for i, g in enumerate(games) if g.get("game_id") == game_id), None)
     if idx is None:
@@ -470,7 +563,7 @@ def preview_remove(games, game_id, season_id, week):
         print("  • No subsequent games to reindex.")
 
 
-def apply_remove(master_file, data, games, season_id, year, week, game_id):
+def apply_remove(store, data, games, season_id, year, week, game_id):
     idx = next((i for i, g in enumerate(games) if g.get("game_id") == game_id), None)
     if idx is None:
         raise ValueError(f"No game with id '{game_id}' found in Week {week}.")
@@ -481,18 +574,20 @@ def apply_remove(master_file, data, games, season_id, year, week, game_id):
     for j, g in enumerate(games, start=1):
         g["game_id"] = f"{season_id}W{week}G{j}"
 
-    save_json(master_file, data)
+    league_id = season_id.split("S")[0]
+    aggregates.remove_game(data["leagues by ID"][league_id]["seasons by ID"][season_id], removed, week)
+
+    store.commit(data, [{"op": "remove_game", "season_id": season_id, "week": week, "game_id": game_id,
+                         "game": removed}])
 
     a = removed.get("team_a", {}).get("name", "<unknown A>")
     b = removed.get("team_b", {}).get("name", "<unknown B>")
-    print(f"🗑️ Removed {game_id} (Week {week}): {a} vs {b} → saved to {master_file}")
+    print(f"🗑️ Removed {game_id} (Week {week}): {a} vs {b} → saved to {store.path}")
     if idx < len(games):
         print("🔁 Reindexed subsequent game IDs successfully.")
 
 
-def remove_game(master_file, game_id, non_interactive=False):
-    data = load_json(master_file)
-
+def remove_game(master_file, game_id, non_interactive=False, stage=False):
     # Parse league, season, week from game_id
     try:
         league_id = game_id.split("S")[0]           # L001
@@ -502,6 +597,9 @@ def remove_game(master_file, game_id, non_interactive=False):
     except Exception:
         raise ValueError(f"Invalid game_id format: {game_id}")
 
+    store = storage.open_store(master_file, stage=stage)
+    data = load_season_data(store, league_id, year, weeks=[week], transactions=False)
+
     # Clean checks instead of KeyErrors
     leagues = data.get("leagues by ID", {})
     if league_id not in leagues:
@@ -523,20 +621,63 @@ def remove_game(master_file, game_id, non_interactive=False):
 
     confirm = "y" if non_interactive else input("Type 'y' to confirm removal and reindexing: ").strip().lower()
     if confirm == "y":
-        apply_remove(master_file, data, games, season_id, year, week, game_id)
+        apply_remove(store, data, games, season_id, year, week, game_id)
     else:
         print("❎ Removal canceled. No changes written.")
 
+# --------------------------------------
+# Aggregates
+# --------------------------------------
+def rebuild_aggregates(master_file, season_ids=None, check=False):
+    """
+    Recompute every season's team aggregates from its games and compare with
+    the stored block. check=True only reports; otherwise drifted or missing
+    blocks are written back. Returns the number of seasons that differed.
+    """
+    store = storage.open_store(master_file)
+    data = store.load()
+    changes, drifted = [], 0
+
+    for league_id, league in data.get("leagues by ID", {}).items():
+        for season_id, season in league.get("seasons by ID", {}).items():
+            if season_ids and season_id not in season_ids:
+                continue
+            rebuilt = aggregates.rebuild(season)
+            problems = aggregates.diff(season.get("aggregates"), rebuilt)
+            if problems:
+                drifted += 1
+                print(f"⚠️ {season_id}: {len(problems)} aggregate difference(s)")
+                for p in problems[:10]:
+                    print(f"   - {p}")
+                changes.append({"op": "set_aggregates", "season_id": season_id, "aggregates": rebuilt})
+                season["aggregates"] = rebuilt
+            else:
+                played = sum(t["games"] for t in rebuilt["teams"].values()) // 2
+                print(f"✅ {season_id}: aggregates match {played} game(s)")
+            aggregates.print_standings(season["aggregates"] if not check else rebuilt)
+
+    if changes and not check:
+        store.commit(data, changes)
+        print(f"💾 Rewrote aggregates for {len(changes)} season(s) → {master_file}")
+    return drifted
+
 # --------------------------------------
 # CLI
 # --------------------------------------
 def usage():
     print("Usage:")
     print("  Add:    python add_remove_game.py add <master_file.json> <new_game.json> <league_id> <YYYY-MM-DD> <week>")
+    print("  Batch:  python add_remove_game.py add-batch <master_file.json> <dir|glob> <league_id> <YYYY-MM-DD> <week> [--workers N]")
     print("  Remove: python add_remove_game.py remove <master_file.json> <game_id> [--yes]")
+    print("  Rebuild aggregates: python add_remove_game.py rebuild-aggregates <master_file.json> [season_id ...] [--check]")
+    print("  Add --stage to park the change in <master_file>.staged/ for 'storage.py merge'.")
     sys.exit(1)
 
 if __name__ == "__main__":
+    stage = "--stage" in sys.argv
+    if stage:
+        sys.argv.remove("--stage")
+
     if len(sys.argv) < 2:
         usage()
 
@@ -547,7 +688,23 @@ if __name__ == "__main__":
             usage()
         _, _, master_file, new_game_file, league_id, full_date, week = sys.argv
         try:
-            add_game(master_file, new_game_file, league_id, full_date, int(week))
+            add_game(master_file, new_game_file, league_id, full_date, int(week), stage=stage)
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+
+    elif cmd == "add-batch":
+        workers = None
+        if "--workers" in sys.argv:
+            i = sys.argv.index("--workers")
+            workers = int(sys.argv[i + 1])
+            del sys.argv[i:i + 2]
+        if len(sys.argv) != 7:
+            usage()
+        _, _, master_file, source, league_id, full_date, week = sys.argv
+        try:
+            add_games_batch(master_file, source, league_id, full_date, int(week),
+                            workers=workers, stage=stage)
         except Exception as e:
             print(f"❌ Error: {e}")
             sys.exit(1)
@@ -561,10 +718,23 @@ if __name__ == "__main__":
         non_interactive = (len(sys.argv) == 5 and sys.argv[4] == "--yes")
 
         try:
-            remove_game(master_file, game_id, non_interactive=non_interactive)
+            remove_game(master_file, game_id, non_interactive=non_interactive, stage=stage)
         except Exception as e:
             print(f"❌ Error: {e}")
             sys.exit(1)
 
+    elif cmd == "rebuild-aggregates":
+        check = "--check" in sys.argv
+        args = [a for a in sys.argv[2:] if a != "--check"]
+        if not args:
+            usage()
+        try:
+            drifted = rebuild_aggregates(args[0], set(args[1:]), check=check)
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+        if check and drifted:
+            sys.exit(1)
+
     else:
         usage()
@@ -3,17 +3,19 @@ import argparse
 import re
 from datetime import datetime
 
+import aggregates
+import storage
+from names import norm
+
 # ----------------------
 # Helpers
 # ----------------------
 
 def load_json(path):
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return storage.open_store(path).load()
 
 def save_json(path, data):
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    storage.open_store(path).save(data)
 
 def season_id_for(league_id: str, year: int | str) -> str:
     return f"{league_id}S{int(year)}"
@@ -26,7 +28,7 @@ def get_season_node(data: dict, league_id: str, year: int | str, create: bool =
         leagues = data.setdefault("leagues by ID", {})
         league = leagues.setdefault(league_id, {"league_id": league_id})
         seasons = league.setdefault("seasons by ID", {})
-        return seasons.setdefault(sid, {"season_id": sid, "year": year})
+        return seasons.setdefault(sid, {"season_id": sid, "year": year, "aggregates": aggregates.empty_block()})
 
     # read-only / validate path
     leagues = data.get("leagues by ID", {})
@@ -81,9 +83,6 @@ def reindex_transactions(transactions, league_id, year):
         t["transaction_id"] = f"{season_id}T{i:05d}"
     return transactions
 
-def _norm(s):
-    return (s or "").strip().lower()
-
 def get_team_objects(data, league_id, year):
     season = get_season_node(data, league_id, year, create=False)
     # prefer "teams", fallback to "team_aliases"
@@ -101,14 +100,14 @@ def build_alias_map(data, league_id, year):
         tid = team.get("team_id")
         if not tid:
             continue
-        name = _norm(team.get("name"))
+        name = norm(team.get("name"))
         if name:
             alias_to_id[name] = tid
         for alias in team.get("aliases", []) or []:
-            a = _norm(alias)
+            a = norm(alias)
             if a:
                 alias_to_id[a] = tid
-        ab = _norm(team.get("abbrev"))
+        ab = norm(team.get("abbrev"))
         if ab:
             alias_to_id[ab] = tid
     return alias_to_id
@@ -145,47 +144,48 @@ def validate_tx_ids_for_remove(transactions: list, ids: list[str]) -> list[int]:
 def resolve_team_id(alias_to_id, team_name):
     if not team_name:
         return None
-    return alias_to_id.get(_norm(team_name))
+    return alias_to_id.get(norm(team_name))
 
 def alias_exists_globally(data, year, alias, owner_team_id=None):
     """Check if alias already exists on another team."""
-    a_norm = _norm(alias)
+    a_norm = norm(alias)
     for team in get_team_objects(data, year):
         tid = team.get("team_id")
         if owner_team_id and tid == owner_team_id:
             continue
-        if _norm(team.get("name")) == a_norm:
+        if norm(team.get("name")) == a_norm:
             return True
         for al in team.get("aliases", []) or []:
-            if _norm(al) == a_norm:
+            if norm(al) == a_norm:
                 return True
     return False
 
 def find_team_by_name_or_alias(data, league_id, year, target_name, target_abbrev=None):
-    t_norm = _norm(target_name)
-    a_norm = _norm(target_abbrev) if target_abbrev else None
+    t_norm = norm(target_name)
+    a_norm = norm(target_abbrev) if target_abbrev else None
     for team in get_team_objects(data, league_id, year):
-        if _norm(team.get("name")) == t_norm:
+        if norm(team.get("name")) == t_norm:
             return team
-        if a_norm and _norm(team.get("abbrev")) == a_norm:
+        if a_norm and norm(team.get("abbrev")) == a_norm:
             return team
         for al in team.get("aliases", []) or []:
-            if _norm(al) == t_norm:
+            if norm(al) == t_norm:
                 return team
     return None
 
 def apply_team_update(data, league_id, year, update):
+    """Apply a team_update in place; returns the updated team (or None)."""
     new_name   = update.get("new_name")
     old_name   = update.get("old_name")
     old_abbrev = update.get("old_abbrev")
     if not new_name:
-        return
+        return None
 
     # find team in this season
     team = find_team_by_name_or_alias(data, league_id, year, new_name)
     if not team:
         print(f"⚠️ team_update: could not find team for new_name='{new_name}'")
-        return
+        return None
 
     team.setdefault("aliases", [])
 
@@ -193,7 +193,7 @@ def apply_team_update(data, league_id, year, update):
         team["name"] = new_name
 
     def _has_alias(val):
-        return _norm(val) in (_norm(a) for a in team["aliases"])
+        return norm(val) in (norm(a) for a in team["aliases"])
 
     if old_name and not _has_alias(old_name):
         team["aliases"].append(old_name)
@@ -201,6 +201,8 @@ def apply_team_update(data, league_id, year, update):
     if old_abbrev and not _has_alias(old_abbrev):
         team["aliases"].append(old_abbrev)
 
+    return team
+
 def is_duplicate(existing, new_entry):
     """Return True if new_entry matches an existing transaction."""
     keys_to_check = ["date", "time", "type", "method"]
@@ -244,7 +246,11 @@ def ensure_transaction_bucket(data, league_id, year):
 # Core logic
 # ----------------------
 
-def add_transactions(data, league_id, year, new_data):
+def add_transactions(data, league_id, year, new_data, changes=None):
+    """
+    Merge new_data's transactions into the season in place.
+    If `changes` is a list, the storage change records are appended to it.
+    """
     year = int(year)
     transactions, season_id, season = ensure_transaction_bucket(data, league_id, year)
 
@@ -256,6 +262,7 @@ def add_transactions(data, league_id, year, new_data):
 
     alias_to_id = build_alias_map(data, league_id, year)
     added_count = 0
+    added_entries, team_changes = [], []
 
     for entry in new_data.get("transactions", []):
         for e in entry.get("entries", []):
@@ -275,10 +282,14 @@ def add_transactions(data, league_id, year, new_data):
 
             dt = parse_datetime(year, entry["date"], e["time"])
             flat.append((dt, e))
+            added_entries.append(dict(e))
             added_count += 1
 
             if e.get("type") == "team_update":
-                apply_team_update(data, league_id, year, e)
+                team = apply_team_update(data, league_id, year, e)
+                if team:
+                    team_changes.append({"op": "set_team", "season_id": season_id,
+                                         "team": {**team, "aliases": list(team["aliases"])}})
                 alias_to_id = build_alias_map(data, league_id, year)
 
     # sort oldest → newest, reindex IDs T00001...
@@ -288,10 +299,15 @@ def add_transactions(data, league_id, year, new_data):
 
     # write back to this season, not root
     season["transactions"] = sorted_entries
+
+    if changes is not None:
+        changes.extend(team_changes)
+        if added_entries:
+            changes.append({"op": "add_transactions", "season_id": season_id, "entries": added_entries})
     return added_count
 
-def remove_transactions(data, ids_or_range):
-    # Expand the input into a list of IDs
+def expand_tx_ids(ids_or_range):
+    """Expand 'ID', 'ID,ID,...' or 'ID-ID' into a list of transaction IDs."""
     s = ids_or_range.strip()
     if "-" in s and "," not in s:
         start, end = s.split("-", 1)
@@ -311,25 +327,35 @@ def remove_transactions(data, ids_or_range):
         ids = [x.strip() for x in s.split(",") if x.strip()]
     else:
         ids = [s]
+    return ids
 
-    # Use the first ID to locate the season
+def season_for_tx_ids(ids):
+    """Use the first ID to locate the season -> (season_id, league_id, year)."""
     m = TX_ID_RE.match(ids[0])
     if not m:
         raise ValueError(f"Invalid transaction_id format: {ids[0]}")
     season_id = m.group(1)  # e.g., L001S2025
     league_id = season_id[:4]  # L001
     year = int(season_id[5:])  # 2025
+    return season_id, league_id, year
+
+def remove_transactions(data, ids_or_range, changes=None):
+    ids = expand_tx_ids(ids_or_range)
+    season_id, league_id, year = season_for_tx_ids(ids)
 
     transactions, _, season = ensure_transaction_bucket(data, league_id, year)
     if not transactions:
         raise ValueError(f"No transactions found for season {season_id}.")
 
     indices = validate_tx_ids_for_remove(transactions, ids)
-    for idx in indices:
-        transactions.pop(idx)
+    removed = [transactions.pop(idx) for idx in indices]
 
     reindex_transactions(transactions, league_id, year)
     season["transactions"] = transactions
+
+    if changes is not None:
+        changes.append({"op": "remove_transactions", "season_id": season_id, "ids": ids,
+                        "entries": [dict(t) for t in reversed(removed)]})
     return len(indices)
 
 
@@ -342,6 +368,7 @@ def usage():
     print("Usage:")
     print("  Add:    python add_remove_transaction.py add <master_file.json> <league_id> <year> <new_tx.json>")
     print("  Remove: python add_remove_transaction.py remove <master_file.json> <transaction_id(s)|range>")
+    print("  Add --stage to park the change in <master_file>.staged/ for 'storage.py merge'.")
     sys.exit(1)
 
 
@@ -350,8 +377,8 @@ def main():
     parser = argparse.ArgumentParser(
     description="Add or remove transactions from master fantasy file.",
     usage=(
-        "python add_remove_transaction.py add <master_file.json> <league_id> <year> <new_tx.json>\n"
-        "python add_remove_transaction.py remove <master_file.json> <transaction_id(s)|range>"
+        "python add_remove_transaction.py add <master_file.json> <league_id> <year> <new_tx.json> [--stage]\n"
+        "python add_remove_transaction.py remove <master_file.json> <transaction_id(s)|range> [--stage]"
     )
 )
 
@@ -364,6 +391,8 @@ def main():
         parser.add_argument("league_id", help="League ID, e.g. L001")
         parser.add_argument("year", type=int, help="Season year, e.g. 2025")
     parser.add_argument("target", help="New tx file (add) OR transaction_id(s)/range (remove)")
+    parser.add_argument("--stage", action="store_true",
+                        help="Stage the change for 'storage.py merge' instead of writing the master")
 
     # ✅ if no args, just show usage and exit clean
     if len(sys.argv) == 1:
@@ -374,16 +403,20 @@ def main():
 
 
     try:
-        data = load_json(args.master_file)
+        store = storage.open_store(args.master_file, stage=args.stage)
+        changes = []
 
         if args.mode == "add":
+            data = store.load_season(args.league_id, args.year, weeks=[])
             new_data = load_json(args.target)
-            count = add_transactions(data, args.league_id, args.year, new_data)
-            save_json(args.master_file, data)
+            count = add_transactions(data, args.league_id, args.year, new_data, changes)
+            store.commit(data, changes)
             print(f"✅ Added {count} transaction(s) into {args.master_file} for {args.league_id} {args.year}.")
         elif args.mode == "remove":
-            removed_count = remove_transactions(data, args.target)
-            save_json(args.master_file, data)
+            _, league_id, year = season_for_tx_ids(expand_tx_ids(args.target))
+            data = store.load_season(league_id, year, weeks=[])
+            removed_count = remove_transactions(data, args.target, changes)
+            store.commit(data, changes)
             print(f"🗑️ Removed {removed_count} transaction(s).")
         else:
             usage()
@@ -0,0 +1,117 @@
+# Materialized per-team season aggregates, kept in season["aggregates"]:
+#
+#   {"form_games": 5,
+#    "teams": {team_id: {"name", "games", "wins", "losses", "ties",
+#                        "pf", "pa", "bench_pf", "proj_pf",
+#                        "results": [[week, "W"], ...], "form": "WWLWT"}}}
+#
+# add_game / remove_game apply one game as a delta, so ingest never walks the
+# season's other weeks (and works on the partial seasons load_season returns).
+# rebuild() recomputes the block from every game; `add_remove_game.py
+# rebuild-aggregates` compares the two. Seasons without a block are left alone
+# by the deltas until a rebuild (or migrate.py) creates one.
+
+FORM_GAMES = 5
+RESULT_FIELDS = ("wins", "losses", "ties")
+
+def empty_block() -> dict:
+    return {"form_games": FORM_GAMES, "teams": {}}
+
+def _score(team, key):
+    try:
+        return round(float((team.get("totals") or {}).get(key, 0.0)), 2)
+    except (TypeError, ValueError):
+        return 0.0
+
+def _team_key(team):
+    return team.get("team_id") or team.get("name") or "?"
+
+def game_lines(game):
+    """One (team_key, name, pf, pa, bench_pf, proj_pf, result) per side of a game."""
+    a, b = game.get("team_a") or {}, game.get("team_b") or {}
+    a_pts, b_pts = _score(a, "fpts"), _score(b, "fpts")
+    lines = []
+    for team, pf, pa in ((a, a_pts, b_pts), (b, b_pts, a_pts)):
+        result = "W" if pf > pa else "L" if pf < pa else "T"
+        lines.append((_team_key(team), team.get("name", ""), pf, pa,
+                      _score(team, "bench_fpts"), _score(team, "proj"), result))
+    return lines
+
+def _form(results, n):
+    return "".join(r for _, r in results[-n:])
+
+def apply_game(block, game, week, sign=1):
+    """Add (sign=1) or subtract (sign=-1) one game's contribution."""
+    week = int(week)
+    for key, name, pf, pa, bench, proj, result in game_lines(game):
+        t = block["teams"].setdefault(key, {
+            "name": name, "games": 0, "wins": 0, "losses": 0, "ties": 0,
+            "pf": 0.0, "pa": 0.0, "bench_pf": 0.0, "proj_pf": 0.0, "results": [], "form": ""})
+        if name:
+            t["name"] = name
+        t["games"] += sign
+        t[RESULT_FIELDS["WLT".index(result)]] += sign
+        for field, value in (("pf", pf), ("pa", pa), ("bench_pf", bench), ("proj_pf", proj)):
+            t[field] = round(t[field] + sign * value, 2)
+
+        entry = [week, result]
+        if sign > 0:
+            # keep results in week order; a same-week game goes after its siblings
+            at = next((i for i, (w, _) in enumerate(t["results"]) if w > week), len(t["results"]))
+            t["results"].insert(at, entry)
+        elif entry in t["results"]:
+            # drop the last matching entry (mirrors insertion order)
+            t["results"].pop(len(t["results"]) - 1 - t["results"][::-1].index(entry))
+        t["form"] = _form(t["results"], block.get("form_games", FORM_GAMES))
+
+        if t["games"] <= 0:
+            del block["teams"][key]
+
+def add_game(season, game, week):
+    if isinstance(season.get("aggregates"), dict):
+        apply_game(season["aggregates"], game, week, 1)
+
+def remove_game(season, game, week):
+    if isinstance(season.get("aggregates"), dict):
+        apply_game(season["aggregates"], game, week, -1)
+
+def rebuild(season) -> dict:
+    """Aggregates from every game in the season (weeks in numeric order)."""
+    block = empty_block()
+    weeks = season.get("games", {}).get("weeks", {})
+    for week in sorted(weeks, key=lambda w: int(w)):
+        for game in weeks[week].get("games", []):
+            apply_game(block, game, week, 1)
+    return block
+
+def diff(stored, rebuilt, tol=0.01):
+    """Human-readable differences between a stored block and a rebuilt one."""
+    if not isinstance(stored, dict):
+        return ["no aggregates block"]
+    out = []
+    old, new = stored.get("teams", {}), rebuilt.get("teams", {})
+    for key in sorted(set(old) | set(new)):
+        a, b = old.get(key), new.get(key)
+        if a is None or b is None:
+            out.append(f"{key}: {'missing' if a is None else 'extra'} team")
+            continue
+        for field, value in b.items():
+            have = a.get(field)
+            if isinstance(value, float):
+                if not isinstance(have, (int, float)) or abs(have - value) > tol:
+                    out.append(f"{key} {field}: stored {have} vs games {value}")
+            elif have != value:
+                out.append(f"{key} {field}: stored {have!r} vs games {value!r}")
+    return out
+
+def standings(block):
+    """Teams sorted by wins, then ties, then points for - O(teams)."""
+    teams = (block or {}).get("teams", {})
+    return sorted(teams.items(), key=lambda kv: (-kv[1]["wins"], -kv[1]["ties"], -kv[1]["pf"]))
+
+def print_standings(block):
+    print(f"  {'team':<28} {'W-L-T':>7} {'PF':>8} {'PA':>8} {'bench':>8} {'proj':>8}  form")
+    for key, t in standings(block):
+        record = f"{t['wins']}-{t['losses']}-{t['ties']}"
+        print(f"  {t['name'][:28]:<28} {record:>7} {t['pf']:8.2f} {t['pa']:8.2f} "
+              f"{t['bench_pf']:8.2f} {t['proj_pf']:8.2f}  {t['form']}")
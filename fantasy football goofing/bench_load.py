@@ -0,0 +1,91 @@
+"""
+Time master-file loads with and without the snapshot cache.
+
+Builds a big synthetic master by cloning the seasons in <fantasy.json>
+across extra leagues/years, then compares a plain json.load against a
+cold (cache rebuilt) and warm (cache hit) storage load.
+
+Usage:
+  python bench_load.py [fantasy.json] [--copies N] [--runs N]
+"""
+
+import copy
+import json
+import os
+import sys
+import tempfile
+import time
+
+import storage
+
+def arg(flag, default):
+    if flag in sys.argv:
+        return int(sys.argv[sys.argv.index(flag) + 1])
+    return default
+
+def build_master(src, copies):
+    with open(src, "r", encoding="utf-8") as f:
+        base = json.load(f)
+    seasons = [s for lg in base.get("leagues by ID", {}).values()
+               for s in lg.get("seasons by ID", {}).values()]
+    if not seasons:
+        sys.exit(f"❌ No seasons in {src}")
+
+    leagues = {}
+    for n in range(copies):
+        lid = f"L{n + 1:03d}"
+        league = leagues.setdefault(lid, {"league_id": lid, "seasons by ID": {}})
+        for season in seasons:
+            year = int(season.get("year", 2025)) - n % 10
+            sid = f"{lid}S{year}"
+            clone = copy.deepcopy(season)
+            clone["season_id"], clone["year"] = sid, year
+            league["seasons by ID"][sid] = clone
+    return {"leagues by ID": leagues}
+
+def best_of(fn, runs):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        took = time.perf_counter() - start
+        best = took if best is None else min(best, took)
+    return best
+
+def main():
+    args = [a for i, a in enumerate(sys.argv[1:], 1)
+            if not a.startswith("--") and not sys.argv[i - 1].startswith("--")]
+    src = args[0] if args else "fantasy.json"
+    copies, runs = arg("--copies", 40), arg("--runs", 5)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "master.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(build_master(src, copies), f, indent=2)
+        size_mb = os.path.getsize(path) / 1e6
+        cache = path + storage.CACHE_SUFFIX
+
+        def plain():
+            with open(path, "r", encoding="utf-8") as f:
+                json.load(f)
+
+        def cold():
+            if os.path.exists(cache):
+                os.remove(cache)
+            storage.open_store(path).load()
+
+        def warm():
+            storage.open_store(path).load()
+
+        t_plain = best_of(plain, runs)
+        t_cold = best_of(cold, runs)
+        warm()
+        t_warm = best_of(warm, runs)
+
+        print(f"📦 {size_mb:.1f} MB master ({copies} copies), best of {runs}")
+        print(f"   json.load      {t_plain * 1000:8.1f} ms")
+        print(f"   cold (rebuild) {t_cold * 1000:8.1f} ms")
+        print(f"   warm (cache)   {t_warm * 1000:8.1f} ms   ({t_plain / t_warm:.1f}x faster)")
+
+if __name__ == "__main__":
+    main()
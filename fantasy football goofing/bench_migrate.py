@@ -0,0 +1,79 @@
+"""
+Time a full schema upgrade: one load/save per migration (the old
+migrate_game_ids.py + migrate_tx_ids.py way) against migrate.py's single pass.
+
+Builds a big synthetic master with bench_load.build_master, scrambles the
+game/transaction IDs and resets schema_version to 0, then upgrades a fresh
+copy both ways and checks the results match.
+
+Usage:
+  python bench_migrate.py [fantasy.json] [--copies N]
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import migrate
+import storage
+from bench_load import arg, build_master
+
+def scrambled_master(src, copies):
+    data = build_master(src, copies)
+    for league in data["leagues by ID"].values():
+        for season in league["seasons by ID"].values():
+            for wk in season.get("games", {}).get("weeks", {}).values():
+                for g in wk.get("games", []):
+                    g["game_id"] = "X" + str(g.get("game_id", ""))
+            for tx in season.get("transactions", []):
+                tx["transaction_id"] = "X" + str(tx.get("transaction_id", ""))
+    data["schema_version"] = 0
+    return data
+
+def per_migration(path):
+    for step in migrate.MIGRATIONS:
+        store = storage.open_store(path)
+        data = store.load()
+        migrate.run_migrations(data, [step])
+        store.save(data)
+
+def single_pass(path):
+    store = storage.open_store(path)
+    data = store.load()
+    migrate.run_migrations(data)
+    store.save(data)
+
+def timed(fn, template, path):
+    shutil.copyfile(template, path)
+    start = time.perf_counter()
+    fn(path)
+    took = time.perf_counter() - start
+    with open(path, "r", encoding="utf-8") as f:
+        return took, json.load(f)
+
+def main():
+    args = [a for i, a in enumerate(sys.argv[1:], 1)
+            if not a.startswith("--") and not sys.argv[i - 1].startswith("--")]
+    src = args[0] if args else "fantasy.json"
+    copies = arg("--copies", 40)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        template = os.path.join(tmp, "template.json")
+        with open(template, "w", encoding="utf-8") as f:
+            json.dump(scrambled_master(src, copies), f, indent=2)
+        size_mb = os.path.getsize(template) / 1e6
+
+        t_old, old = timed(per_migration, template, os.path.join(tmp, "old.json"))
+        t_new, new = timed(single_pass, template, os.path.join(tmp, "new.json"))
+        assert old == new, "single pass and per-migration runs disagree"
+
+        n = len(migrate.MIGRATIONS)
+        print(f"📦 {size_mb:.1f} MB master ({copies} copies), {n} migrations → v{new['schema_version']}")
+        print(f"   per migration  {t_old * 1000:8.1f} ms   ({n} loads, {n} saves)")
+        print(f"   single pass    {t_new * 1000:8.1f} ms   (1 load, 1 save, {t_old / t_new:.1f}x faster)")
+
+if __name__ == "__main__":
+    main()
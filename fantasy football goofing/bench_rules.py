@@ -0,0 +1,126 @@
+"""
+Time game validation: the two hand-written checkers (add_remove_game's
+ingest verify_game and verification.py's check_game, each walking every
+roster five times) against game_rules' compiled single pass, which also
+stops re-summing at ingest the totals calculate_team_totals just wrote.
+
+Every game in a synthetic master (bench_load.build_master) is checked the
+way an ingested game is: totals rebuilt from the rows, then once with the
+ingest rules and once with the archive rules. A few games are broken on
+purpose so the issue paths run too; both implementations must report the
+same messages.
+
+Usage:
+  python bench_rules.py [fantasy.json] [--copies N] [--runs N]
+"""
+
+import sys
+
+import game_rules
+import verification
+from bench_load import arg, best_of, build_master
+
+norm_str, r2 = game_rules.norm_str, game_rules.r2
+
+# --------------------------------------
+# The checkers game_rules replaced
+# --------------------------------------
+def legacy_sides(game, game_id, issue, tol, teams_by_id=None):
+    for side_key in ("team_a", "team_b"):
+        side = game.get(side_key, {})
+        tid = norm_str(side.get("team_id", ""))
+        name = norm_str(side.get("name", ""))
+        if not name:
+            issue(side_key, "Missing team name")
+        if teams_by_id is not None and tid:
+            if tid not in teams_by_id:
+                issue(side_key, f"Unknown team_id '{tid}'")
+            else:
+                valid_aliases = [norm_str(a) for a in teams_by_id[tid].get("aliases", [])]
+                if name and name not in valid_aliases:
+                    issue(side_key, f"Team name '{name}' not in aliases for {tid} ({valid_aliases})")
+
+        starters, bench, totals = side.get("starters", []), side.get("bench", []), side.get("totals", {})
+        for i, s in enumerate(starters):
+            p = s.get("player", {})
+            nm, tm, pos = norm_str(p.get("name", "")), norm_str(p.get("team", "")), norm_str(p.get("position", ""))
+            if not (nm and tm and pos):
+                issue(side_key, f"Broken starter row #{i+1} (name/team/position missing)")
+            if r2(p.get("proj", 0.0)) == 0.0 and r2(p.get("fpts", 0.0)) > 0.0:
+                issue(side_key, f"ESPN missing projection for '{nm}' (proj=0.0, fpts={r2(p.get('fpts', 0.0))})")
+
+        sums = {
+            "proj": r2(sum((x.get("player", {}) or {}).get("proj", 0.0) for x in starters)),
+            "fpts": r2(sum((x.get("player", {}) or {}).get("fpts", 0.0) for x in starters)),
+            "bench_proj": r2(sum((x.get("player", {}) or {}).get("proj", 0.0) for x in bench)),
+            "bench_fpts": r2(sum((x.get("player", {}) or {}).get("fpts", 0.0) for x in bench)),
+        }
+        labels = {"proj": "Starters projected", "fpts": "Starters fpts",
+                  "bench_proj": "Bench projected", "bench_fpts": "Bench fpts"}
+        for key, label in labels.items():
+            try:
+                ok = abs(float(totals.get(key, None)) - float(sums[key])) <= tol
+            except Exception:
+                ok = False
+            if not ok:
+                issue(side_key, f"{label} total mismatch (totals={totals.get(key)}, sum={sums[key]})")
+
+def legacy_check(game, game_id, tol, teams_by_id=None):
+    out = []
+    legacy_sides(game, game_id, lambda side, msg: out.append(f"{game_id} {side}: {msg}"), tol, teams_by_id)
+    return out
+
+# --------------------------------------
+# Bench
+# --------------------------------------
+def collect_games(data):
+    """(game_id, game, teams_by_id, league) for every game as ingest leaves it; every 50th one damaged."""
+    out = []
+    for league in data["leagues by ID"].values():
+        for sid, season in league["seasons by ID"].items():
+            teams_by_id = verification.teams_index(season)
+            for week, wk in season.get("games", {}).get("weeks", {}).items():
+                for n, game in enumerate(wk.get("games", [])):
+                    gid = f"{sid}W{week}G{n + 1}"
+                    if len(out) % 50 == 0:
+                        side = game.get("team_a", {})
+                        side["team_id"] = "T999"
+                        if side.get("starters"):
+                            side["starters"][0]["player"]["proj"] = 0.0
+                            side["starters"][0]["player"]["team"] = ""
+                    for key in ("team_a", "team_b"):
+                        game.get(key, {})["totals"] = game_rules.roster_totals(game.get(key, {}))
+                    out.append((gid, game, teams_by_id, league))
+    return out
+
+def run_legacy(games):
+    return [legacy_check(g, gid, 0.05) + legacy_check(g, gid, 0.2, teams)
+            for gid, g, teams, _ in games]
+
+def run_rules(games):
+    return [[i["message"] for i in game_rules.checker("ingest", league)(g, gid)]
+            + [i["message"] for i in game_rules.checker("archive", league)(g, gid, teams)]
+            for gid, g, teams, league in games]
+
+def main():
+    args = [a for i, a in enumerate(sys.argv[1:], 1)
+            if not a.startswith("--") and not sys.argv[i - 1].startswith("--")]
+    src = args[0] if args else "fantasy.json"
+    copies, runs = arg("--copies", 40), arg("--runs", 5)
+
+    games = collect_games(build_master(src, copies))
+    if not games:
+        sys.exit(f"❌ No games in {src}")
+    old, new = run_legacy(games), run_rules(games)
+    assert old == new, "game_rules reports differ from the hand-written checkers"
+
+    t_old = best_of(lambda: run_legacy(games), runs)
+    t_new = best_of(lambda: run_rules(games), runs)
+    issues = sum(len(x) for x in new)
+    print(f"🧪 {len(games)} games × (ingest + archive rules), {issues} issue(s), best of {runs}")
+    print(f"   hand-written   {t_old * 1000:8.1f} ms   ({t_old / len(games) * 1e6:.1f} µs/game)")
+    print(f"   game_rules     {t_new * 1000:8.1f} ms   ({t_new / len(games) * 1e6:.1f} µs/game, "
+          f"{t_old / t_new:.1f}x faster)")
+
+if __name__ == "__main__":
+    main()
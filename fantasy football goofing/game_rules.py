@@ -0,0 +1,188 @@
+# Game validation rules, declared once and shared by ingest
+# (add_remove_game.verify_game) and batch verification (verification.py).
+#
+# Each rule has an id and a scope:
+#   "side"   - once per team side: test(side, ctx) → None | (message, values)
+#   "row"    - every entry of the rule's buckets, declared as data so the roster
+#              pass tests it inline: "required" fields must be non-blank, or the
+#              "zero" field rounds to 0 while the "positive" one is > 0
+#   "totals" - the roster pass sums proj/fpts per bucket; side["totals"] must
+#              match within the configured tolerance
+#
+# compile_rules(config) turns the enabled rules into one checker that walks
+# each roster once. Config comes from a profile ("ingest" / "archive") plus an
+# optional per-league override in the master: leagues by ID -> L001 -> "validation":
+#   {"tolerance": 0.1, "disabled": ["missing_projection"]}
+
+def norm_str(x):
+    return x.strip() if isinstance(x, str) else ""
+
+def r2(x):
+    try:
+        return round(float(x), 2)
+    except Exception:
+        return 0.0
+
+# --------------------------------------
+# Rules
+# --------------------------------------
+def _missing_team_name(side, ctx):
+    if not ctx["name"]:
+        return "Missing team name", {}
+
+def _unknown_team_id(side, ctx):
+    tid = ctx["team_id"]
+    if tid and tid not in ctx["teams_by_id"]:
+        return f"Unknown team_id '{tid}'", {"team_id": tid}
+
+def _team_alias_mismatch(side, ctx):
+    tid, name = ctx["team_id"], ctx["name"]
+    team = ctx["teams_by_id"].get(tid) if tid else None
+    if team is None or not name:
+        return None
+    valid_aliases = [norm_str(a) for a in team.get("aliases", [])]
+    if name not in valid_aliases:
+        return (f"Team name '{name}' not in aliases for {tid} ({valid_aliases})",
+                {"team_id": tid, "name": name, "aliases": valid_aliases})
+
+RULES = [
+    {"id": "missing_team_name",   "scope": "side", "test": _missing_team_name},
+    {"id": "unknown_team_id",     "scope": "side", "test": _unknown_team_id,     "needs_teams": True},
+    {"id": "team_alias_mismatch", "scope": "side", "test": _team_alias_mismatch, "needs_teams": True},
+    # row rules are data, so the roster pass can test them inline
+    {"id": "broken_starter_row", "scope": "row", "buckets": ("starters",),
+     "required": ("name", "team", "position"),
+     "message": "Broken starter row #{row} (name/team/position missing)"},
+    {"id": "missing_projection", "scope": "row", "buckets": ("starters",),
+     "zero": "proj", "positive": "fpts",
+     "message": "ESPN missing projection for '{player}' (proj=0.0, fpts={fpts})"},
+    {"id": "totals_mismatch", "scope": "totals",
+     "message": "{label} total mismatch (totals={totals}, sum={sum})"},
+]
+
+# totals key → (bucket, player field, label)
+TOTALS = {
+    "proj": ("starters", "proj", "Starters projected"),
+    "fpts": ("starters", "fpts", "Starters fpts"),
+    "bench_proj": ("bench", "proj", "Bench projected"),
+    "bench_fpts": ("bench", "fpts", "Bench fpts"),
+}
+BUCKETS = ("starters", "bench")
+
+PROFILES = {
+    # add_game: calculate_team_totals just rebuilt the totals from these rows, so
+    # re-summing them can't disagree; no teams block to check against either
+    "ingest": {"team_checks": False, "disabled": ["totals_mismatch"]},
+    # verification.py: stored games against their season's teams block
+    "archive": {"tolerance": 0.2, "team_checks": True, "disabled": []},
+}
+
+def roster_totals(team):
+    """The four side totals from the rows (one pass per bucket; unrounded sums, rounded once)."""
+    sums = {}
+    for bucket in BUCKETS:
+        proj = fpts = 0.0
+        for entry in team.get(bucket, []):
+            p = entry.get("player", {}) or {}
+            proj += p.get("proj", 0.0)
+            fpts += p.get("fpts", 0.0)
+        sums[bucket] = {"proj": proj, "fpts": fpts}
+    return {key: round(sums[bucket][field], 2) for key, (bucket, field, _) in TOTALS.items()}
+
+def league_config(profile, league=None):
+    """Profile defaults overridden by the league's "validation" block, if any."""
+    config = dict(PROFILES[profile])
+    override = (league or {}).get("validation")
+    if isinstance(override, dict):
+        config.update(override)
+    return config
+
+# --------------------------------------
+# Compile
+# --------------------------------------
+def compile_rules(config):
+    """→ check(game, game_id, teams_by_id=None) returning issue dicts {game_id, side, rule, values, message}."""
+    disabled = set(config.get("disabled", []))
+    enabled = [r for r in RULES if r["id"] not in disabled
+               and (config.get("team_checks", True) or not r.get("needs_teams"))]
+    side_rules = [(r["id"], r["test"]) for r in enabled if r["scope"] == "side"]
+    row_rules = {b: [r for r in enabled if r["scope"] == "row" and b in r["buckets"]] for b in BUCKETS}
+    totals_rule = next((r for r in enabled if r["scope"] == "totals"), None)
+    # buckets with nothing to test are skipped unless the totals need their sums
+    plan = [(b, [(r, r["required"]) for r in rules if "required" in r],
+             [(r, r["zero"], r["positive"]) for r in rules if "zero" in r])
+            for b, rules in row_rules.items() if rules or totals_rule]
+    tol = float(config.get("tolerance", 0.2))
+
+    def near(a, b):
+        try:
+            return abs(float(a) - float(b)) <= tol
+        except Exception:
+            return False
+
+    def check(game, game_id, teams_by_id=None):
+        issues = []
+        ctx = {"teams_by_id": teams_by_id or {}}
+
+        for side_key in ("team_a", "team_b"):
+            side = game.get(side_key, {})
+            prefix = f"{game_id} {side_key}: "
+            ctx["name"] = norm_str(side.get("name", ""))
+            ctx["team_id"] = norm_str(side.get("team_id", ""))
+
+            for rule_id, test in side_rules:
+                found = test(side, ctx)
+                if found:
+                    issues.append({"game_id": game_id, "side": side_key, "rule": rule_id,
+                                   "values": found[1], "message": prefix + found[0]})
+
+            # one pass per roster: row rules + the sums the totals check needs
+            sums = {}
+            for bucket, required_rules, zero_rules in plan:
+                proj = fpts = 0.0
+                for i, entry in enumerate(side.get(bucket, [])):
+                    p = entry.get("player", {}) or {}
+                    proj += p.get("proj", 0.0)
+                    fpts += p.get("fpts", 0.0)
+                    for rule, fields in required_rules:
+                        for f in fields:
+                            v = p.get(f, "")
+                            if not (isinstance(v, str) and v.strip()):
+                                break
+                        else:
+                            continue
+                        values = {"row": i + 1, **{f: norm_str(p.get(f, "")) for f in fields}}
+                        issues.append({"game_id": game_id, "side": side_key, "rule": rule["id"],
+                                       "values": values, "message": prefix + rule["message"].format(**values)})
+                    for rule, zero, positive in zero_rules:
+                        z = p.get(zero, 0.0)
+                        if isinstance(z, float) and not -0.005 < z < 0.005:
+                            continue  # fast path: rounds to non-zero
+                        if r2(z) == 0.0 and r2(p.get(positive, 0.0)) > 0.0:
+                            values = {"player": norm_str(p.get("name", "")), zero: 0.0,
+                                      positive: r2(p.get(positive, 0.0))}
+                            issues.append({"game_id": game_id, "side": side_key, "rule": rule["id"],
+                                           "values": values, "message": prefix + rule["message"].format(**values)})
+                sums[bucket] = {"proj": r2(proj), "fpts": r2(fpts)}
+
+            if totals_rule:
+                totals = side.get("totals", {})
+                for key, (bucket, field, label) in TOTALS.items():
+                    total = sums[bucket][field]
+                    if not near(totals.get(key, None), total):
+                        values = {"field": key, "totals": totals.get(key), "sum": total}
+                        issues.append({"game_id": game_id, "side": side_key, "rule": totals_rule["id"],
+                                       "values": values,
+                                       "message": prefix + totals_rule["message"].format(label=label, **values)})
+        return issues
+
+    return check
+
+_compiled = {}
+
+def checker(profile, league=None):
+    """Compiled checker for a profile + league override (memoized per distinct override)."""
+    key = (profile, repr((league or {}).get("validation")))
+    if key not in _compiled:
+        _compiled[key] = compile_rules(league_config(profile, league))
+    return _compiled[key]
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Cross-entity integrity check: do a season's teams, divisions, transactions,
+draft and lineups agree with each other?
+
+  teams         team without team_id, duplicate team_id, name missing from its
+                own aliases, alias claimed by two teams
+  divisions     division entry for an unknown team, team with no division
+  transactions  missing/unknown team_id, team_name not an alias of that team
+  draft         pick with a missing/unknown team_id or a team name not an alias of it
+  lineups       game side with a missing/unknown team_id or a name not an alias
+                of it, player on two rosters in the same week
+  players       added player never on the team's roster before it's dropped again,
+                dropped player back on the team's roster without being re-added
+
+Each season is indexed once (teams by id, alias → team ids, game days by
+team, roster days and add/drop events by (team_id, player)) in one pass over
+its teams, transactions, draft and games; every cross-reference is then a
+hash lookup or a bisect into a short sorted list.
+
+Usage:
+  python integrity.py <fantasy.json|.db|dir> [season_id ...] [--report integrity.jsonl] [--verbose]
+"""
+import sys, json, time
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from datetime import date
+
+import storage
+from names import norm
+
+CATEGORIES = ("teams", "divisions", "transactions", "draft", "lineups", "players")
+ROSTER_BUCKETS = ("starters", "bench", "ir")
+
+def parse_day(year, s):
+    """'09-07' or '2025-9-21' → date; Jan–Jun 'MM-DD' dates belong to the next calendar year."""
+    try:
+        parts = [int(x) for x in str(s).split("-")]
+        if len(parts) == 3:
+            return date(*parts)
+        if len(parts) == 2:
+            month, day = parts
+            return date(year + 1 if month < 7 else year, month, day)
+    except (TypeError, ValueError):
+        pass
+    return None
+
+# --------------------------------------
+# One season
+# --------------------------------------
+def check_season(season_id, season):
+    """Issues as dicts {season_id, category, rule, entity, values, message}, plus entity counts."""
+    issues = []
+    year = int(season.get("year") or storage.split_season_id(season_id)[1])
+
+    def issue(category, rule, entity, message, **values):
+        where = entity if entity.startswith(season_id) else f"{season_id} {entity}"
+        issues.append({"season_id": season_id, "category": category, "rule": rule, "entity": entity,
+                       "values": values, "message": f"{where}: {message}"})
+
+    # --- teams: id index + alias → owners
+    teams_by_id, alias_owners = {}, {}
+    for team in storage.team_list(season):
+        tid, name = team.get("team_id"), team.get("name", "")
+        if not tid:
+            issue("teams", "missing_team_id", name or "?", "Team without team_id")
+            continue
+        if tid in teams_by_id:
+            issue("teams", "duplicate_team_id", tid, f"team_id used by '{teams_by_id[tid].get('name')}' and '{name}'")
+            continue
+        teams_by_id[tid] = team
+        aliases = {norm(a) for a in team.get("aliases", []) or []}
+        if name and norm(name) not in aliases:
+            issue("teams", "name_not_in_aliases", tid, f"Name '{name}' missing from its aliases", name=name)
+        for alias in aliases | {norm(name)}:
+            if alias:
+                alias_owners.setdefault(alias, set()).add(tid)
+    for alias, owners in alias_owners.items():
+        if len(owners) > 1:
+            issue("teams", "shared_alias", "/".join(sorted(owners)),
+                  f"Alias '{alias}' belongs to {len(owners)} teams", alias=alias, team_ids=sorted(owners))
+
+    def owner(category, entity, tid, name):
+        """tid must be a known team and `name` (if any) one of its aliases."""
+        if not tid:
+            issue(category, "missing_team_id", entity, f"No team_id (team '{name}')", name=name)
+        elif tid not in teams_by_id:
+            issue(category, "unknown_team_id", entity, f"Unknown team_id '{tid}'", team_id=tid)
+        elif name and tid not in alias_owners.get(norm(name), ()):
+            issue(category, "name_not_alias", entity, f"'{name}' is not an alias of {tid}", team_id=tid, name=name)
+
+    # --- divisions: {team_id: division} (or {division: [team_id, ...]})
+    divisions = season.get("divisions")
+    if isinstance(divisions, dict) and divisions:
+        if all(isinstance(v, list) for v in divisions.values()):
+            division_of = {tid: div for div, tids in divisions.items() for tid in tids}
+        else:
+            division_of = divisions
+        for tid, div in division_of.items():
+            if tid not in teams_by_id:
+                issue("divisions", "unknown_team_id", tid, f"Division '{div}' lists unknown team_id", division=div)
+        for tid in teams_by_id:
+            if tid not in division_of:
+                issue("divisions", "team_without_division", tid, "Team has no division")
+
+    # --- transactions: owners + add/drop events by (team_id, player)
+    events = {}
+    transactions = season.get("transactions", []) or []
+    if isinstance(transactions, dict):
+        transactions = transactions.get("items", []) or []
+    for i, tx in enumerate(transactions):
+        txid = tx.get("transaction_id") or f"tx #{i + 1}"
+        tid = tx.get("team_id")
+        owner("transactions", txid, tid, tx.get("team_name"))
+        day = parse_day(year, tx.get("date"))
+        for kind, key in (("add", "added"), ("drop", "dropped")):
+            moved = tx.get(key)
+            if tid and day and isinstance(moved, dict) and moved.get("player"):
+                events.setdefault((tid, norm(moved["player"])), []).append((day, kind, txid, moved["player"]))
+
+    # --- draft
+    picks = 0
+    for rnd in ((season.get("draft") or {}).get("rounds") or {}).values():
+        for pick in rnd.get("picks", []):
+            picks += 1
+            owner("draft", f"pick {pick.get('overall', '?')}", pick.get("team_id"), pick.get("team"))
+
+    # --- lineups: owners + roster days by (team_id, player), one pass over the games
+    roster_days, rostered_by, game_days = {}, {}, {}
+    games = slots = 0
+    weeks = season.get("games", {}).get("weeks", {})
+    for week in sorted(weeks, key=lambda w: int(w)):
+        wk = weeks[week]
+        day = parse_day(year, wk.get("date"))
+        for n, game in enumerate(wk.get("games", [])):
+            games += 1
+            gid = game.get("game_id") or f"W{week}G{n + 1}"
+            for side_key in ("team_a", "team_b"):
+                side = game.get(side_key) or {}
+                tid = side.get("team_id")
+                owner("lineups", f"{gid} {side_key}", tid, side.get("name"))
+                if tid and day:
+                    game_days.setdefault(tid, []).append(day)
+                for bucket in ROSTER_BUCKETS:
+                    for entry in side.get(bucket, []) or []:
+                        name = (entry.get("player") or {}).get("name")
+                        if not name:
+                            continue
+                        slots += 1
+                        key = norm(name)
+                        other = rostered_by.setdefault((week, key), tid)
+                        if other != tid:
+                            issue("lineups", "player_on_two_rosters", f"{gid} {side_key}",
+                                  f"'{name}' also rostered by {other} in week {week}",
+                                  player=name, team_ids=[other, tid], week=int(week))
+                        if tid and day:
+                            roster_days.setdefault((tid, key), []).append(day)
+    for days in (*roster_days.values(), *game_days.values()):
+        days.sort()
+
+    # --- players: each add/drop against that team's roster days
+    for (tid, key), evs in events.items():
+        evs.sort(key=lambda e: e[0])  # stable: same-day moves keep transaction order
+        days = roster_days.get((tid, key), [])
+        next_of = {"add": None, "drop": None}
+        for day, kind, txid, player in reversed(evs):
+            if kind == "add":
+                # expect the player on the roster from `day` until the team drops them again
+                until = next_of["drop"]
+                at = bisect_left(days, day)
+                seen = at < len(days) and (until is None or days[at] < until)
+                played_on = game_days.get(tid, [])
+                w = bisect_left(played_on, day)
+                played = w < len(played_on) and (until is None or played_on[w] < until)
+                if played and not seen:
+                    issue("players", "added_not_rostered", txid,
+                          f"{tid} added '{player}' but never rostered them before the drop",
+                          team_id=tid, player=player, date=day.isoformat())
+            else:
+                # after the drop the player shouldn't be back until the team adds them again
+                until = next_of["add"]
+                at = bisect_right(days, day)
+                if at < len(days) and (until is None or days[at] < until):
+                    issue("players", "dropped_still_rostered", txid,
+                          f"{tid} dropped '{player}' on {day.isoformat()} but rostered them on {days[at].isoformat()}",
+                          team_id=tid, player=player, date=day.isoformat(), rostered=days[at].isoformat())
+            next_of[kind] = day
+
+    counts = {"teams": len(teams_by_id), "transactions": len(transactions), "picks": picks,
+              "games": games, "slots": slots}
+    return issues, counts
+
+# --------------------------------------
+# Archive
+# --------------------------------------
+def load_seasons(path, season_ids=None):
+    """(season_id, season) for the named seasons (load_season each) or every season (one load)."""
+    store = storage.open_store(path)
+    if season_ids:
+        for sid in season_ids:
+            league_id, year = storage.split_season_id(sid)
+            season = store.load_season(league_id, year).get("leagues by ID", {}) \
+                .get(league_id, {}).get("seasons by ID", {}).get(sid)
+            if season is None:
+                print(f"⚠️ Season {sid} not found in {path}")
+            else:
+                yield sid, season
+        return
+    for league in store.load().get("leagues by ID", {}).values():
+        for sid, season in league.get("seasons by ID", {}).items():
+            yield sid, season
+
+def print_report(issues, totals, verbose=False, limit=5):
+    by_category = {}
+    for i in issues:
+        by_category.setdefault(i["category"], []).append(i)
+    for category in CATEGORIES:
+        found = by_category.get(category, [])
+        if not found:
+            print(f"   ✅ {category:<13} clean")
+            continue
+        rules = Counter(i["rule"] for i in found)
+        print(f"   ❌ {category:<13} {len(found)} issue(s): "
+              + ", ".join(f"{rule} {n}" for rule, n in rules.most_common()))
+        for i in found if verbose else found[:limit]:
+            print(f"      - {i['message']}")
+        if not verbose and len(found) > limit:
+            print(f"      … {len(found) - limit} more (--verbose or --report)")
+
+if __name__ == "__main__":
+    args = [a for i, a in enumerate(sys.argv[1:], 1)
+            if not a.startswith("--") and sys.argv[i - 1] != "--report"]
+    if not args:
+        print("Usage: python integrity.py <fantasy.json> [season_id ...] [--report integrity.jsonl] [--verbose]")
+        sys.exit(1)
+
+    filename, season_ids = args[0], args[1:]
+    report = sys.argv[sys.argv.index("--report") + 1] if "--report" in sys.argv else None
+
+    start = time.perf_counter()
+    all_issues, totals, seasons = [], Counter(), 0
+    for sid, season in load_seasons(filename, season_ids):
+        found, counts = check_season(sid, season)
+        all_issues.extend(found)
+        totals.update(counts)
+        seasons += 1
+    took = time.perf_counter() - start
+
+    print(f"🔗 {seasons} season(s): {totals['teams']} teams, {totals['transactions']} transactions, "
+          f"{totals['picks']} draft picks, {totals['games']} games, {totals['slots']:,} roster slots "
+          f"— {len(all_issues)} issue(s) in {took:.2f}s")
+    print_report(all_issues, totals, verbose="--verbose" in sys.argv)
+    if report:
+        with open(report, "w", encoding="utf-8") as out:
+            out.writelines(json.dumps(i, ensure_ascii=False) + "\n" for i in all_issues)
+        print(f"📝 Wrote {len(all_issues)} issue(s) → {report}")
+    sys.exit(1 if all_issues else 0)
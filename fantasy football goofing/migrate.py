@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Schema migrations for the master file.
+
+The master carries a root "schema_version". Every migration in MIGRATIONS
+newer than that runs in ONE traversal of the archive (one load, one save):
+root-level steps first, then each season gets every pending season step in
+version order.
+
+Usage:
+  python migrate.py <fantasy.json|.db|dir> [--dry-run] [--verbose]
+  python migrate.py --list
+"""
+
+import sys
+import time
+
+import aggregates
+import storage
+
+# --------------------------------------
+# Registry
+# --------------------------------------
+MIGRATIONS = []  # (version, name, root_fn, season_fn), sorted by version
+
+def migration(version, name, scope="season"):
+    """
+    Register a migration step. scope="season": fn(season_id, season, changes)
+    runs once per season; scope="root": fn(data, changes) runs once.
+    Steps append human-readable lines to `changes` (the dry-run diff).
+    """
+    def register(fn):
+        MIGRATIONS.append((version, name, fn if scope == "root" else None, fn if scope == "season" else None))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return fn
+    return register
+
+def schema_version(data):
+    return int(data.get("schema_version", 0))
+
+def latest_version():
+    return max((m[0] for m in MIGRATIONS), default=0)
+
+# --------------------------------------
+# Migrations
+# --------------------------------------
+@migration(1, "canonical league/season keys", scope="root")
+def canonical_keys(data, changes):
+    """leagues → leagues by ID (keyed L###), seasons / seasons BY ID → seasons by ID (keyed L###SYYYY)."""
+    leagues = data.setdefault("leagues by ID", {})
+
+    old = data.pop("leagues", None)
+    if isinstance(old, dict):
+        for n, (name, league) in enumerate(old.items(), start=len(leagues) + 1):
+            lid = league.get("league_id") or f"L{n:03d}"
+            target = leagues.setdefault(lid, {"league_id": lid})
+            target.setdefault("league_name", name)
+            for key, value in league.items():
+                if key not in ("league_id", "seasons"):
+                    target.setdefault(key, value)
+            seasons = target.setdefault("seasons by ID", {})
+            for skey, season in (league.get("seasons") or {}).items():
+                year = int(season.get("year") or str(skey)[-4:])
+                sid = f"{lid}S{year}"
+                season.setdefault("season_id", sid)
+                season.setdefault("year", year)
+                seasons[sid] = season
+                changes.append(f"leagues/{name}/seasons/{skey} → leagues by ID/{lid}/seasons by ID/{sid}")
+
+    for lid, league in leagues.items():
+        for bad in ("seasons BY ID", "seasons"):
+            if isinstance(league.get(bad), dict):
+                seasons = league.setdefault("seasons by ID", {})
+                for sid, season in league.pop(bad).items():
+                    seasons.setdefault(sid, season)
+                changes.append(f"{lid}: '{bad}' → 'seasons by ID'")
+
+@migration(2, "sequential game IDs")
+def game_ids(season_id, season, changes):
+    """game_id = <season_id>W<week>G<n>, n in list order (was migrate_game_ids.py)."""
+    for week, wk in season.get("games", {}).get("weeks", {}).items():
+        for idx, g in enumerate(wk.get("games", []), start=1):
+            expected = f"{season_id}W{week}G{idx}"
+            if g.get("game_id") != expected:
+                changes.append(f"{g.get('game_id') or '<none>'} → {expected}")
+                g["game_id"] = expected
+
+@migration(3, "sequential transaction IDs")
+def tx_ids(season_id, season, changes):
+    """transaction_id = <season_id>T#####, in list order (was migrate_tx_ids.py)."""
+    transactions = season.get("transactions", [])
+    if not isinstance(transactions, list):
+        return
+    for i, tx in enumerate(transactions, start=1):
+        expected = f"{season_id}T{i:05d}"
+        if tx.get("transaction_id") != expected:
+            changes.append(f"{tx.get('transaction_id') or '<none>'} → {expected}")
+            tx["transaction_id"] = expected
+
+@migration(4, "materialized team aggregates")
+def team_aggregates(season_id, season, changes):
+    """season["aggregates"] from the season's games (kept up to date by ingest afterwards)."""
+    rebuilt = aggregates.rebuild(season)
+    if aggregates.diff(season.get("aggregates"), rebuilt):
+        changes.append(f"{season_id}: aggregates for {len(rebuilt['teams'])} team(s)")
+        season["aggregates"] = rebuilt
+
+# --------------------------------------
+# Runner
+# --------------------------------------
+def pending_migrations(data):
+    current = schema_version(data)
+    return [m for m in MIGRATIONS if m[0] > current]
+
+def run_migrations(data, pending=None):
+    """Apply pending migrations in one traversal. Returns {(version, name): [changes]}."""
+    pending = pending_migrations(data) if pending is None else pending
+    report = {(v, name): [] for v, name, _, _ in pending}
+
+    for v, name, root_fn, _ in pending:
+        if root_fn:
+            root_fn(data, report[(v, name)])
+
+    season_steps = [(v, name, fn) for v, name, _, fn in pending if fn]
+    if season_steps:
+        for league in data.get("leagues by ID", {}).values():
+            for season_id, season in league.get("seasons by ID", {}).items():
+                for v, name, fn in season_steps:
+                    fn(season_id, season, report[(v, name)])
+
+    if pending:
+        data["schema_version"] = max(schema_version(data), pending[-1][0])
+    return report
+
+def print_report(report, verbose=False, limit=10):
+    for (v, name), changes in report.items():
+        print(f"  v{v} {name}: {len(changes)} change(s)")
+        shown = changes if verbose else changes[:limit]
+        for line in shown:
+            print(f"    - {line}")
+        if len(changes) > len(shown):
+            print(f"    … {len(changes) - len(shown)} more (--verbose)")
+
+def main():
+    if "--list" in sys.argv:
+        for v, name, root_fn, season_fn in MIGRATIONS:
+            print(f"  v{v} {name} ({'root' if root_fn else 'per season'})")
+        return
+
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if not args:
+        print("Usage: python migrate.py <fantasy.json|.db|dir> [--dry-run] [--verbose] | --list")
+        sys.exit(1)
+
+    path = args[0]
+    dry_run = "--dry-run" in sys.argv
+    verbose = "--verbose" in sys.argv
+
+    start = time.perf_counter()
+    store = storage.open_store(path)
+    data = store.load()
+    pending = pending_migrations(data)
+    current = schema_version(data)
+
+    if not pending:
+        print(f"✨ {path} is already at schema v{current}.")
+        return
+
+    print(f"🔧 {path}: schema v{current} → v{pending[-1][0]} ({len(pending)} migration(s))")
+    report = run_migrations(data, pending)
+    print_report(report, verbose)
+
+    if dry_run:
+        print("🔎 Dry run complete. No changes were written.")
+        return
+
+    store.save(data)
+    total = sum(len(c) for c in report.values())
+    print(f"✅ Applied {len(pending)} migration(s), {total} change(s) in {time.perf_counter() - start:.2f}s → {path}")
+
+if __name__ == "__main__":
+    main()
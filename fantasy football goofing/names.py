@@ -0,0 +1,96 @@
+# Name normalization + player identity, shared by the ingest, stats and ETL scripts
+# here and in "ff goofing test/" (which imports this copy through its shared.py).
+#
+#   norm("Amon-Ra St. Brown")          → "amon ra st brown"
+#   strip_suffix("marvin harrison jr") → "marvin harrison"
+#   base_player_id("Sam Darnold", "QB") → "samdarnold_qb"
+#   PlayerIndex(registry).resolve(name, site_key) → canonical player_id
+
+import re
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+
+CACHE_SIZE = 1 << 16
+
+# ASCII fast path: one translate() does lowercasing and punctuation → space
+_ASCII_FOLD = str.maketrans({
+    **{chr(c): " " for c in range(128) if not chr(c).isalnum()},
+    **{chr(c): chr(c).lower() for c in range(ord("A"), ord("Z") + 1)},
+})
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_ID_JUNK = re.compile(r"[^a-z0-9]")
+
+NAME_SUFFIXES = {"jr", "sr", "ii", "iii", "iv", "v"}
+
+@lru_cache(maxsize=CACHE_SIZE)
+def norm(s) -> str:
+    """Accent-free, lowercase, alphanumeric words separated by single spaces."""
+    if not s:
+        return ""
+    if s.isascii():
+        return " ".join(s.translate(_ASCII_FOLD).split())
+    s = unicodedata.normalize("NFKD", s)
+    s = "".join(c for c in s if not unicodedata.combining(c))
+    return _NON_ALNUM.sub(" ", s.lower()).strip()
+
+@lru_cache(maxsize=CACHE_SIZE)
+def strip_suffix(normed: str) -> str:
+    """'marvin harrison jr' → 'marvin harrison'."""
+    parts = normed.split()
+    while len(parts) > 1 and parts[-1] in NAME_SUFFIXES:
+        parts.pop()
+    return " ".join(parts)
+
+@lru_cache(maxsize=CACHE_SIZE)
+def base_player_id(name: str, position: str) -> str:
+    """First + last name + position, the stat_parser ID scheme (unchanged, so stored IDs still match)."""
+    parts = name.split()
+    base = (parts[0] + parts[-1]).lower() if parts else "unknown"
+    return f"{_ID_JUNK.sub('', base)}_{position.lower()}"
+
+def cache_info() -> dict:
+    return {f.__name__: f.cache_info() for f in (norm, strip_suffix, base_player_id)}
+
+class PlayerIndex:
+    """
+    Canonical identity table over the Players registry: every known spelling
+    (site key, exact name, normalized name, aliases and, with fuzzy=True, the
+    name without Jr./Sr./II suffixes) maps to one player_id. Spellings shared
+    by two player_ids are left out of the loose tables.
+    """
+    def __init__(self, registry=None, fuzzy=False):
+        self.fuzzy = fuzzy
+        self.by_key, self.by_name, self.by_norm, self.by_base = {}, {}, {}, {}
+        self.hits = Counter()
+        self.misses = 0
+        for pid, info in (registry or {}).items():
+            self.add(pid, info)
+
+    def add(self, pid, info):
+        if info.get("site_key"):
+            self.by_key.setdefault(info["site_key"], pid)
+        for name in [info.get("name", "")] + list(info.get("aliases", [])):
+            self.by_name.setdefault(name, pid)  # first match wins, like the old registry scan
+            for table, key in ((self.by_norm, norm(name)), (self.by_base, strip_suffix(norm(name)))):
+                table[key] = pid if table.get(key, pid) == pid else None  # None = ambiguous
+
+    def resolve(self, name, key=""):
+        """player_id or None; counts which table answered."""
+        pid = self.by_key.get(key) if key else None
+        how = "site_key"
+        if not pid and name:
+            pid, how = self.by_name.get(name), "exact"
+            if not pid:
+                pid, how = self.by_norm.get(norm(name)), "normalized"
+            if not pid and self.fuzzy:
+                pid, how = self.by_base.get(strip_suffix(norm(name))), "suffix"
+        if pid:
+            self.hits[how] += 1
+            return pid
+        self.misses += 1
+        return None
+
+def lookup_summary(hits, misses):
+    parts = [f"{n} {how}" for how, n in hits.items() if n]
+    return f"🔎 Player lookup: {', '.join(parts) or '0 hits'}, {misses} miss(es)"
@@ -0,0 +1,1474 @@
+#!/usr/bin/env python3
+"""
+Pluggable storage for the master fantasy file.
+
+  JsonStore    - today's single fantasy.json (default for any other path)
+  SqliteStore  - embedded SQLite db (*.db / *.sqlite / *.sqlite3)
+  ShardStore   - a directory (or its manifest.json): manifest plus one JSON
+                 shard per season, week of games, season's transactions and
+                 Raw Stats season
+
+Ingest scripts load a document in today's JSON shape, edit it like they
+always have, and hand the same edits to commit() as small change records:
+
+  {"op": "add_game",            "season_id", "week", "date", "game"}
+  {"op": "remove_game",         "season_id", "week", "game_id", "game"}
+  {"op": "set_team",            "season_id", "team"}
+  {"op": "add_transactions",    "season_id", "entries"}
+  {"op": "remove_transactions", "season_id", "ids"}
+  {"op": "set_aggregates",      "season_id", "aggregates"}
+  {"op": "set_raw_stats",       "season_key", "sections"}   Raw Stats sections (Week3, Totals, ...)
+  {"op": "set_players",         "players"}                  Players entries to add/replace
+
+add_game / remove_game also apply the game as a delta to the season's
+materialized team aggregates (see aggregates.py).
+
+JsonStore just rewrites the file; SqliteStore turns each record into
+row-level writes so one ingest only touches the rows it changed; ShardStore
+reads and rewrites only the shards a record lands in. load_season() takes
+weeks= / transactions= hints so the partial stores skip what a script
+won't look at (skipped parts stay as "$rows" markers).
+
+Journal mode (JSON only): while <fantasy.json>.journal exists, commit()
+appends the change records to it instead of rewriting the snapshot, and
+load() replays them on top. `compact` folds the journal back in.
+
+Snapshot cache (JSON only): big JSON files are parsed once and kept as a
+marshal snapshot in <fantasy.json>.cache, keyed by the file's size, mtime
+and hash. Later loads use it while the file's hash still matches and rebuild
+it when stale.
+
+Concurrent writers: JSON writes happen under an advisory lock on
+<fantasy.json>.lock and land via temp file + fsync + rename. If the master
+changed since it was loaded, commit() re-reads it under the lock and
+re-applies its change records instead of overwriting the other writer.
+With stage=True (the scripts' --stage flag) commits are parked in
+<fantasy.json>.staged/ so workers for different leagues/seasons never
+wait on each other; `merge` applies them all in one locked write.
+
+Usage:
+  python storage.py import <fantasy.json> <fantasy.db | shards_dir/>
+  python storage.py export <fantasy.db | shards_dir/> <fantasy.json>
+  python storage.py journal <fantasy.json>
+  python storage.py compact <fantasy.json>
+  python storage.py merge <fantasy.json>
+"""
+import hashlib
+import json
+import marshal
+import os
+import re
+import sqlite3
+import stat
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import aggregates
+from names import norm
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+JOURNAL_SUFFIX = ".journal"
+LOCK_SUFFIX = ".lock"
+STAGED_SUFFIX = ".staged"
+MANIFEST = "manifest.json"
+CACHE_SUFFIX = ".cache"
+CACHE_MIN_BYTES = 64 * 1024  # smaller files parse faster than a cache check
+_CACHE_FORMAT = ("fantasy-snapshot", 1, sys.version_info[:2], marshal.version)
+
+# marks a child that was split out into its own table rows
+ROWS = "$rows"
+
+# --------------------------------------
+# Change records (dict-level)
+# --------------------------------------
+def split_season_id(season_id):
+    """'L001S2025' -> ('L001', 2025)"""
+    league_id, _, year = season_id.partition("S")
+    return league_id, int(year)
+
+def season_for_change(data, season_id):
+    league_id, year = split_season_id(season_id)
+    leagues = data.setdefault("leagues by ID", {})
+    league = leagues.setdefault(league_id, {"league_id": league_id})
+    seasons = league.setdefault("seasons by ID", {})
+    if season_id not in seasons:
+        seasons[season_id] = {"season_id": season_id, "year": year, "aggregates": aggregates.empty_block()}
+    return seasons[season_id]
+
+def team_list(season):
+    """Same preference as get_team_objects: 'teams', then 'team_aliases'."""
+    if isinstance(season.get("teams"), list):
+        return season["teams"]
+    if isinstance(season.get("team_aliases"), list):
+        return season["team_aliases"]
+    return season.setdefault("teams", [])
+
+def tx_sort_key(year, tx):
+    return datetime.strptime(f"{year}-{tx['date']} {tx['time']}", "%Y-%m-%d %I:%M %p")
+
+def reindex_game_ids(games, season_id, week):
+    for j, g in enumerate(games, start=1):
+        g["game_id"] = f"{season_id}W{week}G{j}"
+
+def reindex_tx_ids(transactions, season_id):
+    for i, t in enumerate(transactions, start=1):
+        t["transaction_id"] = f"{season_id}T{i:05d}"
+
+def next_game_id(games, season_id, week):
+    """Same numbering as add_remove_game.generate_game_id."""
+    prefix = f"{season_id}W{week}G"
+    gnums = [int(g["game_id"][len(prefix):]) for g in games
+             if str(g.get("game_id", "")).startswith(prefix) and g["game_id"][len(prefix):].isdigit()]
+    return f"{prefix}{max(gnums, default=0) + 1}"
+
+def merge_new_game(games, change):
+    """
+    Reconcile a queued add_game with the week as it is now (another writer may
+    have added games since it was built). Returns the game to store, or None.
+    """
+    game = change["game"]
+    a = (game.get("team_a") or {}).get("name")
+    b = (game.get("team_b") or {}).get("name")
+    for g in games:
+        if (g.get("team_a") or {}).get("name") == a and (g.get("team_b") or {}).get("name") == b:
+            print(f"⚠️ Skipped duplicate matchup in Week {change['week']}: {a} vs {b}")
+            return None
+
+    gid = game.get("game_id")
+    if gid and any(g.get("game_id") == gid for g in games):
+        new_id = next_game_id(games, change["season_id"], change["week"])
+        print(f"🔀 {gid} was taken by another ingest; stored as {new_id}")
+        game = {**game, "game_id": new_id}
+    return game
+
+def same_transaction(a, b):
+    return {k: v for k, v in a.items() if k != "transaction_id"} == \
+           {k: v for k, v in b.items() if k != "transaction_id"}
+
+def same_game(a, b):
+    return {k: v for k, v in a.items() if k != "game_id"} == \
+           {k: v for k, v in b.items() if k != "game_id"}
+
+def find_removed_game(games, change):
+    """
+    Index of the game a remove_game record means. Matched on content: game IDs
+    are positions, so they shift when another writer removed a game first.
+    Records without "game" (older journals) fall back to the ID.
+    """
+    if "game" in change:
+        idx = next((i for i, g in enumerate(games) if same_game(g, change["game"])), None)
+        what = f"game '{change['game_id']}' as loaded"
+    else:
+        idx = next((i for i, g in enumerate(games) if g.get("game_id") == change["game_id"]), None)
+        what = f"game with id '{change['game_id']}'"
+    if idx is None:
+        raise ValueError(f"No {what} found in Week {change['week']} (removed or changed by another writer?).")
+    return idx
+
+def raw_stats_order(sections):
+    """Weeks in numeric order, then Totals (and anything else) - stat_parser's layout."""
+    weeks = sorted((k for k in sections if k.startswith("Week") and k[4:].isdigit()), key=lambda k: int(k[4:]))
+    return {k: sections[k] for k in weeks + [k for k in sections if k not in weeks]}
+
+def apply_raw_stats(raw_season, change):
+    """Raw Stats season dict with the record's sections replaced."""
+    return raw_stats_order({**(raw_season if isinstance(raw_season, dict) else {}), **change["sections"]})
+
+def apply_change(data, change):
+    """Apply one change record to a JSON-shaped document, in place."""
+    op = change["op"]
+    if op == "set_raw_stats":
+        seasons = data.setdefault("Raw Stats", {}).setdefault("season by ID", {})
+        seasons[change["season_key"]] = apply_raw_stats(seasons.get(change["season_key"]), change)
+        return
+    if op == "set_players":
+        data.setdefault("Players", {}).update(change["players"])
+        return
+    season_id = change["season_id"]
+    season = season_for_change(data, season_id)
+
+    if op == "add_game":
+        weeks = season.setdefault("games", {}).setdefault("weeks", {})
+        wk = weeks.setdefault(str(change["week"]), {"games": [], "date": change["date"]})
+        wk["date"] = change["date"]
+        game = merge_new_game(wk["games"], change)
+        if game is not None:
+            wk["games"].append(game)
+            aggregates.add_game(season, game, change["week"])
+
+    elif op == "remove_game":
+        week = str(change["week"])
+        games = season.get("games", {}).get("weeks", {}).get(week, {}).get("games", [])
+        removed = games.pop(find_removed_game(games, change))
+        reindex_game_ids(games, season_id, week)
+        aggregates.remove_game(season, removed, week)
+
+    elif op == "set_team":
+        team = change["team"]
+        teams = team_list(season)
+        for t in teams:
+            if t.get("team_id") == team.get("team_id"):
+                t.clear()
+                t.update(team)
+                break
+        else:
+            teams.append(dict(team))
+
+    elif op == "add_transactions":
+        _, year = split_season_id(season_id)
+        existing = season.get("transactions", [])
+        if isinstance(existing, dict):
+            existing = existing.get("items", [])
+        merged = list(existing) + [dict(e) for e in change["entries"]]
+        merged.sort(key=lambda t: tx_sort_key(year, t))
+        reindex_tx_ids(merged, season_id)
+        season["transactions"] = merged
+
+    elif op == "remove_transactions":
+        existing = season.get("transactions", [])
+        if isinstance(existing, dict):
+            existing = existing.get("items", [])
+        if "entries" in change:
+            # match on content: IDs shift if another writer added transactions since
+            drop = list(change["entries"])
+            kept = []
+            for t in existing:
+                hit = next((i for i, d in enumerate(drop) if same_transaction(t, d)), None)
+                if hit is None:
+                    kept.append(t)
+                else:
+                    drop.pop(hit)
+        else:
+            drop = set(change["ids"])
+            kept = [t for t in existing if t.get("transaction_id") not in drop]
+        reindex_tx_ids(kept, season_id)
+        season["transactions"] = kept
+
+    elif op == "set_aggregates":
+        season["aggregates"] = change["aggregates"]
+
+    else:
+        raise ValueError(f"Unknown change op '{op}'")
+
+# --------------------------------------
+# Locking / atomic writes
+# --------------------------------------
+@contextmanager
+def master_lock(path):
+    """Exclusive advisory lock on <path>.lock for one read-modify-write."""
+    with open(str(path) + LOCK_SUFFIX, "a+") as f:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+def atomic_write(path, write, binary=False):
+    """Call write(f) on a temp file next to `path`, fsync it, then rename over `path`."""
+    path = str(path)
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=folder)
+    try:
+        with (os.fdopen(fd, "wb") if binary else os.fdopen(fd, "w", encoding="utf-8")) as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            os.chmod(tmp, stat.S_IMODE(os.stat(path).st_mode))
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    if fcntl:  # make the rename itself durable
+        dir_fd = os.open(folder, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+# --------------------------------------
+# Snapshot cache
+# --------------------------------------
+def _digest(raw):
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+def _write_cache(path, data, st, digest):
+    header = (*_CACHE_FORMAT, st.st_size, st.st_mtime_ns, digest)
+
+    def write(f):
+        head = marshal.dumps(header)
+        f.write(len(head).to_bytes(4, "little"))
+        f.write(head)
+        f.write(marshal.dumps(data))
+    try:
+        atomic_write(str(path) + CACHE_SUFFIX, write, binary=True)
+    except OSError:
+        pass  # read-only folder etc. - the cache is only an optimisation
+
+def read_json_cached(path):
+    """json.load(path), served from <path>.cache when it still matches the file."""
+    st = os.stat(path)
+    if st.st_size < CACHE_MIN_BYTES:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    raw = None
+    try:
+        with open(str(path) + CACHE_SUFFIX, "rb") as f:
+            # marshal.loads on bytes is several times faster than marshal.load(f)
+            header = marshal.loads(f.read(int.from_bytes(f.read(4), "little")))
+            if tuple(header[:4]) == _CACHE_FORMAT and header[4] == st.st_size:
+                # always confirm by hash: size + mtime can match after a same-second rewrite
+                # (coarse-mtime filesystems, copies with preserved times); hashing is still
+                # far cheaper than json.loads
+                with open(path, "rb") as src:
+                    raw = src.read()
+                if _digest(raw) == header[6]:
+                    data = marshal.loads(f.read())
+                    if header[5] != st.st_mtime_ns:  # touched (checkout, copy...) but not changed
+                        _write_cache(path, data, st, header[6])
+                    return data
+    except (OSError, EOFError, ValueError, TypeError, IndexError):
+        pass
+
+    if raw is None:
+        with open(path, "rb") as src:
+            raw = src.read()
+    data = json.loads(raw)
+    _write_cache(path, data, st, _digest(raw))
+    return data
+
+def refresh_json_cache(path, data):
+    """After writing `data` to `path`, store it as the snapshot so the next load is warm."""
+    st = os.stat(path)
+    if st.st_size < CACHE_MIN_BYTES:
+        return
+    with open(path, "rb") as f:
+        digest = _digest(f.read())
+    _write_cache(path, data, st, digest)
+
+# --------------------------------------
+# JSON backend
+# --------------------------------------
+class JsonStore:
+    def __init__(self, path):
+        self.path = path
+        self.journal_path = str(path) + JOURNAL_SUFFIX
+        self._loaded_state = None
+
+    def load(self):
+        self._loaded_state = self._state()
+        data = self._read_snapshot()
+        if self.journaled:
+            for change in self.read_journal():
+                apply_change(data, change)
+        return data
+
+    def save(self, data):
+        with master_lock(self.path):
+            self._write_snapshot(data)
+
+    def load_season(self, league_id, year, weeks=None, transactions=True):
+        """JSON can't load a slice, so this is the whole document."""
+        return self.load()
+
+    def commit(self, data, changes):
+        """
+        `data` is the full document from load() with `changes` already applied.
+        If someone else wrote the master in between, re-apply `changes` to a
+        fresh read instead (all under the lock).
+        """
+        with master_lock(self.path):
+            if self.journaled and os.path.exists(self.path):
+                # replay order is lock order, so appending is already a merge
+                self._append_journal(changes)
+            elif self._loaded_state is not None and self._loaded_state == self._state():
+                self._write_snapshot(data)
+            else:
+                if self._loaded_state is not None:
+                    print(f"🔀 {self.path} changed since it was loaded; merging {len(changes)} change(s).")
+                fresh = self.load() if os.path.exists(self.path) else {"leagues by ID": {}}
+                for change in changes:
+                    apply_change(fresh, change)
+                self._write_snapshot(fresh)
+            self._loaded_state = self._state()
+
+    def _state(self):
+        """What the master looked like: snapshot size/mtime + journal length."""
+        if not os.path.exists(self.path):
+            return None
+        st = os.stat(self.path)
+        journal = os.path.getsize(self.journal_path) if self.journaled else None
+        return (st.st_size, st.st_mtime_ns, journal)
+
+    def _read_snapshot(self):
+        if os.path.getsize(self.path) == 0:
+            return {"leagues by ID": {}}
+        return read_json_cached(self.path)
+
+    def _write_snapshot(self, data):
+        atomic_write(self.path, lambda f: json.dump(data, f, indent=2))
+        refresh_json_cache(self.path, data)
+        if self.journaled:
+            self._reset_journal()
+
+    # ---------- journal ----------
+    @property
+    def journaled(self):
+        return os.path.exists(self.journal_path)
+
+    def _snapshot_stamp(self):
+        st = os.stat(self.path)
+        return {"journal": 1, "snapshot_size": st.st_size, "snapshot_mtime_ns": st.st_mtime_ns}
+
+    def _reset_journal(self):
+        """Start an empty journal stamped with the current snapshot."""
+        header = _dumps(self._snapshot_stamp()) + "\n"
+        atomic_write(self.journal_path, lambda f: f.write(header))
+
+    def _append_journal(self, changes):
+        # one write per commit so a crash can only tear the last line
+        lines = "".join(_dumps(c) + "\n" for c in changes)
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def read_journal(self):
+        """Change records since the last snapshot (skips a torn last line)."""
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        if not lines:
+            return []
+
+        header = json.loads(lines[0])
+        if header != self._snapshot_stamp():
+            # snapshot was rewritten after this journal started (e.g. compact
+            # crashed before resetting it) - its records are already folded in
+            print(f"⚠️ {self.journal_path} doesn't match {self.path}; ignoring stale journal.")
+            return []
+
+        changes = []
+        for n, line in enumerate(lines[1:], start=2):
+            if not line.strip():
+                continue
+            try:
+                changes.append(json.loads(line))
+            except json.JSONDecodeError:
+                print(f"⚠️ Skipping unreadable journal line {n} in {self.journal_path}")
+        return changes
+
+    def enable_journal(self):
+        with master_lock(self.path):
+            if not self.journaled:
+                self._reset_journal()
+
+    def compact(self):
+        """Fold the journal into a new snapshot; returns how many records were folded."""
+        with master_lock(self.path):
+            count = len(self.read_journal()) if self.journaled else 0
+            self._write_snapshot(self.load())
+        return count
+
+# --------------------------------------
+# SQLite backend
+# --------------------------------------
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS leagues (
+    league_id TEXT PRIMARY KEY,
+    ord INTEGER,
+    name TEXT,
+    doc TEXT
+);
+CREATE TABLE IF NOT EXISTS seasons (
+    season_id TEXT PRIMARY KEY,
+    league_id TEXT,
+    ord INTEGER,
+    year INTEGER,
+    doc TEXT
+);
+CREATE INDEX IF NOT EXISTS seasons_league ON seasons (league_id, ord);
+CREATE TABLE IF NOT EXISTS teams (
+    season_id TEXT,
+    team_id TEXT,
+    section TEXT,
+    ord INTEGER,
+    name TEXT,
+    record TEXT,
+    doc TEXT
+);
+CREATE INDEX IF NOT EXISTS teams_season ON teams (season_id, section, ord);
+CREATE INDEX IF NOT EXISTS teams_id ON teams (season_id, team_id);
+CREATE TABLE IF NOT EXISTS aliases (
+    season_id TEXT,
+    team_key INTEGER,
+    ord INTEGER,
+    alias TEXT,
+    alias_norm TEXT
+);
+CREATE INDEX IF NOT EXISTS aliases_team ON aliases (team_key, ord);
+CREATE INDEX IF NOT EXISTS aliases_lookup ON aliases (season_id, alias_norm);
+CREATE TABLE IF NOT EXISTS weeks (
+    season_id TEXT,
+    week TEXT,
+    ord INTEGER,
+    date TEXT,
+    doc TEXT,
+    PRIMARY KEY (season_id, week)
+);
+CREATE TABLE IF NOT EXISTS games (
+    game_key INTEGER PRIMARY KEY,
+    game_id TEXT,
+    season_id TEXT,
+    week TEXT,
+    ord INTEGER,
+    team_a_id TEXT,
+    team_b_id TEXT,
+    doc TEXT
+);
+CREATE INDEX IF NOT EXISTS games_week ON games (season_id, week, ord);
+CREATE INDEX IF NOT EXISTS games_id ON games (game_id);
+CREATE TABLE IF NOT EXISTS lineup_entries (
+    game_key INTEGER,
+    side TEXT,
+    bucket TEXT,
+    ord INTEGER,
+    slot TEXT,
+    name TEXT,
+    nfl_team TEXT,
+    position TEXT,
+    proj REAL,
+    fpts REAL,
+    doc TEXT
+);
+CREATE INDEX IF NOT EXISTS lineup_game ON lineup_entries (game_key, side, bucket, ord);
+CREATE INDEX IF NOT EXISTS lineup_player ON lineup_entries (name);
+CREATE TABLE IF NOT EXISTS transactions (
+    season_id TEXT,
+    ord INTEGER,
+    transaction_id TEXT,
+    date TEXT,
+    time TEXT,
+    type TEXT,
+    team_id TEXT,
+    doc TEXT
+);
+CREATE INDEX IF NOT EXISTS tx_season ON transactions (season_id, ord);
+CREATE INDEX IF NOT EXISTS tx_id ON transactions (transaction_id);
+CREATE TABLE IF NOT EXISTS raw_stats (
+    season_key TEXT,
+    section TEXT,
+    category TEXT,
+    ord INTEGER,
+    player_id TEXT,
+    doc TEXT
+);
+CREATE INDEX IF NOT EXISTS raw_stats_lookup ON raw_stats (season_key, section, category, ord);
+CREATE TABLE IF NOT EXISTS players (
+    player_id TEXT PRIMARY KEY,
+    ord INTEGER,
+    name TEXT,
+    position TEXT,
+    doc TEXT
+);
+CREATE INDEX IF NOT EXISTS players_name ON players (name);
+"""
+
+ROSTER_BUCKETS = ("starters", "bench", "ir")
+
+def _dumps(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+def _is_table(value):
+    """dict of dicts -> can be split into rows."""
+    return isinstance(value, dict) and all(isinstance(v, dict) for v in value.values())
+
+def _float_or_none(x):
+    return float(x) if isinstance(x, (int, float)) else None
+
+class SqliteStore:
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+
+    # ---------- connection ----------
+    @property
+    def conn(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, timeout=60)
+            self._conn.executescript(SCHEMA)
+            self._rekey_aliases()
+        return self._conn
+
+    def _rekey_aliases(self):
+        """Databases written before alias_norm used names.norm get their keys rebuilt once."""
+        cur = self._conn.cursor()
+        if cur.execute("SELECT 1 FROM meta WHERE key = 'alias_norm'").fetchone():
+            return
+        with self._conn:
+            cur.executemany("UPDATE aliases SET alias_norm = ? WHERE rowid = ?",
+                            [(norm(a), rowid) for rowid, a in
+                             cur.execute("SELECT rowid, alias FROM aliases").fetchall()])
+            cur.execute("INSERT OR REPLACE INTO meta VALUES ('alias_norm', 'names.norm')")
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # ---------- whole-document import/export ----------
+    def load(self):
+        cur = self.conn.cursor()
+        row = cur.execute("SELECT value FROM meta WHERE key = 'root'").fetchone()
+        if not row:
+            return {"leagues by ID": {}}
+        root = json.loads(row[0])
+
+        if root.get("leagues by ID") == ROWS:
+            root["leagues by ID"] = {
+                lid: self._export_league(cur, lid)
+                for (lid,) in cur.execute("SELECT league_id FROM leagues ORDER BY ord").fetchall()
+            }
+        if "Raw Stats" in root:
+            root["Raw Stats"] = self._export_raw_stats(cur, root["Raw Stats"])
+        if root.get("Players") == ROWS:
+            root["Players"] = {
+                pid: json.loads(doc)
+                for pid, doc in cur.execute("SELECT player_id, doc FROM players ORDER BY ord")
+            }
+        return root
+
+    def save(self, data):
+        """Replace the whole database with `data`."""
+        with self.conn as conn:
+            cur = conn.cursor()
+            for table in ("meta", "leagues", "seasons", "teams", "aliases", "weeks",
+                          "games", "lineup_entries", "transactions", "raw_stats", "players"):
+                cur.execute(f"DELETE FROM {table}")
+
+            root = dict(data)
+            leagues = root.get("leagues by ID")
+            if isinstance(leagues, dict) and _is_table(leagues):
+                for ord_, (lid, league) in enumerate(leagues.items()):
+                    self._import_league(cur, lid, league, ord_)
+                root["leagues by ID"] = ROWS
+            if "Raw Stats" in root:
+                root["Raw Stats"] = self._import_raw_stats(cur, root["Raw Stats"])
+            players = root.get("Players")
+            if _is_table(players):
+                cur.executemany(
+                    "INSERT INTO players VALUES (?, ?, ?, ?, ?)",
+                    [(pid, i, p.get("name"), p.get("position"), _dumps(p))
+                     for i, (pid, p) in enumerate(players.items())],
+                )
+                root["Players"] = ROWS
+            cur.execute("INSERT INTO meta VALUES ('root', ?)", (_dumps(root),))
+            cur.execute("INSERT INTO meta VALUES ('alias_norm', 'names.norm')")
+
+    # ---------- leagues / seasons ----------
+    def _import_league(self, cur, lid, league, ord_):
+        doc = dict(league)
+        seasons = doc.get("seasons by ID")
+        if _is_table(seasons):
+            for s_ord, (sid, season) in enumerate(seasons.items()):
+                self._import_season(cur, lid, sid, season, s_ord)
+            doc["seasons by ID"] = ROWS
+        cur.execute("INSERT INTO leagues VALUES (?, ?, ?, ?)",
+                    (lid, ord_, league.get("league_name"), _dumps(doc)))
+
+    def _export_league(self, cur, lid, only_season=None, weeks=None, transactions=True):
+        (doc,) = cur.execute("SELECT doc FROM leagues WHERE league_id = ?", (lid,)).fetchone()
+        league = json.loads(doc)
+        if league.get("seasons by ID") == ROWS:
+            sql = "SELECT season_id FROM seasons WHERE league_id = ? ORDER BY ord"
+            sids = [sid for (sid,) in cur.execute(sql, (lid,)).fetchall()]
+            if only_season is not None:
+                sids = [sid for sid in sids if sid == only_season]
+            league["seasons by ID"] = {sid: self._export_season(cur, sid, weeks, transactions)
+                                       for sid in sids}
+        return league
+
+    def _import_season(self, cur, lid, sid, season, ord_):
+        doc = dict(season)
+
+        for section in ("teams", "team_aliases"):
+            teams = doc.get(section)
+            if isinstance(teams, list) and all(isinstance(t, dict) for t in teams):
+                for t_ord, team in enumerate(teams):
+                    self._insert_team(cur, sid, section, t_ord, team)
+                doc[section] = ROWS
+
+        tx = doc.get("transactions")
+        if isinstance(tx, list):
+            self._insert_transactions(cur, sid, tx)
+            doc["transactions"] = ROWS
+        elif isinstance(tx, dict) and isinstance(tx.get("items"), list):
+            self._insert_transactions(cur, sid, tx["items"])
+            doc["transactions"] = {**tx, "items": ROWS}
+
+        games = doc.get("games")
+        if isinstance(games, dict) and _is_table(games.get("weeks")):
+            for w_ord, (week, wk) in enumerate(games["weeks"].items()):
+                self._import_week(cur, sid, week, wk, w_ord)
+            doc["games"] = {**games, "weeks": ROWS}
+
+        cur.execute("INSERT INTO seasons VALUES (?, ?, ?, ?, ?)",
+                    (sid, lid, ord_, season.get("year"), _dumps(doc)))
+
+    def _export_season(self, cur, sid, weeks=None, transactions=True):
+        (doc,) = cur.execute("SELECT doc FROM seasons WHERE season_id = ?", (sid,)).fetchone()
+        season = json.loads(doc)
+
+        for section in ("teams", "team_aliases"):
+            if season.get(section) == ROWS:
+                season[section] = self._export_teams(cur, sid, section)
+
+        if not transactions:
+            pass
+        elif season.get("transactions") == ROWS:
+            season["transactions"] = self._export_transactions(cur, sid)
+        elif isinstance(season.get("transactions"), dict) and season["transactions"].get("items") == ROWS:
+            season["transactions"]["items"] = self._export_transactions(cur, sid)
+
+        games = season.get("games")
+        if isinstance(games, dict) and games.get("weeks") == ROWS:
+            sql = "SELECT week FROM weeks WHERE season_id = ? ORDER BY ord"
+            wanted = None if weeks is None else {str(w) for w in weeks}
+            games["weeks"] = {
+                week: self._export_week(cur, sid, week)
+                for (week,) in cur.execute(sql, (sid,)).fetchall()
+                if wanted is None or week in wanted
+            }
+        return season
+
+    def _delete_season_rows(self, cur, sid):
+        cur.execute("DELETE FROM lineup_entries WHERE game_key IN "
+                    "(SELECT game_key FROM games WHERE season_id = ?)", (sid,))
+        for table in ("games", "weeks", "transactions", "aliases", "teams", "seasons"):
+            cur.execute(f"DELETE FROM {table} WHERE season_id = ?", (sid,))
+
+    def _rewrite_season(self, cur, change):
+        """Fallback for edits without a targeted path: rewrite one season's rows."""
+        sid = change["season_id"]
+        lid, _ = split_season_id(sid)
+        self._ensure_season(cur, sid)
+        (ord_,) = cur.execute("SELECT ord FROM seasons WHERE season_id = ?", (sid,)).fetchone()
+        doc = {"leagues by ID": {lid: {"seasons by ID": {sid: self._export_season(cur, sid)}}}}
+        apply_change(doc, change)
+        self._delete_season_rows(cur, sid)
+        self._import_season(cur, lid, sid, doc["leagues by ID"][lid]["seasons by ID"][sid], ord_)
+
+    def _ensure_season(self, cur, sid):
+        lid, year = split_season_id(sid)
+        if cur.execute("SELECT 1 FROM meta WHERE key = 'root'").fetchone() is None:
+            cur.execute("INSERT INTO meta VALUES ('root', ?)", (_dumps({"leagues by ID": ROWS}),))
+        if cur.execute("SELECT 1 FROM leagues WHERE league_id = ?", (lid,)).fetchone() is None:
+            (ord_,) = cur.execute("SELECT COALESCE(MAX(ord) + 1, 0) FROM leagues").fetchone()
+            cur.execute("INSERT INTO leagues VALUES (?, ?, NULL, ?)",
+                        (lid, ord_, _dumps({"league_id": lid, "seasons by ID": ROWS})))
+        if cur.execute("SELECT 1 FROM seasons WHERE season_id = ?", (sid,)).fetchone() is None:
+            (ord_,) = cur.execute("SELECT COALESCE(MAX(ord) + 1, 0) FROM seasons WHERE league_id = ?",
+                                  (lid,)).fetchone()
+            cur.execute("INSERT INTO seasons VALUES (?, ?, ?, ?, ?)",
+                        (sid, lid, ord_, year, _dumps({"season_id": sid, "year": year,
+                                                       "aggregates": aggregates.empty_block()})))
+
+    # ---------- teams ----------
+    def _insert_team(self, cur, sid, section, ord_, team):
+        doc = dict(team)
+        aliases = doc.get("aliases")
+        split = isinstance(aliases, list) and all(isinstance(a, str) for a in aliases)
+        if split:
+            doc["aliases"] = ROWS
+        cur.execute("INSERT INTO teams VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (sid, team.get("team_id"), section, ord_, team.get("name"),
+                     team.get("record"), _dumps(doc)))
+        if split:
+            team_key = cur.lastrowid
+            cur.executemany(
+                "INSERT INTO aliases VALUES (?, ?, ?, ?, ?)",
+                [(sid, team_key, i, a, norm(a)) for i, a in enumerate(aliases)],
+            )
+
+    def _export_teams(self, cur, sid, section):
+        sql = "SELECT rowid, doc FROM teams WHERE season_id = ? AND section = ? ORDER BY ord"
+        teams = []
+        for team_key, doc in cur.execute(sql, (sid, section)).fetchall():
+            team = json.loads(doc)
+            if team.get("aliases") == ROWS:
+                team["aliases"] = [
+                    a for (a,) in cur.execute(
+                        "SELECT alias FROM aliases WHERE team_key = ? ORDER BY ord", (team_key,))
+                ]
+            teams.append(team)
+        return teams
+
+    # ---------- weeks / games / lineups ----------
+    def _import_week(self, cur, sid, week, wk, ord_):
+        doc = dict(wk)
+        games = doc.get("games")
+        if isinstance(games, list) and all(isinstance(g, dict) for g in games):
+            for g_ord, game in enumerate(games):
+                self._insert_game(cur, sid, week, g_ord, game)
+            doc["games"] = ROWS
+        cur.execute("INSERT INTO weeks VALUES (?, ?, ?, ?, ?)",
+                    (sid, week, ord_, wk.get("date"), _dumps(doc)))
+
+    def _export_week(self, cur, sid, week):
+        (doc,) = cur.execute("SELECT doc FROM weeks WHERE season_id = ? AND week = ?",
+                             (sid, week)).fetchone()
+        wk = json.loads(doc)
+        if wk.get("games") == ROWS:
+            sql = "SELECT game_key, doc FROM games WHERE season_id = ? AND week = ? ORDER BY ord"
+            wk["games"] = [self._export_game(cur, key, doc)
+                           for key, doc in cur.execute(sql, (sid, week)).fetchall()]
+        return wk
+
+    def _insert_game(self, cur, sid, week, ord_, game):
+        doc = dict(game)
+        lineup = []
+        for side in ("team_a", "team_b"):
+            team = doc.get(side)
+            if not isinstance(team, dict):
+                continue
+            team = dict(team)
+            for bucket in ROSTER_BUCKETS:
+                entries = team.get(bucket)
+                if isinstance(entries, list) and all(isinstance(e, dict) for e in entries):
+                    lineup.extend((side, bucket, i, e) for i, e in enumerate(entries))
+                    team[bucket] = ROWS
+            doc[side] = team
+
+        cur.execute("INSERT INTO games (game_id, season_id, week, ord, team_a_id, team_b_id, doc) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (game.get("game_id"), sid, week, ord_,
+                     (game.get("team_a") or {}).get("team_id"),
+                     (game.get("team_b") or {}).get("team_id"), _dumps(doc)))
+        game_key = cur.lastrowid
+
+        rows = []
+        for side, bucket, i, e in lineup:
+            p = e.get("player") if isinstance(e.get("player"), dict) else {}
+            rows.append((game_key, side, bucket, i, e.get("slot"), p.get("name"), p.get("team"),
+                         p.get("position"), _float_or_none(p.get("proj")),
+                         _float_or_none(p.get("fpts")), _dumps(e)))
+        cur.executemany("INSERT INTO lineup_entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def _export_game(self, cur, game_key, doc):
+        game = json.loads(doc)
+        sql = ("SELECT side, bucket, doc FROM lineup_entries WHERE game_key = ? "
+               "ORDER BY side, bucket, ord")
+        rows = cur.execute(sql, (game_key,)).fetchall()
+        for side in ("team_a", "team_b"):
+            team = game.get(side)
+            if not isinstance(team, dict):
+                continue
+            for bucket in ROSTER_BUCKETS:
+                if team.get(bucket) == ROWS:
+                    team[bucket] = [json.loads(d) for s, b, d in rows if s == side and b == bucket]
+        return game
+
+    # ---------- transactions ----------
+    def _insert_transactions(self, cur, sid, transactions):
+        cur.executemany(
+            "INSERT INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(sid, i, t.get("transaction_id"), t.get("date"), t.get("time"), t.get("type"),
+              t.get("team_id"), _dumps(t)) for i, t in enumerate(transactions)],
+        )
+
+    def _export_transactions(self, cur, sid):
+        sql = "SELECT doc FROM transactions WHERE season_id = ? ORDER BY ord"
+        return [json.loads(doc) for (doc,) in cur.execute(sql, (sid,))]
+
+    # ---------- raw stats ----------
+    def _import_raw_stats(self, cur, raw):
+        """Split Raw Stats -> season by ID -> <season> -> <section> -> <category> tables into rows."""
+        if not isinstance(raw, dict) or not isinstance(raw.get("season by ID"), dict):
+            return raw
+        skeleton = {**raw, "season by ID": {}}
+        rows = []
+        for skey, sdata in raw["season by ID"].items():
+            if not isinstance(sdata, dict):
+                skeleton["season by ID"][skey] = sdata
+                continue
+            sk_season = skeleton["season by ID"][skey] = {}
+            for section, sec in sdata.items():
+                if not isinstance(sec, dict):
+                    sk_season[section] = sec
+                    continue
+                sk_sec = sk_season[section] = {}
+                for category, cat in sec.items():
+                    if isinstance(cat, dict) and cat and _is_table(cat):
+                        rows.extend((skey, section, category, i, pid, _dumps(p))
+                                    for i, (pid, p) in enumerate(cat.items()))
+                        sk_sec[category] = ROWS
+                    else:
+                        sk_sec[category] = cat
+        cur.executemany("INSERT INTO raw_stats VALUES (?, ?, ?, ?, ?, ?)", rows)
+        return skeleton
+
+    def _export_raw_stats(self, cur, skeleton):
+        if not isinstance(skeleton, dict) or not isinstance(skeleton.get("season by ID"), dict):
+            return skeleton
+        sql = ("SELECT player_id, doc FROM raw_stats "
+               "WHERE season_key = ? AND section = ? AND category = ? ORDER BY ord")
+        for skey, sdata in skeleton["season by ID"].items():
+            if not isinstance(sdata, dict):
+                continue
+            for section, sec in sdata.items():
+                if not isinstance(sec, dict):
+                    continue
+                for category, cat in sec.items():
+                    if cat == ROWS:
+                        sec[category] = {pid: json.loads(doc)
+                                         for pid, doc in cur.execute(sql, (skey, section, category))}
+        return skeleton
+
+    # ---------- partial load + row-level commit ----------
+    def load_season(self, league_id, year, weeks=None, transactions=True):
+        """Only the requested season, wrapped in the usual document shape."""
+        cur = self.conn.cursor()
+        sid = f"{league_id}S{int(year)}"
+        data = {"leagues by ID": {}}
+        if cur.execute("SELECT 1 FROM leagues WHERE league_id = ?", (league_id,)).fetchone():
+            data["leagues by ID"][league_id] = self._export_league(
+                cur, league_id, only_season=sid, weeks=weeks, transactions=transactions)
+        return data
+
+    def commit(self, data, changes):
+        """Apply change records as row-level writes in one transaction; `data` is ignored."""
+        with self.conn as conn:
+            cur = conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")  # take the write lock before reading anything
+            for change in changes:
+                op = change["op"]
+                if op == "add_game":
+                    self._commit_add_game(cur, change)
+                elif op == "remove_game":
+                    self._commit_remove_game(cur, change)
+                elif op == "set_team":
+                    self._commit_set_team(cur, change)
+                elif op in ("add_transactions", "remove_transactions"):
+                    self._commit_transactions(cur, change)
+                elif op == "set_aggregates":
+                    self._commit_set_aggregates(cur, change)
+                elif op in ("set_raw_stats", "set_players"):
+                    self._commit_root(cur, change)
+                else:
+                    self._rewrite_season(cur, change)
+
+    def _commit_add_game(self, cur, change):
+        sid, week = change["season_id"], str(change["week"])
+        self._ensure_season(cur, sid)
+        (doc,) = cur.execute("SELECT doc FROM seasons WHERE season_id = ?", (sid,)).fetchone()
+        season = json.loads(doc)
+        games = season.get("games")
+        if games is None or (isinstance(games, dict) and "weeks" not in games):
+            season.setdefault("games", {})["weeks"] = ROWS
+            cur.execute("UPDATE seasons SET doc = ? WHERE season_id = ?", (_dumps(season), sid))
+        elif not (isinstance(games, dict) and games.get("weeks") == ROWS):
+            self._rewrite_season(cur, change)
+            return
+
+        row = cur.execute("SELECT doc FROM weeks WHERE season_id = ? AND week = ?", (sid, week)).fetchone()
+        if row is None:
+            (ord_,) = cur.execute("SELECT COALESCE(MAX(ord) + 1, 0) FROM weeks WHERE season_id = ?",
+                                  (sid,)).fetchone()
+            wk = {"games": ROWS, "date": change["date"]}
+            cur.execute("INSERT INTO weeks VALUES (?, ?, ?, ?, ?)",
+                        (sid, week, ord_, change["date"], _dumps(wk)))
+        else:
+            wk = json.loads(row[0])
+            if wk.get("games") != ROWS:
+                self._rewrite_season(cur, change)
+                return
+            wk["date"] = change["date"]
+            cur.execute("UPDATE weeks SET date = ?, doc = ? WHERE season_id = ? AND week = ?",
+                        (change["date"], _dumps(wk), sid, week))
+
+        sql = "SELECT doc FROM games WHERE season_id = ? AND week = ? ORDER BY ord"
+        existing = [json.loads(doc) for (doc,) in cur.execute(sql, (sid, week)).fetchall()]
+        game = merge_new_game(existing, change)
+        if game is not None:
+            self._insert_game(cur, sid, week, len(existing), game)
+            self._update_aggregates(cur, sid, game, week, 1)
+
+    def _commit_remove_game(self, cur, change):
+        sid, week = change["season_id"], str(change["week"])
+        sql = "SELECT game_key, game_id, doc FROM games WHERE season_id = ? AND week = ? ORDER BY ord"
+        rows = cur.execute(sql, (sid, week)).fetchall()
+        target = rows[find_removed_game([json.loads(doc) for _, _, doc in rows], change)]
+
+        cur.execute("DELETE FROM lineup_entries WHERE game_key = ?", (target[0],))
+        cur.execute("DELETE FROM games WHERE game_key = ?", (target[0],))
+        self._update_aggregates(cur, sid, json.loads(target[2]), week, -1)
+
+        # reindex the rest of the week exactly like apply_remove does
+        remaining = [r for r in rows if r[0] != target[0]]
+        for j, (game_key, old_id, doc) in enumerate(remaining, start=1):
+            new_id = f"{sid}W{week}G{j}"
+            if old_id == new_id:
+                continue
+            game = json.loads(doc)
+            game["game_id"] = new_id
+            cur.execute("UPDATE games SET game_id = ?, doc = ? WHERE game_key = ?",
+                        (new_id, _dumps(game), game_key))
+
+    def _commit_transactions(self, cur, change):
+        """Re-sort/re-number one season's transaction rows; games, teams and aliases aren't touched."""
+        sid = change["season_id"]
+        self._ensure_season(cur, sid)
+        (doc,) = cur.execute("SELECT doc FROM seasons WHERE season_id = ?", (sid,)).fetchone()
+        season = json.loads(doc)
+        tx = season.get("transactions")
+        if tx is None:
+            season["transactions"] = ROWS
+            cur.execute("UPDATE seasons SET doc = ? WHERE season_id = ?", (_dumps(season), sid))
+        elif not (tx == ROWS or (isinstance(tx, dict) and tx.get("items") == ROWS)):
+            self._rewrite_season(cur, change)  # stored inline: not split into rows
+            return
+
+        lid, _ = split_season_id(sid)
+        mini = {"leagues by ID": {lid: {"seasons by ID": {sid: {"transactions": self._export_transactions(cur, sid)}}}}}
+        apply_change(mini, change)
+        cur.execute("DELETE FROM transactions WHERE season_id = ?", (sid,))
+        self._insert_transactions(cur, sid, mini["leagues by ID"][lid]["seasons by ID"][sid]["transactions"])
+
+    def _commit_set_aggregates(self, cur, change):
+        sid = change["season_id"]
+        self._ensure_season(cur, sid)
+        (doc,) = cur.execute("SELECT doc FROM seasons WHERE season_id = ?", (sid,)).fetchone()
+        season = json.loads(doc)
+        season["aggregates"] = change["aggregates"]
+        cur.execute("UPDATE seasons SET doc = ? WHERE season_id = ?", (_dumps(season), sid))
+
+    def _update_aggregates(self, cur, sid, game, week, sign):
+        """Game delta on the aggregates block in the season row (totals stay in the game doc)."""
+        (doc,) = cur.execute("SELECT doc FROM seasons WHERE season_id = ?", (sid,)).fetchone()
+        season = json.loads(doc)
+        if isinstance(season.get("aggregates"), dict):
+            aggregates.apply_game(season["aggregates"], game, week, sign)
+            cur.execute("UPDATE seasons SET doc = ? WHERE season_id = ?", (_dumps(season), sid))
+
+    def _commit_root(self, cur, change):
+        """Raw Stats sections / Players entries: only their rows plus the root skeleton in meta."""
+        (doc,) = cur.execute("SELECT value FROM meta WHERE key = 'root'").fetchone() or ("{}",)
+        root = json.loads(doc)
+        if change["op"] == "set_raw_stats":
+            skey = change["season_key"]
+            seasons = root.setdefault("Raw Stats", {}).setdefault("season by ID", {})
+            for section in change["sections"]:
+                cur.execute("DELETE FROM raw_stats WHERE season_key = ? AND section = ?", (skey, section))
+            split = self._import_raw_stats(cur, {"season by ID": {skey: change["sections"]}})
+            seasons[skey] = apply_raw_stats(seasons.get(skey), {"sections": split["season by ID"][skey]})
+        elif isinstance(root.get("Players"), dict) or not _is_table(change["players"]):
+            root.setdefault("Players", {}).update(change["players"])  # kept inline
+        else:
+            cur.executemany(
+                "INSERT INTO players VALUES (?, (SELECT COALESCE(MAX(ord) + 1, 0) FROM players), ?, ?, ?) "
+                "ON CONFLICT (player_id) DO UPDATE SET name = excluded.name, "
+                "position = excluded.position, doc = excluded.doc",
+                [(pid, p.get("name"), p.get("position"), _dumps(p)) for pid, p in change["players"].items()],
+            )
+            root["Players"] = ROWS
+        cur.execute("INSERT OR REPLACE INTO meta VALUES ('root', ?)", (_dumps(root),))
+
+    def _commit_set_team(self, cur, change):
+        sid, team = change["season_id"], change["team"]
+        row = cur.execute("SELECT rowid, section, ord FROM teams WHERE season_id = ? AND team_id = ? "
+                          "ORDER BY section DESC LIMIT 1", (sid, team.get("team_id"))).fetchone()
+        if row is None:
+            self._rewrite_season(cur, change)
+            return
+        team_key, section, ord_ = row
+        cur.execute("DELETE FROM aliases WHERE team_key = ?", (team_key,))
+        cur.execute("DELETE FROM teams WHERE rowid = ?", (team_key,))
+        self._insert_team(cur, sid, section, ord_, team)
+
+
+# --------------------------------------
+# Sharded directory backend
+# --------------------------------------
+def _safe(name):
+    return re.sub(r"[^A-Za-z0-9._-]", "_", str(name))
+
+class ShardStore:
+    """
+    <dir>/manifest.json                 root skeleton + league docs + week lists
+    <dir>/<league>/<season>/season.json  season minus games/transactions
+    <dir>/<league>/<season>/week_<n>.json
+    <dir>/<league>/<season>/transactions.json
+    <dir>/raw_stats/<season key>.json
+    <dir>/players.json
+    """
+    def __init__(self, path):
+        path = str(path)
+        if os.path.basename(path) == MANIFEST:
+            path = os.path.dirname(path)
+        self.path = path.rstrip("/\\") or "."
+        self.manifest_path = os.path.join(self.path, MANIFEST)
+
+    # ---------- files ----------
+    def _read(self, rel):
+        with open(os.path.join(self.path, rel), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write(self, rel, data):
+        full = os.path.join(self.path, rel)
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        atomic_write(full, lambda f: json.dump(data, f, indent=2))
+
+    def _manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return {"layout": "shards", "version": 1, "root": {"leagues by ID": ROWS}, "leagues": {}}
+        return self._read(MANIFEST)
+
+    @staticmethod
+    def _season_dir(lid, sid):
+        return f"{_safe(lid)}/{_safe(sid)}"
+
+    def _week_file(self, lid, sid, week):
+        return f"{self._season_dir(lid, sid)}/week_{_safe(week)}.json"
+
+    def _tx_file(self, lid, sid):
+        return f"{self._season_dir(lid, sid)}/transactions.json"
+
+    def _season_file(self, lid, sid):
+        return f"{self._season_dir(lid, sid)}/season.json"
+
+    # ---------- seasons ----------
+    def _read_season(self, lid, sid):
+        """Season shard with an empty weeks dict; fill with _read_week / _read_tx."""
+        season = self._read(self._season_file(lid, sid))
+        games = season.get("games")
+        if isinstance(games, dict) and games.get("weeks") == ROWS:
+            games["weeks"] = {}
+        return season
+
+    def _read_week(self, manifest, lid, sid, season, week):
+        weeks = season.get("games", {}).get("weeks")
+        week = str(week)
+        on_disk = manifest["leagues"].get(lid, {}).get("seasons", {}).get(sid, {}).get("weeks", [])
+        if isinstance(weeks, dict) and week in on_disk and week not in weeks:
+            weeks[week] = self._read(self._week_file(lid, sid, week))
+
+    def _read_tx(self, lid, sid, season):
+        tx = season.get("transactions")
+        if tx == ROWS:
+            season["transactions"] = self._read(self._tx_file(lid, sid))
+        elif isinstance(tx, dict) and tx.get("items") == ROWS:
+            tx["items"] = self._read(self._tx_file(lid, sid))
+
+    def _split_season(self, season):
+        """-> (season shard doc, weeks dict or None, transactions list or None)"""
+        doc = dict(season)
+        weeks = txs = None
+        games = doc.get("games")
+        if isinstance(games, dict) and _is_table(games.get("weeks")):
+            weeks = games["weeks"]
+            doc["games"] = {**games, "weeks": ROWS}
+        tx = doc.get("transactions")
+        if isinstance(tx, list):
+            txs = tx
+            doc["transactions"] = ROWS
+        elif isinstance(tx, dict) and isinstance(tx.get("items"), list):
+            txs = tx["items"]
+            doc["transactions"] = {**tx, "items": ROWS}
+        return doc, weeks, txs
+
+    def _load_league(self, manifest, lid, only_season=None, weeks=None, transactions=True):
+        entry = manifest["leagues"][lid]
+        league = dict(entry["doc"])
+        if league.get("seasons by ID") == ROWS:
+            league["seasons by ID"] = {}
+            for sid, s_entry in entry["seasons"].items():
+                if only_season is not None and sid != only_season:
+                    continue
+                season = self._read_season(lid, sid)
+                wanted = s_entry["weeks"] if weeks is None else [str(w) for w in weeks]
+                for week in wanted:
+                    self._read_week(manifest, lid, sid, season, week)
+                if transactions:
+                    self._read_tx(lid, sid, season)
+                league["seasons by ID"][sid] = season
+        return league
+
+    # ---------- whole document ----------
+    def load(self):
+        manifest = self._manifest()
+        root = dict(manifest["root"])
+        if root.get("leagues by ID") == ROWS:
+            root["leagues by ID"] = {lid: self._load_league(manifest, lid) for lid in manifest["leagues"]}
+        raw = root.get("Raw Stats")
+        if isinstance(raw, dict) and isinstance(raw.get("season by ID"), dict):
+            raw["season by ID"] = {
+                skey: self._read(f"raw_stats/{_safe(skey)}.json") if sdata == ROWS else sdata
+                for skey, sdata in raw["season by ID"].items()
+            }
+        if root.get("Players") == ROWS:
+            root["Players"] = self._read("players.json")
+        return root
+
+    def save(self, data):
+        """Rewrite every shard from `data`, then the manifest, then drop orphans."""
+        os.makedirs(self.path, exist_ok=True)
+        with master_lock(self.manifest_path):
+            written = set()
+
+            def put(rel, obj):
+                self._write(rel, obj)
+                written.add(os.path.normpath(rel))
+
+            root = dict(data)
+            manifest = {"layout": "shards", "version": 1, "root": root, "leagues": {}}
+            leagues = root.get("leagues by ID")
+            if _is_table(leagues):
+                for lid, league in leagues.items():
+                    doc = dict(league)
+                    entry = manifest["leagues"][lid] = {"doc": doc, "seasons": {}}
+                    seasons = doc.get("seasons by ID")
+                    if not _is_table(seasons):
+                        continue
+                    for sid, season in seasons.items():
+                        shard, weeks, txs = self._split_season(season)
+                        entry["seasons"][sid] = {"weeks": list(weeks or {})}
+                        for week, wk in (weeks or {}).items():
+                            put(self._week_file(lid, sid, week), wk)
+                        if txs is not None:
+                            put(self._tx_file(lid, sid), txs)
+                        put(self._season_file(lid, sid), shard)
+                    doc["seasons by ID"] = ROWS
+                root["leagues by ID"] = ROWS
+
+            raw = root.get("Raw Stats")
+            if isinstance(raw, dict) and isinstance(raw.get("season by ID"), dict):
+                raw = root["Raw Stats"] = {**raw, "season by ID": dict(raw["season by ID"])}
+                for skey, sdata in raw["season by ID"].items():
+                    if isinstance(sdata, dict):
+                        put(f"raw_stats/{_safe(skey)}.json", sdata)
+                        raw["season by ID"][skey] = ROWS
+            if isinstance(root.get("Players"), dict):
+                put("players.json", root["Players"])
+                root["Players"] = ROWS
+
+            self._write(MANIFEST, manifest)
+
+            for folder, _, files in os.walk(self.path):
+                for name in files:
+                    rel = os.path.normpath(os.path.relpath(os.path.join(folder, name), self.path))
+                    if name.endswith(".json") and rel != MANIFEST and rel not in written:
+                        os.remove(os.path.join(folder, name))
+
+    # ---------- partial load + shard-level commit ----------
+    def load_season(self, league_id, year, weeks=None, transactions=True):
+        """Only the requested season (and weeks) in the usual document shape."""
+        manifest = self._manifest()
+        data = {"leagues by ID": {}}
+        if league_id in manifest["leagues"]:
+            data["leagues by ID"][league_id] = self._load_league(
+                manifest, league_id, f"{league_id}S{int(year)}", weeks, transactions)
+        return data
+
+    def commit(self, data, changes):
+        """Re-read just the shards each change touches (under the lock) and write them back."""
+        with master_lock(self.manifest_path):
+            manifest = self._manifest()
+            mini = {"leagues by ID": {}}
+            touched = {}  # sid -> {"lid", "before", "weeks", "tx"}
+
+            root_changed = False
+            for change in changes:
+                if change["op"] in ("set_raw_stats", "set_players"):
+                    self._commit_root(manifest["root"], change)
+                    root_changed = True
+                    continue
+                sid = change["season_id"]
+                lid, _ = split_season_id(sid)
+                league = mini["leagues by ID"].get(lid)
+                if league is None and lid in manifest["leagues"]:
+                    league = mini["leagues by ID"][lid] = {**manifest["leagues"][lid]["doc"], "seasons by ID": {}}
+
+                t = touched.get(sid)
+                if t is None:
+                    t = touched[sid] = {"lid": lid, "before": None, "weeks": set(), "tx": False}
+                    if lid in manifest["leagues"] and sid in manifest["leagues"][lid]["seasons"]:
+                        season = league["seasons by ID"][sid] = self._read_season(lid, sid)
+                        t["before"] = _dumps(self._split_season(season)[0])
+
+                season = (league or {}).get("seasons by ID", {}).get(sid)
+                if change["op"] in ("add_game", "remove_game"):
+                    t["weeks"].add(str(change["week"]))
+                    if season is not None:
+                        self._read_week(manifest, lid, sid, season, change["week"])
+                elif change["op"] in ("add_transactions", "remove_transactions"):
+                    t["tx"] = True
+                    if season is not None:
+                        self._read_tx(lid, sid, season)
+
+                apply_change(mini, change)
+
+            manifest_changed = False
+            for sid, t in touched.items():
+                lid = t["lid"]
+                league = mini["leagues by ID"][lid]
+                if lid not in manifest["leagues"]:
+                    manifest["leagues"][lid] = {"doc": {**league, "seasons by ID": ROWS}, "seasons": {}}
+                    manifest_changed = True
+                entry = manifest["leagues"][lid]["seasons"].setdefault(sid, {"weeks": []})
+
+                shard, weeks, txs = self._split_season(league["seasons by ID"][sid])
+                for week in sorted(t["weeks"]):
+                    if weeks and week in weeks:
+                        self._write(self._week_file(lid, sid, week), weeks[week])
+                        if week not in entry["weeks"]:
+                            entry["weeks"].append(week)
+                            manifest_changed = True
+                if t["tx"] and txs is not None:
+                    self._write(self._tx_file(lid, sid), txs)
+                if _dumps(shard) != t["before"]:
+                    self._write(self._season_file(lid, sid), shard)
+                    manifest_changed = manifest_changed or t["before"] is None
+
+            if manifest_changed or root_changed:
+                self._write(MANIFEST, manifest)
+
+    def _commit_root(self, root, change):
+        """Rewrite one raw_stats/<season key>.json or players.json; the manifest root points at it."""
+        if change["op"] == "set_raw_stats":
+            skey = change["season_key"]
+            seasons = root.setdefault("Raw Stats", {}).setdefault("season by ID", {})
+            rel = f"raw_stats/{_safe(skey)}.json"
+            current = self._read(rel) if seasons.get(skey) == ROWS else seasons.get(skey)
+            self._write(rel, apply_raw_stats(current, change))
+            seasons[skey] = ROWS
+        else:
+            current = self._read("players.json") if root.get("Players") == ROWS else root.get("Players")
+            self._write("players.json", {**(current or {}), **change["players"]})
+            root["Players"] = ROWS
+
+# --------------------------------------
+# Staged (parallel) ingest
+# --------------------------------------
+class StagedStore:
+    """Reads the master as usual but parks commits in <master>.staged/ for `merge`."""
+    def __init__(self, store):
+        self.store = store
+        self.path = store.path
+
+    def load(self):
+        return self.store.load()
+
+    def load_season(self, league_id, year, weeks=None, transactions=True):
+        return self.store.load_season(league_id, year, weeks, transactions)
+
+    def save(self, data):
+        raise ValueError("Whole-file saves can't be staged; run without --stage.")
+
+    def commit(self, data, changes):
+        folder = str(self.path) + STAGED_SUFFIX
+        os.makedirs(folder, exist_ok=True)
+        name = os.path.join(folder, f"{time.time_ns():020d}-{os.getpid()}.jsonl")
+        atomic_write(name, lambda f: f.writelines(_dumps(c) + "\n" for c in changes))
+        print(f"📦 Staged {len(changes)} change(s) in {name}")
+
+def merge_staged(path):
+    """Apply every staged change file (oldest first) in one locked write; returns file count."""
+    folder = str(path) + STAGED_SUFFIX
+    names = sorted(n for n in os.listdir(folder) if n.endswith(".jsonl")) if os.path.isdir(folder) else []
+    if not names:
+        return 0
+
+    changes = []
+    for n in names:
+        with open(os.path.join(folder, n), "r", encoding="utf-8") as f:
+            changes.extend(json.loads(line) for line in f if line.strip())
+
+    open_store(path).commit(None, changes)
+    for n in names:
+        os.remove(os.path.join(folder, n))
+    return len(names)
+
+def open_store(path, stage=False):
+    path_str = str(path)
+    if os.path.isdir(path_str) or path_str.endswith(("/", "\\")) or os.path.basename(path_str) == MANIFEST:
+        store = ShardStore(path)
+    elif path_str.lower().endswith(SQLITE_SUFFIXES):
+        store = SqliteStore(path)
+    else:
+        store = JsonStore(path)
+    return StagedStore(store) if stage else store
+
+# --------------------------------------
+# CLI
+# --------------------------------------
+def usage():
+    print("Usage:")
+    print("  Import:  python storage.py import <fantasy.json> <fantasy.db>")
+    print("  Export:  python storage.py export <fantasy.db> <fantasy.json>")
+    print("  Journal: python storage.py journal <fantasy.json>")
+    print("  Compact: python storage.py compact <fantasy.json>")
+    print("  Merge:   python storage.py merge <master_file>")
+    sys.exit(1)
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        usage()
+
+    cmd = sys.argv[1].lower()
+
+    try:
+        if cmd in ("import", "export"):
+            if len(sys.argv) != 4:
+                usage()
+            _, _, src, dst = sys.argv
+            data = open_store(src).load()
+            open_store(dst).save(data)
+            print(f"✅ {cmd.capitalize()}ed {src} → {dst}")
+
+        elif cmd in ("journal", "compact"):
+            if len(sys.argv) != 3:
+                usage()
+            store = open_store(sys.argv[2])
+            if not isinstance(store, JsonStore):
+                raise ValueError("Journal mode is only for JSON master files.")
+            if cmd == "journal":
+                store.enable_journal()
+                print(f"📓 Journal mode on: changes go to {store.journal_path}")
+            else:
+                count = store.compact()
+                print(f"🗜️ Compacted {count} journal record(s) into {store.path}")
+
+        elif cmd == "merge":
+            if len(sys.argv) != 3:
+                usage()
+            count = merge_staged(sys.argv[2])
+            print(f"✅ Merged {count} staged file(s) into {sys.argv[2]}")
+
+        else:
+            usage()
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
@@ -0,0 +1,498 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic league data for load and scale testing.
+
+Writes into <out_dir>:
+  fantasy.json (or --master name.db / name/ for the SQLite / shard stores)
+      leagues × seasons in the current "leagues by ID" schema: divisions,
+      teams (renamed teams keep their old name as an alias), a snake draft,
+      round-robin weekly games with full rosters, add/drop transactions that
+      keep rosters and lineups consistent, aggregates, plus root Raw Stats
+      (Week1..N per year) and the Players registry
+  new_game.json          next week's first matchup of L001's newest season
+  new_transaction.json   one drop/add pair dated after the last week
+  stats/{passing,rushing,receiving}_week{N}.csv
+                         next week's stat lines in the layout parse_weekly_csv reads
+
+Lineup fpts are the PPR points of the player's Raw Stats line (K and D/ST
+get random points), so reconcile.py, verification.py and integrity.py all
+run clean on the output. The same seed and sizes always give the same files.
+
+Usage:
+  python synthetic.py <out_dir> [--seed 1] [--leagues 1] [--seasons 1] [--weeks 14] [--teams 12]
+                      [--bench 7] [--transactions 80] [--players 400] [--master fantasy.json]
+"""
+
+import csv
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+import aggregates
+import game_rules
+import migrate
+import storage
+from add_remove_game import DEFAULT_STARTER_SLOTS
+from names import base_player_id
+
+NFL_TEAMS = [
+    ("ARI", "Cardinals"), ("ATL", "Falcons"), ("BAL", "Ravens"), ("BUF", "Bills"),
+    ("CAR", "Panthers"), ("CHI", "Bears"), ("CIN", "Bengals"), ("CLE", "Browns"),
+    ("DAL", "Cowboys"), ("DEN", "Broncos"), ("DET", "Lions"), ("GB", "Packers"),
+    ("HOU", "Texans"), ("IND", "Colts"), ("JAX", "Jaguars"), ("KC", "Chiefs"),
+    ("LV", "Raiders"), ("LAC", "Chargers"), ("LAR", "Rams"), ("MIA", "Dolphins"),
+    ("MIN", "Vikings"), ("NE", "Patriots"), ("NO", "Saints"), ("NYG", "Giants"),
+    ("NYJ", "Jets"), ("PHI", "Eagles"), ("PIT", "Steelers"), ("SF", "49ers"),
+    ("SEA", "Seahawks"), ("TB", "Buccaneers"), ("TEN", "Titans"), ("WSH", "Commanders"),
+]
+FIRST = ["Aaron", "Bo", "Cam", "Dak", "Eli", "Femi", "Gus", "Hank", "Isaiah", "Jalen", "Kyle", "Lamar",
+         "Marcus", "Nico", "Omar", "Puka", "Quinn", "Rashid", "Saquon", "Tyler", "Uriah", "Vince",
+         "Wes", "Xavier", "Yusuf", "Zay", "Andre", "Brock", "Chase", "Derrick", "Emeka", "Tre"]
+LAST_A = ["Bar", "Cal", "Dun", "Ell", "Fos", "Gar", "Hol", "Jen", "Kel", "Lam", "Mor", "Nel",
+          "Oak", "Pit", "Ram", "San", "Tur", "Val", "Whit", "Yor"]
+LAST_B = ["ber", "ton", "ley", "son", "well", "den", "ford", "man", "ridge", "ington",
+          "ey", "ard", "stone", "wood", "field", "er", "by", "ins", "ock", "worth"]
+ADJECTIVES = ["Mighty", "Rusty", "Salty", "Flying", "Sneaky", "Golden", "Midnight", "Lucky",
+              "Angry", "Frozen", "Electric", "Silent", "Crimson", "Wobbly", "Savage", "Cosmic"]
+NOUNS = ["Moles", "Steamers", "Badgers", "Comets", "Gravy Boats", "Walruses", "Tacos", "Wizards",
+         "Pirates", "Yetis", "Sloths", "Hornets", "Llamas", "Goblins", "Rockets", "Pickles"]
+DIVISIONS = ["North Division", "South Division", "East Division", "West Division"]
+
+SKILL_SHARES = (("QB", 0.14), ("RB", 0.30), ("WR", 0.40), ("TE", 0.16))
+FLEX_POSITIONS = ("RB", "WR", "TE")
+# same weights as scoring.RULE_SETS["ppr"]
+PPR = {"pass_yards": 0.04, "pass_td": 4, "interceptions": -2, "rush_yards": 0.1, "rush_td": 6,
+       "receptions": 1, "rec_yards": 0.1, "rec_td": 6}
+MAX_WEEKS = 17  # keeps every week (and transaction) inside the calendar year
+
+def arg(flag, default):
+    if flag in sys.argv:
+        return type(default)(sys.argv[sys.argv.index(flag) + 1])
+    return default
+
+def first_sunday(year):
+    d = date(year, 9, 1)
+    return d + timedelta(days=(6 - d.weekday()) % 7)
+
+def week_day(year, week):
+    return first_sunday(year) + timedelta(weeks=week - 1)
+
+def clock(rng):
+    return f"{rng.randint(1, 12)}:{rng.randint(0, 59):02d} {rng.choice(('am', 'pm'))}"
+
+# --------------------------------------
+# Players + Raw Stats
+# --------------------------------------
+def build_pool(rng, n_players):
+    """Players registry {pid: {...}} plus per-pid quality (0.3-1.0) for projections and stats."""
+    if n_players > len(FIRST) * len(LAST_A) * len(LAST_B) - 64:
+        sys.exit(f"❌ --players can be at most {len(FIRST) * len(LAST_A) * len(LAST_B) - 64}")
+    players, quality, site_keys, taken = {}, {}, set(), set()
+
+    def add(name, position, team):
+        # lineups only carry names, so a name is never reused across positions
+        pid = base_player_id(name, position)
+        if pid in players or name in taken:
+            return False
+        taken.add(name)
+        players[pid] = {"name": name, "position": position, "team": team, "age": rng.randint(21, 36)}
+        if position not in ("K", "D/ST"):
+            key, n = f"{name.split()[-1][:4]}{name.split()[0][:2]}", 0
+            while f"{key}{n:02d}" in site_keys:
+                n += 1
+            site_keys.add(f"{key}{n:02d}")
+            players[pid]["site_key"] = f"{key}{n:02d}"
+        quality[pid] = round(rng.uniform(0.3, 1.0), 3)
+        return True
+
+    def random_name():
+        return f"{rng.choice(FIRST)} {rng.choice(LAST_A)}{rng.choice(LAST_B)}"
+
+    for abbrev, nickname in NFL_TEAMS:
+        add(f"{nickname} D/ST", "D/ST", abbrev)
+        while not add(random_name(), "K", abbrev):
+            pass
+    for position, share in SKILL_SHARES:
+        for _ in range(max(1, round(n_players * share))):
+            while not add(random_name(), position, rng.choice(NFL_TEAMS)[0]):
+                pass
+    return players, quality
+
+def nfl_schedule(rng, year, week):
+    """{abbrev: (opponent, home, points_for, points_against, game date)} for one NFL week."""
+    teams = [abbrev for abbrev, _ in NFL_TEAMS]
+    rng.shuffle(teams)
+    out, sunday = {}, week_day(year, week)
+    for a, b in zip(teams[::2], teams[1::2]):
+        pa, pb = rng.randint(6, 45), rng.randint(6, 45)
+        day = sunday + timedelta(days=rng.choice((0, 0, 0, 1, -3)))
+        out[a] = (b, True, pa, pb, day)
+        out[b] = (a, False, pb, pa, day)
+    return out
+
+def stat_lines(rng, info, q):
+    """{category: line fields} for one player-week (parse_weekly_csv's stat fields)."""
+    pos, lines = info["position"], {}
+    if pos == "QB":
+        att = rng.randint(22, 45)
+        cmp_ = round(att * rng.uniform(0.55, 0.75))
+        yards = round(att * rng.uniform(5.0, 8.5) * (0.7 + 0.3 * q))
+        lines["Passing"] = {"completions": cmp_, "attempts": att, "cmp_pct": round(100 * cmp_ / att, 1),
+                            "pass_yards": yards, "pass_td": rng.choices(range(5), (3, 6, 6 * q, 4 * q, q))[0],
+                            "interceptions": rng.choices(range(3), (6, 3, 1))[0],
+                            "qb_rating": round(rng.uniform(60, 130), 1)}
+    if pos in ("QB", "RB"):
+        att = rng.randint(1, 6) if pos == "QB" else round(rng.randint(6, 24) * (0.5 + 0.5 * q))
+        yards = round(att * rng.uniform(2.0, 6.0))
+        lines["Rushing"] = {"rush_attempts": att, "rush_yards": yards,
+                            "rush_avg": round(yards / att, 1) if att else 0.0,
+                            "rush_td": rng.choices(range(3), (8, 3 * q, q))[0]}
+    if pos in ("RB", "WR", "TE"):
+        tgt = round(rng.randint(2 if pos == "RB" else 3, 8 if pos == "RB" else 13) * (0.5 + 0.5 * q))
+        rec = rng.randint(0, tgt)
+        yards = round(rec * rng.uniform(6.0, 16.0))
+        lines["Receiving"] = {"targets": tgt, "receptions": rec, "rec_yards": yards,
+                              "rec_avg": round(yards / rec, 1) if rec else 0.0,
+                              "rec_td": rng.choices(range(3), (8, 3 * q, q))[0],
+                              "long": min(yards, rng.randint(5, 60))}
+    return lines
+
+def ppr_points(lines):
+    return round(sum(v * PPR.get(k, 0) for line in lines.values() for k, v in line.items()), 2)
+
+def raw_week(rng, players, quality, year, week, schedule):
+    """Raw Stats week node + {pid: (fpts, proj, opponent)} for every player."""
+    node = {"week_id": f"Week{week}", "Passing": {}, "Rushing": {}, "Receiving": {}}
+    points = {}
+    for pid, info in players.items():
+        opp, home, pf, pa, day = schedule[info["team"]]
+        opponent = opp if home else f"@{opp}"
+        q = quality[pid]
+        if info["position"] in ("K", "D/ST"):
+            fpts = round(rng.uniform(0, 16) * (0.6 + 0.4 * q), 2)
+        else:
+            lines = stat_lines(rng, info, q)
+            fpts = ppr_points(lines)
+            for category, fields in lines.items():
+                node[category][pid] = {
+                    "player_id": pid, "name": info["name"], "team": info["team"], "position": info["position"],
+                    "age": info["age"], "season": f"S{year}", "week": week, "week_id": f"Week{week}",
+                    "game_date": day.isoformat(), "result": f"{'W' if pf > pa else 'L' if pf < pa else 'T'} {pf}-{pa}",
+                    **fields}
+        proj = round(max(0.5, fpts * rng.uniform(0.6, 1.3) + rng.uniform(-2, 4)) * (0.7 + 0.3 * q), 1)
+        points[pid] = (fpts, proj, opponent)
+    return node, points
+
+# --------------------------------------
+# One league-season
+# --------------------------------------
+def draft(rng, teams, players, quality, bench):
+    """Snake draft: each team fills its starting slots, then bench picks. → (rosters, draft node)."""
+    plans = {}
+    for t in teams:
+        plan = [s if s != "FLEX" else rng.choice(FLEX_POSITIONS) for s in DEFAULT_STARTER_SLOTS]
+        plan += [rng.choice(("QB",) + FLEX_POSITIONS + FLEX_POSITIONS) for _ in range(bench)]
+        plans[t["team_id"]] = plan
+    by_pos = {}
+    for pid in sorted(players, key=lambda p: -quality[p]):
+        by_pos.setdefault(players[pid]["position"], []).append(pid)
+
+    rosters = {t["team_id"]: [] for t in teams}
+    rounds, overall = {}, 0
+    for rnd in range(len(DEFAULT_STARTER_SLOTS) + bench):
+        order = teams if rnd % 2 == 0 else teams[::-1]
+        picks = []
+        for i, t in enumerate(order):
+            pos = plans[t["team_id"]][rnd]
+            if not by_pos.get(pos):
+                sys.exit(f"❌ Player pool ran out of {pos}s; raise --players")
+            pid = by_pos[pos].pop(0)
+            rosters[t["team_id"]].append(pid)
+            overall += 1
+            picks.append({"overall": overall, "round_pick": i + 1, "player": players[pid]["name"],
+                          "team": t["name"], "team_id": t["team_id"]})
+        rounds[str(rnd + 1)] = {"picks": picks}
+    node = {"total_rounds": len(rounds), "teams_per_round": len(teams), "rounds": rounds}
+    return rosters, node
+
+def lineup(roster, players, points):
+    """(starters, bench) lineup entries: best projected player per slot, FLEX from what's left."""
+    left = sorted(roster, key=lambda pid: -points[pid][1])
+    starters = []
+    for slot in DEFAULT_STARTER_SLOTS:
+        fits = FLEX_POSITIONS if slot == "FLEX" else (slot,)
+        pid = next(p for p in left if players[p]["position"] in fits)
+        left.remove(pid)
+        starters.append((slot, pid))
+
+    def entry(slot, pid):
+        info = players[pid]
+        fpts, proj, opponent = points[pid]
+        return {"slot": slot, "player": {"name": info["name"], "team": info["team"], "position": info["position"],
+                                         "opponent": opponent, "proj": proj, "fpts": fpts}}
+    return [entry(s, p) for s, p in starters], [entry("BENCH", p) for p in left]
+
+def round_robin(team_ids, week):
+    """Circle-method pairings for a week (every team plays once)."""
+    n = len(team_ids)
+    r = (week - 1) % (n - 1)
+    rotated = [team_ids[0]] + (team_ids[1:][-r:] + team_ids[1:][:-r] if r else team_ids[1:])
+    return [(rotated[i], rotated[n - 1 - i]) for i in range(n // 2)]
+
+def record_str(r):
+    return f"{r[0]}-{r[1]}-{r[2]}"
+
+def build_season(rng, league_id, year, cfg, pool, quality, weeks_points):
+    season_id = f"{league_id}S{year}"
+    n_teams = cfg["teams"]
+    names = rng.sample([f"{a} {n}" for a in ADJECTIVES for n in NOUNS], 2 * n_teams)
+    teams = [{"team_id": f"T{i + 1:03d}", "name": names[i], "aliases": [names[i]], "record": "0-0-0"}
+             for i in range(n_teams)]
+    by_id = {t["team_id"]: t for t in teams}
+    n_div = 2 if n_teams < 16 else 4
+    divisions = {t["team_id"]: DIVISIONS[i % n_div] for i, t in enumerate(teams)}
+
+    rosters, draft_node = draft(rng, teams, pool, quality, cfg["bench"])
+    transactions = []
+
+    # preseason renames (after the draft, before week 1)
+    for t in rng.sample(teams, max(1, n_teams // 4)):
+        old, new = t["name"], names[n_teams + teams.index(t)]
+        t["name"], t["aliases"] = new, [old, new]
+        transactions.append({"time": clock(rng), "type": "team_update", "team_name": new, "old_name": old,
+                             "new_name": new, "old_abbrev": old[:3].upper(), "new_abbrev": new[:3].upper(),
+                             "date": (first_sunday(year) - timedelta(days=rng.randint(3, 9))).strftime("%m-%d"),
+                             "team_id": t["team_id"]})
+
+    # add/drop pairs spread over the gaps between weeks
+    weeks = cfg["weeks"]
+    gaps = sorted(rng.randint(1, weeks - 1) for _ in range(cfg["transactions"] // 2)) if weeks > 1 else []
+    rostered = {pid for r in rosters.values() for pid in r}
+    record = {tid: [0, 0, 0] for tid in by_id}
+    games = {}
+
+    for week in range(1, weeks + 1):
+        points = weeks_points[week]
+        games_this_week = []
+        for n, (a, b) in enumerate(round_robin(list(by_id), week)):
+            sides = {}
+            for key, tid in (("team_a", a), ("team_b", b)):
+                starters, bench = lineup(rosters[tid], pool, points)
+                sides[key] = {"name": by_id[tid]["name"], "team_id": tid, "starters": starters, "bench": bench,
+                              "ir": []}
+                sides[key]["totals"] = game_rules.roster_totals(sides[key])
+            pa, pb = sides["team_a"]["totals"]["fpts"], sides["team_b"]["totals"]["fpts"]
+            for tid, pf, pagainst in ((a, pa, pb), (b, pb, pa)):
+                record[tid][0 if pf > pagainst else 1 if pf < pagainst else 2] += 1
+            game = {"game_id": f"{season_id}W{week}G{n + 1}"}
+            for key, tid in (("team_a", a), ("team_b", b)):
+                s = sides[key]
+                game[key] = {"name": s["name"], "record": record_str(record[tid]), "totals": s["totals"],
+                             "team_id": tid, "starters": s["starters"], "bench": s["bench"], "ir": s["ir"]}
+            games_this_week.append(game)
+        games[str(week)] = {"games": games_this_week, "date": week_day(year, week).strftime("%m-%d")}
+
+        # waiver moves before next week: drop a bench player, add the best free agent at that position
+        added_now, dropped_now = set(), set()
+        for _ in range(gaps.count(week)):
+            tid = rng.choice(list(by_id))
+            bench_names = {e["player"]["name"] for e in lineup(rosters[tid], pool, points)[1]}
+            droppable = [p for p in rosters[tid] if pool[p]["name"] in bench_names and p not in added_now]
+            if not droppable:
+                continue
+            out = rng.choice(droppable)
+            pos = pool[out]["position"]
+            free = [p for p in pool if pool[p]["position"] == pos and p not in rostered and p not in dropped_now]
+            if not free:
+                continue
+            new = max(free, key=lambda p: (quality[p], p))
+            rosters[tid][rosters[tid].index(out)] = new
+            rostered.discard(out)
+            rostered.add(new)
+            added_now.add(new)
+            dropped_now.add(out)
+            day = (week_day(year, week) + timedelta(days=rng.randint(1, 5))).strftime("%m-%d")
+            method = rng.choice(("FA", "Waivers"))
+            t = by_id[tid]
+            transactions.append({"time": clock(rng), "type": "drop", "method": method, "team_name": t["name"],
+                                 "dropped": {"player": pool[out]["name"], "team": pool[out]["team"], "position": pos},
+                                 "date": day, "team_id": tid})
+            transactions.append({"time": clock(rng), "type": "add", "method": method, "team_name": t["name"],
+                                 "added": {"player": pool[new]["name"], "team": pool[new]["team"],
+                                           "position": pos, "cost": rng.randint(0, 20) if method == "Waivers" else 0},
+                                 "date": day, "team_id": tid})
+
+    for tid, t in by_id.items():
+        t["record"] = record_str(record[tid])
+    transactions.sort(key=lambda tx: storage.tx_sort_key(year, tx))
+    storage.reindex_tx_ids(transactions, season_id)
+
+    season = {"year": year, "season_id": season_id, "divisions": divisions, "teams": teams,
+              "transactions": transactions, "games": {"weeks": games}, "draft": draft_node}
+    season["aggregates"] = aggregates.rebuild(season)
+    return season, rosters
+
+# --------------------------------------
+# Ingest inputs for the week after the archive
+# --------------------------------------
+def standing(season, tid):
+    """'3rd in North Division' from the season records (wins only)."""
+    wins = {t["team_id"]: int(t["record"].split("-")[0]) for t in season["teams"]}
+    division = season["divisions"][tid]
+    rank = 1 + sum(1 for other, div in season["divisions"].items() if div == division and wins[other] > wins[tid])
+    suffix = "th" if 10 <= rank % 100 <= 20 else {1: "st", 2: "nd", 3: "rd"}.get(rank % 10, "th")
+    return f"{rank}{suffix} in {division}"
+
+def new_game_input(season, rosters, pool, points, week):
+    """ESPN-paste-shaped game (no ids; record with standing text; 'Bench' slots) for add_remove_game."""
+    teams = {t["team_id"]: t for t in season["teams"]}
+    a, b = round_robin(list(teams), week)[0]
+    out = {}
+    for key, tid in (("team_a", a), ("team_b", b)):
+        starters, bench = lineup(rosters[tid], pool, points)
+        for e in bench:
+            e["slot"] = "Bench"
+        side = {"starters": starters, "bench": bench}
+        totals = game_rules.roster_totals(side)
+        out[key] = {"name": teams[tid]["name"], "record": f"{teams[tid]['record']}, {standing(season, tid)}",
+                    "starters": starters, "bench": bench, "ir": [],
+                    "totals": {"proj": totals["proj"], "fpts": totals["fpts"]}}
+    return out
+
+def new_transaction_input(rng, season, rosters, pool, quality, year, week):
+    """One drop/add pair the day after `week`, in add_remove_transaction's input shape (applied to `rosters`)."""
+    team = rng.choice(season["teams"])
+    roster = rosters[team["team_id"]]
+    out = next(p for p in roster[::-1] if pool[p]["position"] in FLEX_POSITIONS)
+    rostered = {p for r in rosters.values() for p in r}
+    free = [p for p in pool if pool[p]["position"] == pool[out]["position"] and p not in rostered]
+    new = max(free, key=lambda p: (quality[p], p))
+    roster[roster.index(out)] = new
+    return {"transactions": [{"date": (week_day(year, week) + timedelta(days=1)).strftime("%m-%d"), "entries": [
+        {"time": "9:15 am", "type": "drop", "method": "FA", "team_name": team["name"],
+         "dropped": {"player": pool[out]["name"], "team": pool[out]["team"], "position": pool[out]["position"]}},
+        {"time": "9:16 am", "type": "add", "method": "FA", "team_name": team["name"],
+         "added": {"player": pool[new]["name"], "team": pool[new]["team"], "position": pool[new]["position"],
+                   "cost": 0}},
+    ]}]}
+
+# stat columns per file; "YdsV" is the yards column parse_weekly_csv reads
+CSV_COLUMNS = {
+    "passing": ("Passing", [("Cmp", "completions"), ("Att", "attempts"), ("Cmp%", "cmp_pct"),
+                            ("YdsV", "pass_yards"), ("TD", "pass_td"), ("Int", "interceptions"),
+                            ("Rate", "qb_rating")]),
+    "rushing": ("Rushing", [("Att", "rush_attempts"), ("YdsV", "rush_yards"), ("Y/A", "rush_avg"),
+                            ("TD", "rush_td")]),
+    "receiving": ("Receiving", [("Tgt", "targets"), ("Rec", "receptions"), ("YdsV", "rec_yards"),
+                                ("Y/R", "rec_avg"), ("TD", "rec_td"), ("Lng", "long")]),
+}
+
+def write_stat_csvs(out_dir, node, pool, week):
+    """Sports-Reference-style weekly exports (preamble, 'Rk,' header, site key in '-9999')."""
+    stats_dir = os.path.join(out_dir, "stats")
+    os.makedirs(stats_dir, exist_ok=True)
+    paths = []
+    for stat_type, (category, columns) in CSV_COLUMNS.items():
+        path = os.path.join(stats_dir, f"{stat_type}_week{week}.csv")
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write("--- Synthetic data (synthetic.py)\n\n")
+            w = csv.writer(f)
+            w.writerow(["Rk", "Player", "Age", "Team", "Result", "Date"]
+                       + [c for c, _ in columns] + ["Pos.", "-9999"])
+            for rk, (pid, line) in enumerate(node[category].items(), 1):
+                info = pool[pid]
+                w.writerow([rk, info["name"], f"{info['age']}-{rk % 365:03d}", info["team"],
+                            line["result"], line["game_date"]]
+                           + [line[field] for _, field in columns] + [info["position"], info["site_key"]])
+        paths.append(path)
+    return paths
+
+# --------------------------------------
+# Archive
+# --------------------------------------
+def generate(cfg):
+    """→ (master document, {name: input document}, next week's Raw Stats node, rosters of L001's newest season)."""
+    rng = random.Random(cfg["seed"])
+    pool, quality = build_pool(rng, cfg["players"])
+    years = [2025 - i for i in range(cfg["seasons"])][::-1]
+    raw_stats, points_by_year = {}, {}
+    for year in years:
+        raw_stats[f"S{year}"], points_by_year[year] = {}, {}
+        for week in range(1, cfg["weeks"] + 2):  # one extra week for the ingest inputs
+            node, points = raw_week(rng, pool, quality, year, week, nfl_schedule(rng, year, week))
+            points_by_year[year][week] = points
+            if week <= cfg["weeks"]:
+                raw_stats[f"S{year}"][f"Week{week}"] = node
+            else:
+                next_node = node
+
+    leagues, newest = {}, None
+    for n in range(cfg["leagues"]):
+        lid = f"L{n + 1:03d}"
+        league = {"league_id": lid, "league_name": f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} League",
+                  "seasons by ID": {}}
+        for year in years:
+            season, rosters = build_season(rng, lid, year, cfg, pool, quality, points_by_year[year])
+            league["seasons by ID"][season["season_id"]] = season
+            if n == 0 and year == years[-1]:
+                newest = (season, rosters)
+        leagues[lid] = league
+
+    season, rosters = newest
+    year, week = years[-1], cfg["weeks"] + 1
+    # the drop/add lands before the new week's game, so that game is built from the post-move rosters
+    new_transaction = new_transaction_input(rng, season, rosters, pool, quality, year, cfg["weeks"])
+    inputs = {
+        "new_game.json": new_game_input(season, rosters, pool, points_by_year[year][week], week),
+        "new_transaction.json": new_transaction,
+    }
+    data = {"schema_version": migrate.latest_version(), "leagues by ID": leagues,
+            "Raw Stats": {"season by ID": raw_stats}, "Players": pool}
+    return data, inputs, next_node
+
+def main():
+    args = [a for i, a in enumerate(sys.argv[1:], 1)
+            if not a.startswith("--") and not sys.argv[i - 1].startswith("--")]
+    if not args:
+        print("Usage: python synthetic.py <out_dir> [--seed 1] [--leagues 1] [--seasons 1] [--weeks 14] "
+              "[--teams 12] [--bench 7] [--transactions 80] [--players 400] [--master fantasy.json]")
+        sys.exit(1)
+
+    cfg = {"seed": arg("--seed", 1), "leagues": arg("--leagues", 1), "seasons": arg("--seasons", 1),
+           "weeks": arg("--weeks", 14), "teams": arg("--teams", 12), "bench": arg("--bench", 7),
+           "transactions": arg("--transactions", 80), "players": arg("--players", 400)}
+    if cfg["teams"] < 2 or cfg["teams"] % 2 or cfg["teams"] > 2 * len(NOUNS):
+        sys.exit(f"❌ --teams must be even, 2-{2 * len(NOUNS)}")
+    if not 1 <= cfg["weeks"] <= MAX_WEEKS:
+        sys.exit(f"❌ --weeks must be 1-{MAX_WEEKS}")
+
+    out_dir = args[0]
+    os.makedirs(out_dir, exist_ok=True)
+    start = time.perf_counter()
+    data, inputs, next_node = generate(cfg)
+    built = time.perf_counter()
+
+    master = os.path.join(out_dir, arg("--master", "fantasy.json"))
+    storage.open_store(master).save(data)
+    for name, doc in inputs.items():
+        with open(os.path.join(out_dir, name), "w", encoding="utf-8") as f:
+            json.dump(doc, f, indent=2)
+    csvs = write_stat_csvs(out_dir, next_node, data["Players"], cfg["weeks"] + 1)
+    done = time.perf_counter()
+
+    seasons = [s for lg in data["leagues by ID"].values() for s in lg["seasons by ID"].values()]
+    games = sum(len(wk["games"]) for s in seasons for wk in s["games"]["weeks"].values())
+    txs = sum(len(s["transactions"]) for s in seasons)
+    lines = sum(len(wk[c]) for s in data["Raw Stats"]["season by ID"].values()
+                for wk in s.values() for c in ("Passing", "Rushing", "Receiving"))
+    print(f"🧬 seed {cfg['seed']}: {len(data['leagues by ID'])} league(s), {len(seasons)} season(s), "
+          f"{games:,} games, {txs:,} transactions, {len(data['Players']):,} players, {lines:,} stat lines")
+    print(f"   built in {built - start:.2f}s, written in {done - built:.2f}s → {master}")
+    print(f"   inputs: {', '.join(inputs)} + {len(csvs)} stat CSV(s) for week {cfg['weeks'] + 1} "
+          f"(season {max(int(s['year']) for s in seasons)}, L001)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Regression tests for concurrent writers (python -m pytest test_storage.py).
+
+Two ingests load the same master; the one that commits second is replayed on
+top of the first one's write (JsonStore merge, SQLite row writes, shard rewrite).
+"""
+import json
+import os
+
+import pytest
+
+import storage
+from add_remove_game import apply_remove
+
+SID = "L001S2025"
+MATCHUPS = [("Jmof", "Mighty Moles"), ("Tyleik Deez Nuts", "Rusty Steamers"), ("Salty Badgers", "Lucky Comets")]
+
+def master():
+    games = [{"game_id": f"{SID}W1G{n}", "team_a": {"name": a}, "team_b": {"name": b}}
+             for n, (a, b) in enumerate(MATCHUPS, start=1)]
+    season = {"season_id": SID, "year": 2025, "teams": [],
+              "games": {"weeks": {"1": {"date": "2025-09-07", "games": games}}}}
+    return {"leagues by ID": {"L001": {"league_id": "L001", "seasons by ID": {SID: season}}}}
+
+def week_games(data):
+    return data["leagues by ID"]["L001"]["seasons by ID"][SID]["games"]["weeks"]["1"]["games"]
+
+def remove(store, data, game_id):
+    apply_remove(store, data, week_games(data), SID, "2025", "1", game_id)
+
+@pytest.fixture(params=["fantasy.json", "fantasy.db", "shards/"])
+def path(request, tmp_path):
+    p = os.path.join(str(tmp_path), request.param)  # keeps the shard dir's trailing slash
+    storage.open_store(p).save(master())
+    return p
+
+def test_concurrent_removes_in_one_week(path):
+    store_a, store_b = storage.open_store(path), storage.open_store(path)
+    data_a, data_b = store_a.load(), store_b.load()
+
+    remove(store_b, data_b, f"{SID}W1G1")  # B drops Jmof; Tyleik becomes G1
+    remove(store_a, data_a, f"{SID}W1G2")  # A still means Tyleik
+
+    games = week_games(storage.open_store(path).load())
+    assert [g["team_a"]["name"] for g in games] == ["Salty Badgers"]
+    assert [g["game_id"] for g in games] == [f"{SID}W1G1"]
+
+def test_remove_of_a_game_already_gone_raises(path):
+    store_a, store_b = storage.open_store(path), storage.open_store(path)
+    data_a, data_b = store_a.load(), store_b.load()
+
+    remove(store_b, data_b, f"{SID}W1G2")
+    with pytest.raises(ValueError):
+        remove(store_a, data_a, f"{SID}W1G2")
+    assert len(week_games(storage.open_store(path).load())) == 2
+
+def test_stat_commit_keeps_a_concurrent_game_write(path):
+    store_a, store_b = storage.open_store(path), storage.open_store(path)
+    data_a, data_b = store_a.load(), store_b.load()
+
+    remove(store_b, data_b, f"{SID}W1G1")
+    # A is a stat_parser run: its document still has the removed game
+    week = {"week_id": "Week1", "Passing": {"samdarnold_qb": {"player_id": "samdarnold_qb", "pass_yards": 250}}}
+    players = {"samdarnold_qb": {"name": "Sam Darnold", "position": "QB", "team": "SEA", "age": 28}}
+    data_a.setdefault("Raw Stats", {}).setdefault("season by ID", {})["S2025"] = {"Week1": week}
+    data_a["Players"] = players
+    store_a.commit(data_a, [{"op": "set_raw_stats", "season_key": "S2025", "sections": {"Week1": week}},
+                            {"op": "set_players", "players": players}])
+
+    data = storage.open_store(path).load()
+    assert len(week_games(data)) == 2
+    assert data["Raw Stats"]["season by ID"]["S2025"] == {"Week1": week}
+    assert data["Players"] == players
+
+def commit(store, data, changes):
+    for change in changes:
+        storage.apply_change(data, change)
+    store.commit(data, changes)
+
+def test_concurrent_transaction_adds_and_aggregates(path):
+    store_a, store_b = storage.open_store(path), storage.open_store(path)
+    data_a, data_b = store_a.load(), store_b.load()
+
+    tx = lambda date, player: {"date": date, "time": "9:00 AM", "type": "add", "team_id": "T1",
+                               "added": {"player": player}}
+    commit(store_b, data_b, [{"op": "add_transactions", "season_id": SID, "entries": [tx("09-10", "Puka Nacua")]}])
+    commit(store_a, data_a, [{"op": "add_transactions", "season_id": SID, "entries": [tx("09-03", "Jaxon Smith-Njigba")]},
+                             {"op": "set_aggregates", "season_id": SID, "aggregates": {"T1": {"games": 1}}}])
+
+    season = storage.open_store(path).load()["leagues by ID"]["L001"]["seasons by ID"][SID]
+    txs = season["transactions"]
+    txs = txs["items"] if isinstance(txs, dict) else txs
+    assert [(t["transaction_id"], t["added"]["player"]) for t in txs] == \
+        [(f"{SID}T00001", "Jaxon Smith-Njigba"), (f"{SID}T00002", "Puka Nacua")]
+    assert season["aggregates"] == {"T1": {"games": 1}}
+    assert len(season["games"]["weeks"]["1"]["games"]) == 3
+
+def test_cache_is_not_served_for_a_same_size_same_mtime_rewrite(tmp_path):
+    path = str(tmp_path / "fantasy.json")
+    filler = "x" * storage.CACHE_MIN_BYTES
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"note": "a", "filler": filler}, f)
+    assert storage.read_json_cached(path)["note"] == "a"  # builds the cache
+
+    st = os.stat(path)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"note": "b", "filler": filler}, f)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert storage.read_json_cached(path)["note"] == "b"
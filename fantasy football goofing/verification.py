@@ -1,121 +1,273 @@
-import sys, json
+#!/usr/bin/env python3
+"""
+Verify every game in the master: leagues by ID -> seasons by ID -> games -> weeks.
 
-def norm_str(x):
-    return x.strip() if isinstance(x, str) else ""
+Work is split into one task per season/week and spread over a process pool.
+Workers get the loaded document for free when the pool forks; otherwise each
+one loads the master once. Issues stream to a JSONL report as tasks finish
+(one object per issue: game_id, side, rule, values, message), followed by a
+timing summary.
 
-def r2(x):
-    try:
-        return round(float(x), 2)
-    except Exception:
-        return 0.0
+Results are cached per game in <master>.verify, keyed by game_id plus a hash
+of the game and its season's teams block; later runs only re-check new or
+modified games. --full ignores the cache (and rewrites it). Every
+read-modify-write of the sidecar holds <master>.verify.lock, so ingests
+caching their games at the same time don't drop each other's entries.
+
+Usage:
+  python verification.py <fantasy.json|.db|dir> [--workers N] [--report issues.jsonl] [--full] [--verbose]
+"""
+import sys, json, os, time, hashlib, marshal
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import game_rules
+import storage
 
-def verify_game(game: dict, game_id: str, teams_by_id: dict):
+POOL_MIN_GAMES = 500  # below this, process startup costs more than it saves
+VERIFY_CACHE_SUFFIX = ".verify"
+RULES_VERSION = 2  # bump when game_rules changes so cached results are dropped
+
+def check_game(game: dict, game_id: str, teams_by_id: dict, league=None):
     """
-    Abort on:
+    Issues as dicts {game_id, side, rule, values, message} from game_rules.py
+    ("archive" profile + the league's "validation" block):
       - missing team names
       - broken starter row (missing name/team/position)
       - ESPN missing projections: proj == 0 while fpts > 0
       - totals mismatch > ±0.2 (starters and bench)
       - team_id not matching name/aliases from teams block
     """
-    issues = []
-
-    def chk_team(side_key):
-        side = game.get(side_key, {})
-        tid = norm_str(side.get("team_id", ""))
-        name = norm_str(side.get("name", ""))
-        if not name:
-            issues.append(f"{game_id} {side_key}: Missing team name")
-
-        # ✅ Team ID consistency check
-        if tid:
-            if tid not in teams_by_id:
-                issues.append(f"{game_id} {side_key}: Unknown team_id '{tid}'")
-            else:
-                valid_aliases = [norm_str(a) for a in teams_by_id[tid].get("aliases", [])]
-                if name and norm_str(name) not in valid_aliases:
-                    issues.append(
-                        f"{game_id} {side_key}: Team name '{name}' not in aliases for {tid} ({valid_aliases})"
-                    )
-
-        starters = side.get("starters", [])
-        bench = side.get("bench", [])
-        totals = side.get("totals", {})
-
-        # Broken starter rows
-        for i, s in enumerate(starters):
-            p = s.get("player", {})
-            nm = norm_str(p.get("name", ""))
-            tm = norm_str(p.get("team", ""))
-            pos = norm_str(p.get("position", ""))
-            if not (nm and tm and pos):
-                issues.append(f"{game_id} {side_key}: Broken starter row #{i+1} (name/team/position missing)")
-            # ESPN missing projections
-            proj = p.get("proj", 0.0)
-            fpts = p.get("fpts", 0.0)
-            if r2(proj) == 0.0 and r2(fpts) > 0.0:
-                issues.append(f"{game_id} {side_key}: ESPN missing projection for '{nm}' (proj=0.0, fpts={r2(fpts)})")
-
-        # Totals checks (recompute now, unrounded then round once)
-        s_proj_sum = sum((x.get("player", {}) or {}).get("proj", 0.0) for x in starters)
-        s_fpts_sum = sum((x.get("player", {}) or {}).get("fpts", 0.0) for x in starters)
-        b_proj_sum = sum((x.get("player", {}) or {}).get("proj", 0.0) for x in bench)
-        b_fpts_sum = sum((x.get("player", {}) or {}).get("fpts", 0.0) for x in bench)
-
-        t_proj = r2(s_proj_sum)
-        t_fpts = r2(s_fpts_sum)
-        tb_proj = r2(b_proj_sum)
-        tb_fpts = r2(b_fpts_sum)
-
-        def near(a, b, tol=0.2):
-            try:
-                return abs(float(a) - float(b)) <= tol
-            except Exception:
-                return False
-
-        if not near(totals.get("proj", None), t_proj):
-            issues.append(f"{game_id} {side_key}: Starters projected total mismatch (totals={totals.get('proj')}, sum={t_proj})")
-        if not near(totals.get("fpts", None), t_fpts):
-            issues.append(f"{game_id} {side_key}: Starters fpts total mismatch (totals={totals.get('fpts')}, sum={t_fpts})")
-        if not near(totals.get("bench_proj", None), tb_proj):
-            issues.append(f"{game_id} {side_key}: Bench projected total mismatch (totals={totals.get('bench_proj')}, sum={tb_proj})")
-        if not near(totals.get("bench_fpts", None), tb_fpts):
-            issues.append(f"{game_id} {side_key}: Bench fpts total mismatch (totals={totals.get('bench_fpts')}, sum={tb_fpts})")
-
-    chk_team("team_a")
-    chk_team("team_b")
-
-    return issues
+    return game_rules.checker("archive", league)(game, game_id, teams_by_id)
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python verification.py <fantasy.json> [--verbose]")
-        sys.exit(1)
+def verify_game(game: dict, game_id: str, teams_by_id: dict, league=None):
+    """Issue messages for one game (empty list = clean)."""
+    return [i["message"] for i in check_game(game, game_id, teams_by_id, league)]
 
-    filename = sys.argv[1]
-    verbose = "--verbose" in sys.argv
+# --------------------------------------
+# Result cache
+# --------------------------------------
+def cache_path(path):
+    return str(path).rstrip("/\\") + VERIFY_CACHE_SUFFIX
+
+def master_stamp(path):
+    """Size + mtime of every file behind the master (JSON + journal, SQLite + WAL, or shard dir)."""
+    path = str(path)
+    if os.path.isdir(path):
+        files = sorted(os.path.join(root, n) for root, _, names in os.walk(path) for n in names)
+    else:
+        files = [path] + [path + suffix for suffix in (storage.JOURNAL_SUFFIX, "-wal")]
+    stamp = []
+    for f in files:
+        if os.path.exists(f):
+            st = os.stat(f)
+            stamp.append([os.path.relpath(f, path) if os.path.isdir(path) else f, st.st_size, st.st_mtime_ns])
+    return stamp
+
+def cache_lock(path):
+    return storage.master_lock(cache_path(path))
+
+def load_cache(path):
+    """The sidecar as {"stamp", "games": {game_id: [hash, issues]}}; empty if missing, stale or unreadable."""
+    try:
+        with open(cache_path(path), "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {"stamp": None, "games": {}}
+    if not isinstance(cache, dict) or cache.get("rules_version") != RULES_VERSION:
+        return {"stamp": None, "games": {}}
+    return {"stamp": cache.get("stamp"), "games": cache.get("games", {})}
+
+def save_cache(path, games, stamp=None):
+    doc = {"rules_version": RULES_VERSION, "stamp": stamp, "games": games}
+    try:
+        storage.atomic_write(cache_path(path), lambda f: json.dump(doc, f, separators=(",", ":")))
+    except OSError as e:
+        print(f"⚠️ Couldn't write {cache_path(path)}: {e}")
+
+# marshal format 2 has no back-references, so equal documents always give equal bytes
+def teams_digest(teams_by_id, league=None):
+    """Hash of what a game is checked against: the teams block and the league's rule config."""
+    context = [teams_by_id, game_rules.league_config("archive", league)]
+    return hashlib.blake2b(marshal.dumps(context, 2), digest_size=16).digest()
+
+def game_hash(game, teams_key):
+    """Content hash of one game in its season context."""
+    return hashlib.blake2b(teams_key + marshal.dumps(game, 2), digest_size=16).hexdigest()
+
+def remember(path, season, games, league=None):
+    """Cache check_game results for games that were just verified and stored (add_game)."""
+    teams_by_id = teams_index(season)
+    teams_key = teams_digest(teams_by_id, league)
+    entries = {gid: [game_hash(game, teams_key), check_game(game, gid, teams_by_id, league)]
+               for game in games for gid in [game.get("game_id")] if gid}
+    with cache_lock(path):
+        cache = load_cache(path)["games"]
+        cache.update(entries)
+        save_cache(path, cache)  # no stamp: the master changed, next run re-hashes
+
+# --------------------------------------
+# Archive walk
+# --------------------------------------
+def teams_index(season):
+    return {t["team_id"]: t for t in storage.team_list(season) if "team_id" in t}
+
+def iter_tasks(data):
+    """(league_id, season_id, week, game count) for every week with games."""
+    for league_id, league in data.get("leagues by ID", {}).items():
+        for season_id, season in league.get("seasons by ID", {}).items():
+            for week, wk in season.get("games", {}).get("weeks", {}).items():
+                if wk.get("games"):
+                    yield league_id, season_id, week, len(wk["games"])
+
+def verify_week(data, league_id, season_id, week, cached=None):
+    """
+    Check one week's games, reusing cached results whose hash still matches.
+    Returns (issues, clean game_ids, fresh cache entries, cache hits).
+    """
+    league = data["leagues by ID"][league_id]
+    season = league["seasons by ID"][season_id]
+    teams_by_id = teams_index(season)
+    teams_key = teams_digest(teams_by_id, league)
+    cached = cached or {}
+    issues, clean, entries, hits = [], [], {}, 0
+    for game in season["games"]["weeks"][week].get("games", []):
+        gid = game.get("game_id", f"{season_id}W{week}G?")
+        digest = game_hash(game, teams_key)
+        hit = cached.get(gid)
+        if hit and hit[0] == digest:
+            found = hit[1]
+            hits += 1
+        else:
+            found = check_game(game, gid, teams_by_id, league)
+        entries[gid] = [digest, found]
+        issues.extend(found)
+        if not found:
+            clean.append(gid)
+    return issues, clean, entries, hits
+
+_DATA = None  # the loaded master; inherited by forked workers
+
+def _init_worker(path):
+    global _DATA
+    if _DATA is None:
+        _DATA = storage.open_store(path).load()
+
+def _verify_task(task):
+    league_id, season_id, week, _, cached = task
+    return verify_week(_DATA, league_id, season_id, week, cached)
 
-    with open(filename, "r", encoding="utf-8") as f:
-        data = json.load(f)
+def verify_archive(path, workers=None, report=None, verbose=False, full=False):
+    """Verify every game (only new/changed ones unless full=True); returns (issues, summary dict)."""
+    global _DATA
+    start = time.perf_counter()
+    stamp = master_stamp(path)
+    cached_run = {"stamp": None, "games": {}} if full else load_cache(path)
+    if stamp and cached_run["stamp"] == stamp:
+        # master untouched since the last run: replay its results without loading anything
+        return replay_cache(cached_run["games"], report, start)
 
-    all_issues = []
-    for year, year_data in data.get("seasons", {}).items():
-        teams_block = year_data.get("teams", [])
-        teams_by_id = {t["team_id"]: t for t in teams_block if "team_id" in t}
+    _DATA = storage.open_store(path).load()
+    cache = cached_run["games"]
+    loaded = time.perf_counter()
 
-        for week, week_data in year_data.get("weeks", {}).items():
-            for game in week_data.get("games", []):
-                gid = game.get("game_id", f"{year}W{week}G?")
-                issues = verify_game(game, gid, teams_by_id)
-                all_issues.extend(issues)
-                if verbose and not issues:
+    # each task carries just its own week's cache entries
+    by_week = {}
+    for gid, entry in cache.items():
+        by_week.setdefault(gid.rsplit("G", 1)[0], {})[gid] = entry
+    tasks = [(lid, sid, week, n, by_week.get(f"{sid}W{week}", {}))
+             for lid, sid, week, n in iter_tasks(_DATA)]
+    games = sum(t[3] for t in tasks)
+    pooled = workers != 1 and games >= POOL_MIN_GAMES and len(tasks) > 1
+
+    issues, fresh, hits = [], {}, 0
+    out = open(report, "w", encoding="utf-8") if report else None
+
+    def collect(results):
+        nonlocal hits
+        for found, clean, entries, cached in results:
+            fresh.update(entries)
+            hits += cached
+            issues.extend(found)
+            if out:
+                out.writelines(json.dumps(i, ensure_ascii=False) + "\n" for i in found)
+                out.flush()
+            if verbose:
+                for gid in clean:
                     print(f"✅ {gid} verified clean.")
 
+    try:
+        if pooled:
+            chunk = max(1, len(tasks) // (4 * (workers or os.cpu_count() or 1)))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(path,)) as pool:
+                collect(pool.map(_verify_task, tasks, chunksize=chunk))
+        else:
+            collect(map(_verify_task, tasks))
+    finally:
+        if out:
+            out.close()
+
+    with cache_lock(path):
+        # keep what ingests cached while this run was going; games that no longer exist drop out
+        for gid, entry in load_cache(path)["games"].items():
+            if gid not in fresh and cache.get(gid) != entry:
+                fresh[gid] = entry
+        save_cache(path, fresh, stamp)
+    done = time.perf_counter()
+    summary = {
+        "seasons": len({t[1] for t in tasks}), "weeks": len(tasks), "games": games, "cached": hits,
+        "issues": len(issues), "workers": (workers or os.cpu_count() or 1) if pooled else 1,
+        "load_s": loaded - start, "verify_s": done - loaded,
+    }
+    return issues, summary
+
+def replay_cache(games, report, start):
+    issues = [i for _, found in games.values() for i in found]
+    if report:
+        with open(report, "w", encoding="utf-8") as out:
+            out.writelines(json.dumps(i, ensure_ascii=False) + "\n" for i in issues)
+    seasons = {gid.split("W")[0] for gid in games}
+    summary = {"seasons": len(seasons), "weeks": len({gid.rsplit("G", 1)[0] for gid in games}),
+               "games": len(games), "cached": len(games), "issues": len(issues), "workers": 0,
+               "load_s": 0.0, "verify_s": time.perf_counter() - start}
+    return issues, summary
+
+def print_summary(issues, summary):
+    s = summary
+    rate = s["games"] / s["verify_s"] if s["verify_s"] else 0
+    print(f"⏱️ {s['games']} game(s) in {s['weeks']} week(s) / {s['seasons']} season(s): "
+          f"load {s['load_s']:.2f}s, verify {s['verify_s']:.2f}s ({rate:,.0f} games/s, {s['workers']} worker(s))")
+    if not s["workers"]:
+        print("   master unchanged since the last run: results replayed from the cache (--full to re-check)")
+    else:
+        print(f"   {s['games'] - s['cached']} checked, {s['cached']} unchanged since the last run (cache)")
+    if issues:
+        by_rule = Counter(i["rule"] for i in issues)
+        print("   issues by rule: " + ", ".join(f"{rule} {n}" for rule, n in by_rule.most_common()))
+
+if __name__ == "__main__":
+    args = [a for i, a in enumerate(sys.argv[1:], 1)
+            if not a.startswith("--") and sys.argv[i - 1] not in ("--workers", "--report")]
+    if not args:
+        print("Usage: python verification.py <fantasy.json> [--workers N] [--report issues.jsonl] [--full] [--verbose]")
+        sys.exit(1)
+
+    filename = args[0]
+    verbose = "--verbose" in sys.argv
+    workers = int(sys.argv[sys.argv.index("--workers") + 1]) if "--workers" in sys.argv else None
+    report = sys.argv[sys.argv.index("--report") + 1] if "--report" in sys.argv else None
+
+    all_issues, summary = verify_archive(filename, workers, report, verbose, full="--full" in sys.argv)
+
     if all_issues:
         print("❌ Verification FAILED:")
-        for issue in all_issues:
-            print(" -", issue)
-        sys.exit(1)
+        for issue in all_issues[:50] if report else all_issues:
+            print(" -", issue["message"])
+        if report and len(all_issues) > 50:
+            print(f"   … {len(all_issues) - 50} more in {report}")
     else:
         print("✅ Verification PASSED: All checks clean.")
-        sys.exit(0)
+    if report:
+        print(f"📝 Wrote {len(all_issues)} issue(s) → {report}")
+    print_summary(all_issues, summary)
+    sys.exit(1 if all_issues else 0)
@@ -3,6 +3,9 @@ import json
 import sys
 import os
 
+import shared  # noqa: F401 (puts names on the path)
+from names import norm
+
 # --------------------------------------
 # IO
 # --------------------------------------
@@ -206,8 +209,7 @@ def normalize_team(team: dict, side: str, game_id: str, alias_to_id: dict):
     team["record"] = clean_record_str(team.get("record", ""))
 
     # ✅ Assign team_id from aliases
-    name_key = team["name"].strip().lower()
-    team_id = alias_to_id.get(name_key)
+    team_id = alias_to_id.get(norm(team["name"]))
     if not team_id:
         raise ValueError(f"[{game_id} {side}] Unknown team name '{team['name']}'. Add to team_aliases.")
     team["team_id"] = team_id
@@ -393,11 +395,11 @@ def add_game(master_file, new_game_file, league_id, full_date, week):
     teams_section = season.get("teams", [])
     for team in teams_section:
         tid = team.get("team_id")
-        name = team.get("name", "").strip().lower()
+        name = norm(team.get("name", ""))
         if tid and name:
             alias_to_id[name] = tid
         for alias in team.get("aliases", []):
-            alias_to_id[alias.strip().lower()] = tid
+            alias_to_id[norm(alias)] = tid
 
     # 6. Use a temp ID for context while normalizing
     temp_id = f"S{year}W{week}G?"
@@ -3,6 +3,9 @@ import argparse
 import re
 from datetime import datetime
 
+import shared  # noqa: F401 (puts names on the path)
+from names import norm
+
 # ----------------------
 # Helpers
 # ----------------------
@@ -81,9 +84,6 @@ def reindex_transactions(transactions, league_id, year):
         t["transaction_id"] = f"{season_id}T{i:05d}"
     return transactions
 
-def _norm(s):
-    return (s or "").strip().lower()
-
 def get_team_objects(data, league_id, year):
     season = get_season_node(data, league_id, year, create=False)
     # prefer "teams", fallback to "team_aliases"
@@ -101,14 +101,14 @@ def build_alias_map(data, league_id, year):
         tid = team.get("team_id")
         if not tid:
             continue
-        name = _norm(team.get("name"))
+        name = norm(team.get("name"))
         if name:
             alias_to_id[name] = tid
         for alias in team.get("aliases", []) or []:
-            a = _norm(alias)
+            a = norm(alias)
             if a:
                 alias_to_id[a] = tid
-        ab = _norm(team.get("abbrev"))
+        ab = norm(team.get("abbrev"))
         if ab:
             alias_to_id[ab] = tid
     return alias_to_id
@@ -145,32 +145,32 @@ def validate_tx_ids_for_remove(transactions: list, ids: list[str]) -> list[int]:
 def resolve_team_id(alias_to_id, team_name):
     if not team_name:
         return None
-    return alias_to_id.get(_norm(team_name))
+    return alias_to_id.get(norm(team_name))
 
 def alias_exists_globally(data, year, alias, owner_team_id=None):
     """Check if alias already exists on another team."""
-    a_norm = _norm(alias)
+    a_norm = norm(alias)
     for team in get_team_objects(data, year):
         tid = team.get("team_id")
         if owner_team_id and tid == owner_team_id:
             continue
-        if _norm(team.get("name")) == a_norm:
+        if norm(team.get("name")) == a_norm:
             return True
         for al in team.get("aliases", []) or []:
-            if _norm(al) == a_norm:
+            if norm(al) == a_norm:
                 return True
     return False
 
 def find_team_by_name_or_alias(data, league_id, year, target_name, target_abbrev=None):
-    t_norm = _norm(target_name)
-    a_norm = _norm(target_abbrev) if target_abbrev else None
+    t_norm = norm(target_name)
+    a_norm = norm(target_abbrev) if target_abbrev else None
     for team in get_team_objects(data, league_id, year):
-        if _norm(team.get("name")) == t_norm:
+        if norm(team.get("name")) == t_norm:
             return team
-        if a_norm and _norm(team.get("abbrev")) == a_norm:
+        if a_norm and norm(team.get("abbrev")) == a_norm:
             return team
         for al in team.get("aliases", []) or []:
-            if _norm(al) == t_norm:
+            if norm(al) == t_norm:
                 return team
     return None
 
@@ -193,7 +193,7 @@ def apply_team_update(data, league_id, year, update):
         team["name"] = new_name
 
     def _has_alias(val):
-        return _norm(val) in (_norm(a) for a in team["aliases"])
+        return norm(val) in (norm(a) for a in team["aliases"])
 
     if old_name and not _has_alias(old_name):
         team["aliases"].append(old_name)
@@ -0,0 +1,127 @@
+# SQLite analytics target for the ETL: the same five tables as the JSONL
+# output, typed and indexed, loaded partition by partition.
+#
+# A partition is one week (matchups, lineup_slots, weekly_player_stats) or a
+# season's transactions / draft picks. The `partitions` table keeps a hash per
+# partition; a re-run deletes and re-inserts only the partitions whose hash
+# moved, all inside one transaction.
+
+import sqlite3
+from datetime import datetime
+
+TABLES = {
+    "matchups": [
+        ("league_id", "TEXT"), ("league_name", "TEXT"), ("season", "TEXT"), ("week", "INTEGER"),
+        ("week_date", "TEXT"), ("game_id", "TEXT"),
+        ("team_a_id", "TEXT"), ("team_a_name_snapshot", "TEXT"), ("team_a_score", "REAL"),
+        ("team_b_id", "TEXT"), ("team_b_name_snapshot", "TEXT"), ("team_b_score", "REAL"),
+        ("winner_team_id", "TEXT"),
+    ],
+    "lineup_slots": [
+        ("league_id", "TEXT"), ("league_name", "TEXT"), ("season", "TEXT"), ("week", "INTEGER"),
+        ("game_id", "TEXT"), ("team_id", "TEXT"), ("team_name_snapshot", "TEXT"),
+        ("bucket", "TEXT"), ("slot", "TEXT"), ("player_snapshot", "TEXT"), ("player_normalized", "TEXT"),
+        ("player_id", "TEXT"), ("nfl_team", "TEXT"), ("position", "TEXT"), ("opponent", "TEXT"),
+        ("projected", "REAL"), ("points", "REAL"),
+    ],
+    "weekly_player_stats": [
+        ("league_id", "TEXT"), ("league_name", "TEXT"), ("season", "TEXT"), ("week", "INTEGER"),
+        ("player_normalized", "TEXT"), ("points", "REAL"),
+    ],
+    "transactions": [
+        ("league_id", "TEXT"), ("league_name", "TEXT"), ("season", "TEXT"),
+        ("date", "TEXT"), ("time", "TEXT"), ("type", "TEXT"), ("method", "TEXT"),
+        ("team_id", "TEXT"), ("team_name_snapshot", "TEXT"), ("transaction_id", "TEXT"),
+        ("added_player_snapshot", "TEXT"), ("added_player_normalized", "TEXT"), ("added_player_id", "TEXT"),
+        ("added_team", "TEXT"), ("added_position", "TEXT"), ("added_cost", "NUMERIC"),
+        ("dropped_player_snapshot", "TEXT"), ("dropped_player_normalized", "TEXT"), ("dropped_player_id", "TEXT"),
+        ("dropped_team", "TEXT"), ("dropped_position", "TEXT"),
+        ("old_name", "TEXT"), ("new_name", "TEXT"), ("old_abbrev", "TEXT"), ("new_abbrev", "TEXT"),
+        ("note", "TEXT"),
+    ],
+    "draft_picks": [
+        ("league_id", "TEXT"), ("league_name", "TEXT"), ("season", "TEXT"),
+        ("round", "INTEGER"), ("round_pick", "INTEGER"), ("overall", "INTEGER"),
+        ("player_snapshot", "TEXT"), ("player_normalized", "TEXT"), ("player_id", "TEXT"),
+        ("team_id", "TEXT"), ("team_name_snapshot", "TEXT"),
+    ],
+}
+
+WEEK_TABLES = ("matchups", "lineup_slots", "weekly_player_stats")
+
+INDEXES = [
+    ("season", "week"),
+    ("team_id",),
+    ("player_normalized",),
+    ("added_player_normalized",),
+    ("dropped_player_normalized",),
+]
+
+def connect(path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(path), timeout=60)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    for table, cols in TABLES.items():
+        names = {c for c, _ in cols}
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ("
+                     + ", ".join(f'"{c}" {t}' for c, t in cols) + ")")
+        for idx in INDEXES:
+            if set(idx) <= names:
+                conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{'_'.join(idx)} "
+                             f"ON {table} ({', '.join(idx)})")
+        # partition deletes
+        key = ("league_id", "season", "week") if table in WEEK_TABLES else ("league_id", "season")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_partition ON {table} ({', '.join(key)})")
+    conn.execute("""CREATE TABLE IF NOT EXISTS partitions (
+        league_id TEXT, season TEXT, partition TEXT, hash TEXT, loaded_at TEXT,
+        PRIMARY KEY (league_id, season, partition))""")
+    return conn
+
+def _insert(conn, table, rows) -> int:
+    cols = [c for c, _ in TABLES[table]]
+    sql = f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})"
+    params = [tuple(r.get(c) for c in cols) for r in rows]
+    conn.executemany(sql, params)
+    return len(params)
+
+def _delete(conn, table, league_id, season, week=None):
+    if week is None:
+        conn.execute(f"DELETE FROM {table} WHERE league_id = ? AND season = ?", (league_id, season))
+    else:
+        conn.execute(f"DELETE FROM {table} WHERE league_id = ? AND season = ? AND week = ?",
+                     (league_id, season, int(week)))
+
+def load_season(conn, league_id: str, season: str, partitions) -> dict:
+    """
+    partitions: (name, week or None, hash, build) where build() → {table: rows}.
+    Only partitions whose hash differs from the stored one are rebuilt.
+    Returns {"changed": [...], "removed": [...], "rows": N}.
+    """
+    stored = dict(conn.execute("SELECT partition, hash FROM partitions WHERE league_id = ? AND season = ?",
+                               (league_id, season)).fetchall())
+    now = datetime.now().isoformat(timespec="seconds")
+    changed, seen, rows = [], set(), 0
+
+    with conn:  # one transaction for the whole season
+        for name, week, digest, build in partitions:
+            seen.add(name)
+            if stored.get(name) == digest:
+                continue
+            for table, table_rows in build().items():
+                _delete(conn, table, league_id, season, week)
+                rows += _insert(conn, table, table_rows)
+            conn.execute("INSERT OR REPLACE INTO partitions VALUES (?, ?, ?, ?, ?)",
+                         (league_id, season, name, digest, now))
+            changed.append(name)
+
+        removed = [name for name in stored if name not in seen]
+        for name in removed:
+            if name.startswith("week_"):
+                for table in WEEK_TABLES:
+                    _delete(conn, table, league_id, season, name[len("week_"):])
+            else:
+                _delete(conn, name, league_id, season)
+            conn.execute("DELETE FROM partitions WHERE league_id = ? AND season = ? AND partition = ?",
+                         (league_id, season, name))
+
+    return {"changed": changed, "removed": removed, "rows": rows}
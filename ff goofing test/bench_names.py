@@ -0,0 +1,94 @@
+"""
+Per-name cost of name normalization and player lookup, before/after names.py.
+
+  before: the old etl.norm (NFKD + two regex passes, no cache) and the old
+          stat_parser registry scan (loop over every player per row)
+  after:  names.norm (ASCII translate fast path + LRU cache) and PlayerIndex
+
+Usage:
+  python bench_names.py [fantasy.json] [--repeat N]
+"""
+
+import json
+import re
+import sys
+import time
+import unicodedata
+
+import shared  # noqa: F401 (puts names on the path)
+import names
+
+def legacy_norm(s):
+    if s is None:
+        return ""
+    s = unicodedata.normalize("NFKD", s)
+    s = "".join(c for c in s if not unicodedata.combining(c))
+    s = s.lower()
+    s = re.sub(r"[^a-z0-9]+", " ", s)
+    return re.sub(r"\s+", " ", s).strip()
+
+def legacy_lookup(registry, name):
+    for pid, info in registry.items():
+        if info["name"] == name:
+            return pid
+    return None
+
+def collect_names(data):
+    """Every player name in lineups, transactions and draft picks."""
+    out = []
+    for league in data.get("leagues by ID", {}).values():
+        for season in league.get("seasons by ID", {}).values():
+            for wk in season.get("games", {}).get("weeks", {}).values():
+                for g in wk.get("games", []):
+                    for side in ("team_a", "team_b"):
+                        for bucket in ("starters", "bench", "ir"):
+                            for e in g.get(side, {}).get(bucket, []):
+                                out.append((e.get("player") or {}).get("name", ""))
+            for tx in season.get("transactions", []):
+                for k in ("added", "dropped"):
+                    if isinstance(tx.get(k), dict):
+                        out.append(tx[k].get("player", ""))
+            for r in season.get("draft", {}).get("rounds", {}).values():
+                out.extend(p.get("player", "") for p in r.get("picks", []))
+    out.extend(p.get("name", "") for p in data.get("Players", {}).values())
+    return [n for n in out if n]
+
+def per_name_ns(fn, items):
+    start = time.perf_counter()
+    for x in items:
+        fn(x)
+    return (time.perf_counter() - start) / len(items) * 1e9
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    src = args[0] if args else "fantasy.json"
+    repeat = int(sys.argv[sys.argv.index("--repeat") + 1]) if "--repeat" in sys.argv else 20
+
+    with open(src, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    sample = collect_names(data) * repeat
+    registry = data.get("Players", {})
+    if not sample:
+        sys.exit(f"❌ No player names found in {src}")
+
+    assert all(legacy_norm(n) == names.norm(n) for n in set(sample)), "norm() changed behaviour"
+
+    print(f"🧪 {len(sample)} names ({len(set(sample))} distinct), {len(registry)} registered players")
+    before = per_name_ns(legacy_norm, sample)
+    names.norm.cache_clear()
+    cold = per_name_ns(names.norm.__wrapped__, sample)
+    warm = per_name_ns(names.norm, sample)
+    print(f"  norm  before {before:8.0f} ns   after (no cache) {cold:6.0f} ns   after (cached) {warm:6.0f} ns"
+          f"   → {before / warm:.1f}x")
+
+    if registry:
+        index = names.PlayerIndex(registry)
+        before = per_name_ns(lambda n: legacy_lookup(registry, n), sample)
+        after = per_name_ns(index.resolve, sample)
+        print(f"  lookup before {before:7.0f} ns   after {after:6.0f} ns   → {before / after:.1f}x"
+              f"   ({sum(index.hits.values())} hits, {index.misses} misses)")
+
+    print(f"  cache: {names.norm.cache_info()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+# Columnar tables for the ETL: Parquet when pyarrow is installed, otherwise a
+# directory with one little-endian array file per column.
+#
+#   <table>/schema.json        {"rows": N, "columns": {name: {"type": ..., "file": ...}}}
+#   <table>/<col>.i64|.f64|.i8  int / float / bool values (+ <col>.nulls bitmap if any None)
+#   <table>/<col>.codes        int32 codes, -1 = null, into <col>.dict.json (string table)
+#
+# Every string column is dictionary-encoded; CATEGORICAL columns are also
+# dictionary-encoded in Parquet. A reader only opens the files of the columns
+# it asks for.
+
+import json
+import math
+import sys
+from array import array
+from pathlib import Path
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional
+    pa = pq = None
+
+CATEGORICAL = {"bucket", "slot", "position", "nfl_team", "team_id"}
+
+# column type → (array typecode, file suffix)
+TYPES = {"int": ("q", ".i64"), "float": ("d", ".f64"), "bool": ("b", ".i8"), "str": ("i", ".codes")}
+
+def column_type(values) -> str:
+    kinds = {type(v) for v in values if v is not None}
+    if not kinds or kinds == {str}:
+        return "str"
+    if kinds == {bool}:
+        return "bool"
+    if kinds == {int}:
+        return "int"
+    if kinds <= {int, float}:
+        return "float"
+    return "json"  # mixed: stored as JSON text in a string table
+
+def _to_le(arr: array) -> bytes:
+    if sys.byteorder == "big":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+def _from_le(typecode: str, raw: bytes) -> array:
+    arr = array(typecode)
+    arr.frombytes(raw)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr
+
+def _null_bitmap(values) -> bytes:
+    bits = bytearray((len(values) + 7) // 8)
+    for i, v in enumerate(values):
+        if v is None:
+            bits[i >> 3] |= 1 << (i & 7)
+    return bytes(bits)
+
+def write_columns(folder: Path, columns: dict, rows: int):
+    folder.mkdir(parents=True, exist_ok=True)
+    for old in folder.iterdir():
+        if old.is_file():
+            old.unlink()
+
+    schema = {"format": 1, "byteorder": "little", "rows": rows, "columns": {}}
+    for name, values in columns.items():
+        ctype = column_type(values)
+        safe = "".join(c if c.isalnum() or c in "_-" else "_" for c in name)
+        info = {"type": ctype}
+
+        if ctype in ("str", "json"):
+            table, codes = {}, array("i")
+            for v in values:
+                if v is None:
+                    codes.append(-1)
+                    continue
+                if ctype == "json":
+                    v = json.dumps(v, ensure_ascii=False)
+                codes.append(table.setdefault(v, len(table)))
+            info.update(file=safe + ".codes", dict=safe + ".dict.json")
+            (folder / info["file"]).write_bytes(_to_le(codes))
+            with open(folder / info["dict"], "w", encoding="utf-8") as f:
+                json.dump(list(table), f, ensure_ascii=False)
+        else:
+            typecode, suffix = TYPES[ctype]
+            fill = math.nan if ctype == "float" else 0
+            arr = array(typecode, (fill if v is None else v for v in values))
+            info["file"] = safe + suffix
+            (folder / info["file"]).write_bytes(_to_le(arr))
+            if any(v is None for v in values):
+                info["nulls"] = safe + ".nulls"
+                (folder / info["nulls"]).write_bytes(_null_bitmap(values))
+
+        schema["columns"][name] = info
+
+    with open(folder / "schema.json", "w", encoding="utf-8") as f:
+        json.dump(schema, f, indent=2)
+
+def read_columns(folder: Path, columns=None) -> dict:
+    """{column: list of values} for the requested columns (all by default)."""
+    folder = Path(folder)
+    with open(folder / "schema.json", "r", encoding="utf-8") as f:
+        schema = json.load(f)
+
+    out = {}
+    for name in columns or schema["columns"]:
+        info = schema["columns"][name]
+        raw = (folder / info["file"]).read_bytes()
+        if info["type"] in ("str", "json"):
+            with open(folder / info["dict"], "r", encoding="utf-8") as f:
+                table = json.load(f)
+            if info["type"] == "json":
+                table = [json.loads(v) for v in table]
+            out[name] = [table[c] if c >= 0 else None for c in _from_le("i", raw)]
+            continue
+
+        values = _from_le(TYPES[info["type"]][0], raw).tolist()
+        if info["type"] == "bool":
+            values = [bool(v) for v in values]
+        if "nulls" in info:
+            bits = (folder / info["nulls"]).read_bytes()
+            values = [None if bits[i >> 3] >> (i & 7) & 1 else v for i, v in enumerate(values)]
+        out[name] = values
+    return out
+
+def write_parquet(path: Path, columns: dict):
+    arrays, names = [], []
+    for name, values in columns.items():
+        ctype = column_type(values)
+        if ctype == "json":
+            values = [None if v is None else json.dumps(v, ensure_ascii=False) for v in values]
+        arr = pa.array(values)
+        if name in CATEGORICAL and ctype in ("str", "json"):
+            arr = arr.dictionary_encode()
+        arrays.append(arr)
+        names.append(name)
+    pq.write_table(pa.Table.from_arrays(arrays, names=names), path)
+
+class ColumnarWriter:
+    """Same interface as etl.JsonlWriter; buffers columns and writes them on exit."""
+    def __init__(self, path: Path):
+        self.base = path
+        self.path = path.with_suffix(".parquet") if pq else path
+        self.columns = {}
+        self.count = 0
+
+    def __enter__(self):
+        return self
+
+    def write(self, r: dict):
+        for k in r:
+            if k not in self.columns:
+                self.columns[k] = [None] * self.count
+        for k, col in self.columns.items():
+            col.append(r.get(k))
+        self.count += 1
+
+    def __exit__(self, *exc):
+        if exc[0] is not None:
+            return
+        if pq:
+            write_parquet(self.path, self.columns)
+        else:
+            write_columns(self.path, self.columns, self.count)
+        print(f"Wrote {self.count} rows → {self.path}")
@@ -1,101 +1,278 @@
 # Fantasy JSON → JSONL ETL Script (league/season aware, improved)
-# Usage: python etl.py <LEAGUE_ID> <SEASON> [--input fantasy.json] [--output-dir .]
+# Usage: python etl.py <LEAGUE_ID> <SEASON> [--input fantasy.json] [--output-dir .] [--incremental]
+#                     [--format jsonl|columnar] [--compress gzip|zstd] [--flush-rows N] [--sqlite analytics.db]
+#        python etl.py --all [--workers N] [--input fantasy.json] [--output-dir .] [--format ...] [--sqlite ...]
+#
+# --sqlite loads the tables into an indexed SQLite database instead of files,
+# re-loading only the weeks / transactions / draft picks that changed.
+#
+# Reads both master shapes: leagues -> <name> -> seasons -> <year> and the
+# ingest scripts' leagues by ID -> <L001> -> seasons by ID -> <L001S2025>.
 
-import json, re, unicodedata, sys
+import gzip, io, json, os, sys, hashlib, shutil, time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
 from collections import defaultdict
 from pathlib import Path
 
-def norm(s: str) -> str:
-    if s is None:
-        return ""
-    s = unicodedata.normalize("NFKD", s)
-    s = "".join(c for c in s if not unicodedata.combining(c))
-    s = s.lower()
-    s = re.sub(r"[^a-z0-9]+", " ", s)
-    return re.sub(r"\s+", " ", s).strip()
+import analytics_db
+from columnar import ColumnarWriter
+from json_stream import JsonStream
+import shared  # noqa: F401 (puts names on the path)
+from names import PlayerIndex, norm
+
+try:
+    import zstandard
+except ImportError:  # optional, only for --compress zstd
+    zstandard = None
+
+FLUSH_ROWS = 1000  # lines buffered per write; --flush-rows
+COMPRESSION_SUFFIX = {"gzip": ".gz", "zstd": ".zst"}
+
+# json.dumps(..., ensure_ascii=False) builds a new encoder per call; reuse one
+_encode = json.JSONEncoder(ensure_ascii=False).encode
+
+class JsonlWriter:
+    """Write rows to a JSONL file as they're produced, FLUSH_ROWS lines per write (optionally gzip/zstd)."""
+    def __init__(self, path: Path, compression=None, flush_rows=None):
+        self.path = path
+        self.compression = compression
+        self.flush_rows = flush_rows or FLUSH_ROWS
+        self.buf = []
+        self.count = 0
+
+    def __enter__(self):
+        if self.compression == "gzip":
+            self.f = gzip.open(self.path, "wt", encoding="utf-8", compresslevel=6)
+        elif self.compression == "zstd":
+            if zstandard is None:
+                raise RuntimeError("zstd compression needs the 'zstandard' package (pip install zstandard)")
+            raw = zstandard.ZstdCompressor().stream_writer(open(self.path, "wb"))
+            self.f = io.TextIOWrapper(raw, encoding="utf-8")
+        else:
+            self.f = open(self.path, "w", encoding="utf-8")
+        return self
+
+    def write(self, r: dict):
+        self.buf.append(_encode({k: v for k, v in r.items() if v is not None}))
+        self.count += 1
+        if len(self.buf) >= self.flush_rows:
+            self.flush()
+
+    def flush(self):
+        if self.buf:
+            self.buf.append("")
+            self.f.write("\n".join(self.buf))
+            self.buf.clear()
+
+    def __exit__(self, *exc):
+        self.flush()
+        self.f.close()
+        print(f"Wrote {self.count} rows → {self.path}")
 
 def write_jsonl(path: Path, rows):
-    with open(path, "w", encoding="utf-8") as f:
+    with JsonlWriter(path) as out:
         for r in rows:
-            clean = {k: v for k, v in r.items() if v is not None}
-            f.write(json.dumps(clean, ensure_ascii=False) + "\n")
-    print(f"Wrote {len(rows)} rows → {path}")
-
-def run(league_id: str, season_key: str, src: Path, out_dir: Path):
-    data = json.loads(src.read_text(encoding="utf-8"))
-
-    # locate league
-    leagues = data.get("leagues", {})
-    league = None
-    league_name = None
-    for lname, ldata in leagues.items():
-        if ldata.get("league_id") == league_id:
-            league = ldata
-            league_name = lname
-            break
-    if league is None:
-        raise ValueError(f"League {league_id} not found")
+            out.write(r)
+
+def open_writer(path: Path, fmt: str = "jsonl"):
+    """
+    Writer for one output table; `path` has no extension.
+    fmt: "columnar", "jsonl", or compressed "jsonl.gzip" / "jsonl.zstd".
+    """
+    if fmt == "columnar":
+        return ColumnarWriter(path)
+    compression = fmt.partition(".")[2] or None
+    suffix = ".jsonl" + COMPRESSION_SUFFIX.get(compression, "")
+    return JsonlWriter(path.with_name(path.name + suffix), compression)
+
+def write_rows(path: Path, rows, fmt: str = "jsonl") -> int:
+    with open_writer(path, fmt) as out:
+        for r in rows:
+            out.write(r)
+    return out.count
+
+# ---------- streaming source ----------
+class SeasonStream:
+    """
+    One season read straight off disk: leagues -> <league> -> seasons -> <season>.
+    Only one week / transaction / pick is decoded at a time.
+    """
+    def __init__(self, js: JsonStream, league_name: str, members: dict):
+        self.js = js
+        self.league_name = league_name
+        self.members = members
+
+    def value(self, key, default=None):
+        if key not in self.members:
+            return default
+        self.js.seek(self.members[key])
+        return self.js.value()
+
+    def weeks(self):
+        """(week, week dict) one at a time."""
+        if "games" not in self.members:
+            return
+        self.js.seek(self.members["games"])
+        for key in self.js.items():
+            if key == "weeks":
+                for week in self.js.items():
+                    yield week, self.js.value()
+
+    def transactions(self):
+        if "transactions" not in self.members:
+            return
+        self.js.seek(self.members["transactions"])
+        if self.js.peek() == "{":
+            # {"items": [...]} shape
+            for key in self.js.items():
+                if key == "items":
+                    for _ in self.js.elements():
+                        yield self.js.value()
+            return
+        for _ in self.js.elements():
+            yield self.js.value()
+
+    def draft_picks(self):
+        """(round, pick) one at a time."""
+        if "draft" not in self.members:
+            return
+        self.js.seek(self.members["draft"])
+        for key in self.js.items():
+            if key != "rounds":
+                continue
+            for rnd in self.js.items():
+                for rkey in self.js.items():
+                    if rkey == "picks":
+                        for _ in self.js.elements():
+                            yield rnd, self.js.value()
+
+class SeasonDoc:
+    """SeasonStream's interface over a season dict that's already decoded."""
+    def __init__(self, season: dict, league_name: str):
+        self.season = season
+        self.league_name = league_name
+
+    def value(self, key, default=None):
+        return self.season.get(key, default)
+
+    def weeks(self):
+        yield from self.season.get("games", {}).get("weeks", {}).items()
+
+    def transactions(self):
+        txs = self.season.get("transactions", [])
+        yield from (txs.get("items", []) if isinstance(txs, dict) else txs)
 
-    seasons = league.get("seasons", {})
-    if season_key not in seasons:
+    def draft_picks(self):
+        for rnd, r in self.season.get("draft", {}).get("rounds", {}).items():
+            for pick in r.get("picks", []):
+                yield rnd, pick
+
+LEAGUE_KEYS = ("leagues", "leagues by ID")
+SEASON_KEYS = ("seasons", "seasons by ID")
+
+def season_key_for(league_id: str, skey: str) -> str:
+    """'L001S2025' → '2025'; old-shape keys pass through."""
+    prefix = f"{league_id}S"
+    return skey[len(prefix):] if league_id and skey.startswith(prefix) else skey
+
+def iter_leagues(js: JsonStream):
+    """(league_id, league_name, seasons position) for each league, either shape."""
+    for top in js.items():
+        if top not in LEAGUE_KEYS:
+            continue
+        for lkey in js.items():
+            league = js.members()
+            resume = js.tell()
+            league_id, league_name = lkey, lkey
+            if "league_id" in league:
+                js.seek(league["league_id"])
+                league_id = js.value()
+            for name_key in ("league_name", "name"):
+                if top == "leagues by ID" and name_key in league:
+                    js.seek(league[name_key])
+                    league_name = js.value()
+                    break
+            seasons = next((league[k] for k in SEASON_KEYS if k in league), None)
+            yield league_id, league_name, seasons
+            js.seek(resume)
+
+def open_season_stream(f, league_id: str, season_key: str) -> SeasonStream:
+    js = JsonStream(f)
+    for lid, league_name, seasons in iter_leagues(js):
+        if lid != league_id:
+            continue
+        if seasons is None:
+            break
+        js.seek(seasons)
+        for skey in js.items():
+            if season_key_for(league_id, skey) == season_key:
+                return SeasonStream(js, league_name, js.members())
         raise ValueError(f"Season {season_key} not found in league {league_id}")
+    raise ValueError(f"League {league_id} not found")
 
-    season = seasons[season_key]
+def iter_seasons(f):
+    """(league_id, league_name, season_key, season dict) for every season, decoded one at a time."""
+    js = JsonStream(f)
+    for league_id, league_name, seasons in iter_leagues(js):
+        if seasons is None:
+            continue
+        js.seek(seasons)
+        for skey in js.items():
+            yield league_id, league_name, season_key_for(league_id, skey), js.value()
 
-    teams = season.get("teams", [])
-    games = season.get("games", {})
-    transactions = season.get("transactions", [])
-    draft = season.get("draft", {})
+def load_identity(src: Path):
+    """PlayerIndex over the master's root "Players" registry (None if there isn't one)."""
+    with open(src, "r", encoding="utf-8") as f:
+        js = JsonStream(f)
+        for top in js.items():
+            if top == "Players":
+                registry = js.value()
+                return PlayerIndex(registry) if registry else None
+    return None
 
-    id_by_name_norm = {norm(t["name"]): t["team_id"] for t in teams}
+# ---------- row builders ----------
+def matchup_row(meta: dict, week, wdate, g: dict, id_by_name_norm: dict) -> dict:
+    def side_info(key):
+        side = g.get(key, {})
+        snap = side.get("name")
+        tid = side.get("team_id") or id_by_name_norm.get(norm(snap))
+        totals = side.get("totals", {})
+        return tid, snap, totals.get("fpts", 0.0)
 
-    # helper to attach metadata
-    def with_meta(extra: dict) -> dict:
-        return {
-            "league_id": league_id,
-            "league_name": league_name,
-            "season": season_key,
-            **extra,
-        }
+    a_id, a_name, a_score = side_info("team_a")
+    b_id, b_name, b_score = side_info("team_b")
+    winner = a_id if a_score > b_score else (b_id if b_score > a_score else "TIE")
 
-    matchups_rows, lineup_rows, tx_rows, draft_rows = [], [], [], []
-    weekly_points = defaultdict(float)
+    return {
+        **meta,
+        "week": int(week),
+        "week_date": wdate,
+        "game_id": g.get("game_id"),
+        "team_a_id": a_id,
+        "team_a_name_snapshot": a_name,
+        "team_a_score": round(a_score, 2) if isinstance(a_score, (int, float)) else a_score,
+        "team_b_id": b_id,
+        "team_b_name_snapshot": b_name,
+        "team_b_score": round(b_score, 2) if isinstance(b_score, (int, float)) else b_score,
+        "winner_team_id": winner,
+    }
 
-    # Games → matchups + lineup slots + weekly player stats
-    for week, wk in games.get("weeks", {}).items():
-        wdate = wk.get("date")
-        for g in wk.get("games", []):
-            gid = g.get("game_id")
-
-            def side_info(key):
-                side = g.get(key, {})
-                snap = side.get("name")
-                tid = side.get("team_id") or id_by_name_norm.get(norm(snap))
-                totals = side.get("totals", {})
-                return side, tid, snap, totals.get("fpts", 0.0), totals.get("proj")
-
-            a_side, a_id, a_name, a_score, _ = side_info("team_a")
-            b_side, b_id, b_name, b_score, _ = side_info("team_b")
-            winner = a_id if a_score > b_score else (b_id if b_score > a_score else "TIE")
-
-            matchups_rows.append(with_meta({
-                "week": int(week),
-                "week_date": wdate,
-                "game_id": gid,
-                "team_a_id": a_id,
-                "team_a_name_snapshot": a_name,
-                "team_a_score": round(a_score, 2) if isinstance(a_score, (int, float)) else a_score,
-                "team_b_id": b_id,
-                "team_b_name_snapshot": b_name,
-                "team_b_score": round(b_score, 2) if isinstance(b_score, (int, float)) else b_score,
-                "winner_team_id": winner,
-            }))
-
-            def emit(side, tid, tname, bucket, entry):
+def lineup_rows(meta: dict, week, g: dict, id_by_name_norm: dict, identity=None):
+    gid = g.get("game_id")
+    for key in ("team_a", "team_b"):
+        side = g.get(key, {})
+        tname = side.get("name")
+        tid = side.get("team_id") or id_by_name_norm.get(norm(tname))
+        for bucket, entries in (("STARTER", side.get("starters", [])),
+                                ("BENCH", side.get("bench", [])),
+                                ("IR", side.get("ir", []))):
+            for entry in entries:
                 p = entry.get("player", {}) or {}
                 snap_player = p.get("name")
-                nplayer = norm(snap_player) if snap_player else ""
-                row = with_meta({
+                yield {
+                    **meta,
                     "week": int(week),
                     "game_id": gid,
                     "team_id": tid,
@@ -103,97 +280,360 @@ def run(league_id: str, season_key: str, src: Path, out_dir: Path):
                     "bucket": bucket,
                     "slot": entry.get("slot"),
                     "player_snapshot": snap_player,
-                    "player_normalized": nplayer,
+                    "player_normalized": norm(snap_player) if snap_player else "",
+                    "player_id": identity.resolve(snap_player) if identity and snap_player else None,
                     "nfl_team": p.get("team"),
                     "position": p.get("position"),
                     "opponent": p.get("opponent"),
                     "projected": p.get("proj"),
                     "points": p.get("fpts"),
-                })
-                lineup_rows.append(row)
-                if nplayer and isinstance(p.get("fpts"), (int, float)):
-                    weekly_points[(int(week), nplayer)] += float(p["fpts"])
-
-            for e in a_side.get("starters", []):
-                emit(a_side, a_id, a_name, "STARTER", e)
-            for e in a_side.get("bench", []):
-                emit(a_side, a_id, a_name, "BENCH", e)
-            for e in a_side.get("ir", []):
-                emit(a_side, a_id, a_name, "IR", e)
-            for e in b_side.get("starters", []):
-                emit(b_side, b_id, b_name, "STARTER", e)
-            for e in b_side.get("bench", []):
-                emit(b_side, b_id, b_name, "BENCH", e)
-            for e in b_side.get("ir", []):
-                emit(b_side, b_id, b_name, "IR", e)
-
-    weekly_rows = [
-        with_meta({"week": wk, "player_normalized": p, "points": round(pts, 2)})
-        for (wk, p), pts in sorted(weekly_points.items())
-    ]
-
-    # Transactions
-    for tx in transactions:
-        base = with_meta({
-            "date": tx.get("date"),
-            "time": tx.get("time"),
-            "type": tx.get("type"),
-            "method": tx.get("method"),
-            "team_id": tx.get("team_id"),
-            "team_name_snapshot": tx.get("team_name"),
-            "transaction_id": tx.get("transaction_id"),
+                }
+
+def tx_row(meta: dict, tx: dict, identity=None) -> dict:
+    base = {
+        **meta,
+        "date": tx.get("date"),
+        "time": tx.get("time"),
+        "type": tx.get("type"),
+        "method": tx.get("method"),
+        "team_id": tx.get("team_id"),
+        "team_name_snapshot": tx.get("team_name"),
+        "transaction_id": tx.get("transaction_id"),
+    }
+    if isinstance(tx.get("added"), dict):
+        p = tx["added"]
+        base.update({
+            "added_player_snapshot": p.get("player"),
+            "added_player_normalized": norm(p.get("player")) if p.get("player") else None,
+            "added_player_id": identity.resolve(p.get("player")) if identity and p.get("player") else None,
+            "added_team": p.get("team"),
+            "added_position": p.get("position"),
+            "added_cost": p.get("cost"),
+        })
+    if isinstance(tx.get("dropped"), dict):
+        p = tx["dropped"]
+        base.update({
+            "dropped_player_snapshot": p.get("player"),
+            "dropped_player_normalized": norm(p.get("player")) if p.get("player") else None,
+            "dropped_player_id": identity.resolve(p.get("player")) if identity and p.get("player") else None,
+            "dropped_team": p.get("team"),
+            "dropped_position": p.get("position"),
         })
-        if isinstance(tx.get("added"), dict):
-            p = tx["added"]
-            base.update({
-                "added_player_snapshot": p.get("player"),
-                "added_player_normalized": norm(p.get("player")) if p.get("player") else None,
-                "added_team": p.get("team"),
-                "added_position": p.get("position"),
-                "added_cost": p.get("cost"),
-            })
-        if isinstance(tx.get("dropped"), dict):
-            p = tx["dropped"]
-            base.update({
-                "dropped_player_snapshot": p.get("player"),
-                "dropped_player_normalized": norm(p.get("player")) if p.get("player") else None,
-                "dropped_team": p.get("team"),
-                "dropped_position": p.get("position"),
-            })
-        for k in ("old_name","new_name","old_abbrev","new_abbrev","note"):
-            if k in tx:
-                base[k] = tx.get(k)
-        tx_rows.append(base)
-
-    # Draft
-    for rnd, rdata in draft.get("rounds", {}).items():
-        for pick in rdata.get("picks", []):
-            pname = pick.get("player")
-            draft_rows.append(with_meta({
-                "round": int(rnd),
-                "round_pick": pick.get("round_pick"),
-                "overall": pick.get("overall"),
-                "player_snapshot": pname,
-                "player_normalized": norm(pname) if pname else None,
-                "team_id": pick.get("team_id"),
-                "team_name_snapshot": pick.get("team"),
-            }))
+    for k in ("old_name","new_name","old_abbrev","new_abbrev","note"):
+        if k in tx:
+            base[k] = tx.get(k)
+    return base
+
+def draft_row(meta: dict, rnd, pick: dict, identity=None) -> dict:
+    pname = pick.get("player")
+    return {
+        **meta,
+        "round": int(rnd),
+        "round_pick": pick.get("round_pick"),
+        "overall": pick.get("overall"),
+        "player_snapshot": pname,
+        "player_normalized": norm(pname) if pname else None,
+        "player_id": identity.resolve(pname) if identity and pname else None,
+        "team_id": pick.get("team_id"),
+        "team_name_snapshot": pick.get("team"),
+    }
+
+def export_season(season, league_id: str, season_key: str, out_dir: Path, fmt: str = "jsonl",
+                  identity=None) -> dict:
+    """
+    Write one season's five tables; `season` is a SeasonStream or SeasonDoc.
+    With a PlayerIndex, rows get canonical player_id columns. Returns row counts.
+    """
+    teams = season.value("teams", [])
+    id_by_name_norm = {norm(t["name"]): t["team_id"] for t in teams}
+
+    meta = {
+        "league_id": league_id,
+        "league_name": season.league_name,
+        "season": season_key,
+    }
+    weekly_points = defaultdict(float)
+    counts = {}
 
     # Write all files with league/season prefix
     prefix = f"{league_id}_{season_key}_"
-    write_jsonl(out_dir / f"{prefix}matchups.jsonl", matchups_rows)
-    write_jsonl(out_dir / f"{prefix}lineup_slots.jsonl", lineup_rows)
-    write_jsonl(out_dir / f"{prefix}weekly_player_stats.jsonl", weekly_rows)
-    write_jsonl(out_dir / f"{prefix}transactions.jsonl", tx_rows)
-    write_jsonl(out_dir / f"{prefix}draft_picks.jsonl", draft_rows)
+
+    # Games → matchups + lineup slots (+ weekly player points), one week at a time
+    with open_writer(out_dir / f"{prefix}lineup_slots", fmt) as lineup_out, \
+         open_writer(out_dir / f"{prefix}matchups", fmt) as matchups_out:
+        for week, wk in season.weeks():
+            wdate = wk.get("date")
+            for g in wk.get("games", []):
+                matchups_out.write(matchup_row(meta, week, wdate, g, id_by_name_norm))
+                for row in lineup_rows(meta, week, g, id_by_name_norm, identity):
+                    lineup_out.write(row)
+                    pts = row["points"]
+                    if row["player_normalized"] and isinstance(pts, (int, float)):
+                        weekly_points[(int(week), row["player_normalized"])] += float(pts)
+    counts["matchups"], counts["lineup_slots"] = matchups_out.count, lineup_out.count
+
+    counts["weekly_player_stats"] = write_rows(out_dir / f"{prefix}weekly_player_stats", (
+        {**meta, "week": wk, "player_normalized": p, "points": round(pts, 2)}
+        for (wk, p), pts in sorted(weekly_points.items())
+    ), fmt)
+
+    counts["transactions"] = write_rows(out_dir / f"{prefix}transactions",
+                                        (tx_row(meta, tx, identity) for tx in season.transactions()), fmt)
+    counts["draft_picks"] = write_rows(out_dir / f"{prefix}draft_picks",
+                                       (draft_row(meta, rnd, pick, identity) for rnd, pick in season.draft_picks()), fmt)
+    return counts
+
+def run(league_id: str, season_key: str, src: Path, out_dir: Path, fmt: str = "jsonl"):
+    identity = load_identity(src)
+    with open(src, "r", encoding="utf-8") as f:
+        season = open_season_stream(f, league_id, season_key)
+        return export_season(season, league_id, season_key, out_dir, fmt, identity)
+
+# ---------- every season ----------
+def _export_job(league_id, league_name, season_key, season, out_dir, fmt, identity, flush_rows):
+    global FLUSH_ROWS
+    FLUSH_ROWS = flush_rows  # workers may be spawned without the parent's settings
+    counts = export_season(SeasonDoc(season, league_name), league_id, season_key, out_dir, fmt, identity)
+    return league_id, season_key, counts
+
+def run_all(src: Path, out_dir: Path, fmt: str = "jsonl", workers=None):
+    """One pass over the source; each season is exported by a pool worker as soon as it's decoded."""
+    start = time.perf_counter()
+    results = []
+    identity = load_identity(src)
+    with open(src, "r", encoding="utf-8") as f, ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque()
+        limit = 2 * (workers or os.cpu_count() or 1)  # keep only a few decoded seasons in memory
+        for league_id, league_name, season_key, season in iter_seasons(f):
+            in_flight.append(pool.submit(_export_job, league_id, league_name, season_key, season,
+                                         out_dir, fmt, identity, FLUSH_ROWS))
+            if len(in_flight) >= limit:
+                results.append(in_flight.popleft().result())
+        while in_flight:
+            results.append(in_flight.popleft().result())
+
+    tables = ["matchups", "lineup_slots", "weekly_player_stats", "transactions", "draft_picks"]
+    print(f"\n📊 ETL summary: {len(results)} season(s) in {time.perf_counter() - start:.2f}s → {out_dir}")
+    print(f"  {'league':<8} {'season':<8} " + " ".join(f"{t:>20}" for t in tables))
+    totals = defaultdict(int)
+    for league_id, season_key, counts in sorted(results):
+        print(f"  {league_id:<8} {season_key:<8} " + " ".join(f"{counts[t]:>20}" for t in tables))
+        for t in tables:
+            totals[t] += counts[t]
+    print(f"  {'total':<17} " + " ".join(f"{totals[t]:>20}" for t in tables))
+    return results
+
+# ---------- incremental ----------
+# Output is partitioned by week: <prefix>weeks/week_<n>/{matchups,lineup_slots,weekly_player_stats}
+# plus <prefix>transactions and <prefix>draft_picks (.jsonl, or columnar with --format). <prefix>manifest.json keeps
+# per-week / per-game / per-transaction hashes; only partitions whose hash moved are rewritten,
+# and <prefix>changes.json lists what this run touched for downstream loaders.
+def content_hash(obj) -> str:
+    raw = json.dumps(obj, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=12).hexdigest()
+
+def identity_fingerprint(identity):
+    return identity and [sorted(identity.by_name.items()), sorted(identity.by_key.items())]
+
+def diff_ids(old: dict, new: dict) -> dict:
+    return {
+        "added": [k for k in new if k not in old],
+        "changed": [k for k in new if k in old and old[k] != new[k]],
+        "removed": [k for k in old if k not in new],
+    }
+
+def week_tables(meta: dict, week, wk: dict, id_by_name_norm: dict, identity=None) -> dict:
+    """One week's matchups / lineup_slots / weekly_player_stats rows."""
+    weekly_points = defaultdict(float)
+    wdate = wk.get("date")
+    matchups, lineups = [], []
+    for g in wk.get("games", []):
+        matchups.append(matchup_row(meta, week, wdate, g, id_by_name_norm))
+        for row in lineup_rows(meta, week, g, id_by_name_norm, identity):
+            lineups.append(row)
+            pts = row["points"]
+            if row["player_normalized"] and isinstance(pts, (int, float)):
+                weekly_points[row["player_normalized"]] += float(pts)
+    return {
+        "matchups": matchups,
+        "lineup_slots": lineups,
+        "weekly_player_stats": [
+            {**meta, "week": int(week), "player_normalized": p, "points": round(pts, 2)}
+            for p, pts in sorted(weekly_points.items())
+        ],
+    }
+
+def write_week_partition(part_dir: Path, meta: dict, week, wk: dict, id_by_name_norm: dict, fmt: str = "jsonl",
+                         identity=None):
+    part_dir.mkdir(parents=True, exist_ok=True)
+    for table, rows in week_tables(meta, week, wk, id_by_name_norm, identity).items():
+        write_rows(part_dir / table, rows, fmt)
+
+def run_incremental(league_id: str, season_key: str, src: Path, out_dir: Path, fmt: str = "jsonl"):
+    prefix = f"{league_id}_{season_key}_"
+    manifest_path = out_dir / f"{prefix}manifest.json"
+    weeks_dir = out_dir / f"{prefix}weeks"
+    tx_base, draft_base = out_dir / f"{prefix}transactions", out_dir / f"{prefix}draft_picks"
+    tx_path, draft_path = open_writer(tx_base, fmt).path, open_writer(draft_base, fmt).path
+
+    identity = load_identity(src)
+    old = {}
+    if manifest_path.exists():
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            old = json.load(f)
+
+    with open(src, "r", encoding="utf-8") as f:
+        season = open_season_stream(f, league_id, season_key)
+
+        teams = season.value("teams", [])
+        id_by_name_norm = {norm(t["name"]): t["team_id"] for t in teams}
+        meta = {
+            "league_id": league_id,
+            "league_name": season.league_name,
+            "season": season_key,
+        }
+
+        # teams / league name / output format / player registry feed every row,
+        # so a change there re-emits everything
+        context = content_hash({"teams": teams, "meta": meta, "format": fmt,
+                                "players": identity_fingerprint(identity)})
+        full = old.get("context") != context
+        new = {"version": 1, "context": context, "weeks": {}}
+        changes = []
+
+        for week, wk in season.weeks():
+            games = {g.get("game_id") or f"#{i}": content_hash(g) for i, g in enumerate(wk.get("games", []))}
+            entry = {"hash": content_hash(wk), "games": games}
+            new["weeks"][week] = entry
+
+            prev = old.get("weeks", {}).get(week)
+            part_dir = weeks_dir / f"week_{week}"
+            if full or prev is None or prev["hash"] != entry["hash"] or not part_dir.exists():
+                write_week_partition(part_dir, meta, week, wk, id_by_name_norm, fmt, identity)
+                changes.append({"partition": f"week_{week}", "action": "upsert", "path": str(part_dir),
+                                "games": diff_ids(prev["games"] if prev else {}, games)})
+
+        for week in old.get("weeks", {}):
+            if week not in new["weeks"]:
+                part_dir = weeks_dir / f"week_{week}"
+                shutil.rmtree(part_dir, ignore_errors=True)
+                changes.append({"partition": f"week_{week}", "action": "delete", "path": str(part_dir)})
+
+        # transactions: hash each one while streaming, re-read only if something moved
+        tx_hashes = {}
+        for i, tx in enumerate(season.transactions()):
+            tx_hashes[str(tx.get("transaction_id") or f"#{i}")] = content_hash(tx)
+        new["transactions"] = tx_hashes
+        if full or tx_hashes != old.get("transactions") or not tx_path.exists():
+            with open_writer(tx_base, fmt) as out:
+                for tx in season.transactions():
+                    out.write(tx_row(meta, tx, identity))
+            changes.append({"partition": "transactions", "action": "upsert", "path": str(tx_path),
+                            "transactions": diff_ids(old.get("transactions", {}), tx_hashes)})
+
+        draft = hashlib.blake2b(digest_size=12)
+        for rnd, pick in season.draft_picks():
+            draft.update(content_hash([rnd, pick]).encode("ascii"))
+        new["draft"] = draft.hexdigest()
+        if full or new["draft"] != old.get("draft") or not draft_path.exists():
+            with open_writer(draft_base, fmt) as out:
+                for rnd, pick in season.draft_picks():
+                    out.write(draft_row(meta, rnd, pick, identity))
+            changes.append({"partition": "draft_picks", "action": "upsert", "path": str(draft_path)})
+
+    with open(out_dir / f"{prefix}changes.json", "w", encoding="utf-8") as f:
+        json.dump({
+            "generated": datetime.now().isoformat(timespec="seconds"),
+            "league_id": league_id,
+            "season": season_key,
+            "full_rebuild": full,
+            "changes": changes,
+        }, f, indent=2)
+
+    # manifest last: if anything above failed, the next run redoes it
+    tmp = manifest_path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(new, f, indent=2)
+    tmp.replace(manifest_path)
+
+    print(f"{len(changes)} partition(s) changed" + (" (full rebuild)" if full else "")
+          + f" → {out_dir / (prefix + 'changes.json')}")
+
+# ---------- SQLite target ----------
+def season_partitions(season, league_id: str, season_key: str, identity=None):
+    """(name, week, hash, build) per week, then transactions and draft picks, for analytics_db.load_season."""
+    teams = season.value("teams", [])
+    id_by_name_norm = {norm(t["name"]): t["team_id"] for t in teams}
+    meta = {
+        "league_id": league_id,
+        "league_name": season.league_name,
+        "season": season_key,
+    }
+    context = content_hash({"teams": teams, "meta": meta, "players": identity_fingerprint(identity)})
+
+    for week, wk in season.weeks():
+        yield (f"week_{week}", week, content_hash([context, wk]),
+               lambda week=week, wk=wk: week_tables(meta, week, wk, id_by_name_norm, identity))
+
+    tx_hash = hashlib.blake2b(context.encode("ascii"), digest_size=12)
+    for tx in season.transactions():
+        tx_hash.update(content_hash(tx).encode("ascii"))
+    yield ("transactions", None, tx_hash.hexdigest(),
+           lambda: {"transactions": [tx_row(meta, tx, identity) for tx in season.transactions()]})
+
+    draft_hash = hashlib.blake2b(context.encode("ascii"), digest_size=12)
+    for rnd, pick in season.draft_picks():
+        draft_hash.update(content_hash([rnd, pick]).encode("ascii"))
+    yield ("draft_picks", None, draft_hash.hexdigest(),
+           lambda: {"draft_picks": [draft_row(meta, rnd, pick, identity) for rnd, pick in season.draft_picks()]})
+
+def _report_load(db_path, league_id, season_key, result):
+    changed = ", ".join(result["changed"]) or "nothing"
+    removed = f"; removed {', '.join(result['removed'])}" if result["removed"] else ""
+    print(f"🗄️ {league_id} {season_key}: reloaded {changed}{removed} ({result['rows']} rows) → {db_path}")
+
+def run_sqlite(league_id: str, season_key: str, src: Path, db_path: Path):
+    identity = load_identity(src)
+    conn = analytics_db.connect(db_path)
+    try:
+        with open(src, "r", encoding="utf-8") as f:
+            season = open_season_stream(f, league_id, season_key)
+            result = analytics_db.load_season(conn, league_id, season_key,
+                                              season_partitions(season, league_id, season_key, identity))
+    finally:
+        conn.close()
+    _report_load(db_path, league_id, season_key, result)
+
+def run_all_sqlite(src: Path, db_path: Path):
+    """Every season into one database; SQLite has a single writer, so seasons load in turn."""
+    start = time.perf_counter()
+    identity = load_identity(src)
+    conn = analytics_db.connect(db_path)
+    try:
+        with open(src, "r", encoding="utf-8") as f:
+            for league_id, league_name, season_key, season in iter_seasons(f):
+                doc = SeasonDoc(season, league_name)
+                result = analytics_db.load_season(conn, league_id, season_key,
+                                                  season_partitions(doc, league_id, season_key, identity))
+                _report_load(db_path, league_id, season_key, result)
+    finally:
+        conn.close()
+    print(f"✅ Done in {time.perf_counter() - start:.2f}s")
 
 if __name__ == "__main__":
-    if len(sys.argv) < 3:
-        print("Usage: python etl.py <LEAGUE_ID> <SEASON> [--input fantasy.json] [--output-dir .]")
+    run_everything = "--all" in sys.argv
+    if len(sys.argv) < 3 and not run_everything:
+        print("Usage: python etl.py <LEAGUE_ID> <SEASON> [--input fantasy.json] [--output-dir .] [--incremental]"
+              " [--format jsonl|columnar] [--compress gzip|zstd] [--flush-rows N]")
+        print("       python etl.py --all [--workers N] [--input fantasy.json] [--output-dir .] [--format ...]")
+        print("       add --sqlite analytics.db to load an indexed SQLite database instead of writing files")
+        sys.exit(1)
+
+    if run_everything and "--incremental" in sys.argv and "--sqlite" not in sys.argv:
+        # the manifest is per season; --sqlite already reloads only what changed
+        print("--incremental exports one season (<LEAGUE_ID> <SEASON>); for every season use --all --sqlite analytics.db")
         sys.exit(1)
 
-    league_id = sys.argv[1]
-    season_key = sys.argv[2]
     src = Path("fantasy.json")
     out_dir = Path(".")
 
@@ -202,4 +642,34 @@ if __name__ == "__main__":
     if "--output-dir" in sys.argv:
         out_dir = Path(sys.argv[sys.argv.index("--output-dir") + 1])
 
-    run(league_id, season_key, src, out_dir)
+    fmt = "jsonl"
+    if "--format" in sys.argv:
+        fmt = sys.argv[sys.argv.index("--format") + 1]
+        if fmt not in ("jsonl", "columnar"):
+            print(f"Unknown format: {fmt} (jsonl or columnar)")
+            sys.exit(1)
+    if "--compress" in sys.argv:
+        compression = sys.argv[sys.argv.index("--compress") + 1]
+        if compression not in COMPRESSION_SUFFIX or fmt != "jsonl":
+            print("--compress takes gzip or zstd and only applies to jsonl output")
+            sys.exit(1)
+        if compression == "zstd" and zstandard is None:
+            print("❌ zstd compression needs the 'zstandard' package (pip install zstandard)")
+            sys.exit(1)
+        fmt = f"jsonl.{compression}"
+    if "--flush-rows" in sys.argv:
+        FLUSH_ROWS = int(sys.argv[sys.argv.index("--flush-rows") + 1])
+
+    db_path = Path(sys.argv[sys.argv.index("--sqlite") + 1]) if "--sqlite" in sys.argv else None
+
+    if db_path and run_everything:
+        run_all_sqlite(src, db_path)
+    elif db_path:
+        run_sqlite(sys.argv[1], sys.argv[2], src, db_path)
+    elif run_everything:
+        workers = int(sys.argv[sys.argv.index("--workers") + 1]) if "--workers" in sys.argv else None
+        run_all(src, out_dir, fmt, workers)
+    elif "--incremental" in sys.argv:
+        run_incremental(sys.argv[1], sys.argv[2], src, out_dir, fmt)
+    else:
+        run(sys.argv[1], sys.argv[2], src, out_dir, fmt)
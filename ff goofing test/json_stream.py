@@ -0,0 +1,204 @@
+# Incremental JSON reader: walk objects/arrays key by key and only decode
+# the values you ask for. Everything else is skipped by scanning, so memory
+# stays proportional to the biggest value you actually decode.
+#
+#   with open("fantasy.json", encoding="utf-8") as f:
+#       js = JsonStream(f)
+#       for key in js.items():          # top-level object
+#           if key == "leagues":
+#               for name in js.items():
+#                   league = js.value()  # or js.skip(), js.items(), ...
+#
+# Values you don't consume inside items()/elements() are skipped for you.
+
+import json
+import re
+from json.decoder import scanstring
+
+_SPECIAL = re.compile(r'["{}\[\]]')
+_STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"')
+_WS = " \t\n\r"
+
+class JsonStream:
+    def __init__(self, f, chunk_size=1 << 16):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buf = ""
+        self.i = 0
+        self.base = 0      # absolute char offset of buf[0]
+        self.chunks = []   # (f.tell() cookie, start index in buf) for each chunk in buf
+        self.eof = False
+
+    # ---------- buffer ----------
+    def _fill(self, need=None):
+        """Read at least `need` more chars (one chunk by default). False at EOF."""
+        if self.eof:
+            return False
+        # drop whole chunks we've moved past
+        keep = 0
+        for n, (_, start) in enumerate(self.chunks):
+            if start <= self.i:
+                keep = n
+        if keep:
+            cut = self.chunks[keep][1]
+            self.buf = self.buf[cut:]
+            self.i -= cut
+            self.base += cut
+            self.chunks = [(c, s - cut) for c, s in self.chunks[keep:]]
+
+        got = 0
+        need = need or self.chunk_size
+        while got < need:
+            cookie = self.f.tell()
+            data = self.f.read(self.chunk_size)
+            if not data:
+                self.eof = True
+                break
+            self.chunks.append((cookie, len(self.buf)))
+            self.buf += data
+            got += len(data)
+        return got > 0
+
+    def tell(self):
+        """Opaque position usable with seek()."""
+        for cookie, start in reversed(self.chunks):
+            if start <= self.i:
+                return (cookie, self.i - start, self.base + self.i)
+        return (self.f.tell(), 0, self.base + self.i)
+
+    def offset(self):
+        """Absolute char offset (for progress / comparisons)."""
+        return self.base + self.i
+
+    def seek(self, pos):
+        cookie, off, absolute = pos
+        self.f.seek(cookie)
+        self.buf, self.i, self.chunks, self.eof = "", 0, [], False
+        self.base = absolute - off
+        self._fill(off + 1)
+        self.i = off
+
+    # ---------- tokens ----------
+    def peek(self):
+        while True:
+            while self.i < len(self.buf) and self.buf[self.i] in _WS:
+                self.i += 1
+            if self.i < len(self.buf):
+                return self.buf[self.i]
+            if not self._fill():
+                return ""
+
+    def _expect(self, ch):
+        got = self.peek()
+        if got != ch:
+            raise ValueError(f"Expected '{ch}' at offset {self.offset()}, found {got!r}")
+        self.i += 1
+
+    def _string(self):
+        self._expect('"')
+        while True:
+            try:
+                s, end = scanstring(self.buf, self.i)
+                self.i = end
+                return s
+            except json.JSONDecodeError:
+                self.i -= 1
+                if not self._fill():
+                    raise
+                self.i += 1
+
+    # ---------- values ----------
+    def value(self):
+        """Decode the next value in full."""
+        self.peek()
+        need = self.chunk_size
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.i)
+                # a number could continue in the next chunk
+                if end < len(self.buf) or self.eof:
+                    self.i = end
+                    return obj
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill(need)
+            need *= 2
+
+    def skip(self):
+        """Move past the next value without building it."""
+        if self.peek() not in "{[":
+            self.value()
+            return
+        depth = 0
+        while True:
+            m = _SPECIAL.search(self.buf, self.i)
+            if m is None:
+                self.i = len(self.buf)
+                if not self._fill():
+                    raise ValueError("Unexpected end of JSON")
+                continue
+            if m.group() == '"':
+                sm = _STRING.match(self.buf, m.start())
+                if sm is None:
+                    self.i = m.start()
+                    if not self._fill():
+                        raise ValueError("Unterminated string in JSON")
+                    continue
+                self.i = sm.end()
+                continue
+            self.i = m.end()
+            if m.group() in "{[":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def items(self):
+        """Iterate an object's keys; the stream sits on each key's value."""
+        self._expect("{")
+        if self.peek() == "}":
+            self.i += 1
+            return
+        while True:
+            key = self._string()
+            self._expect(":")
+            start = self.offset()
+            yield key
+            if self.offset() == start:
+                self.skip()
+            sep = self.peek()
+            self.i += 1
+            if sep == "}":
+                return
+            if sep != ",":
+                raise ValueError(f"Expected ',' or '}}' at offset {self.offset() - 1}, found {sep!r}")
+
+    def elements(self):
+        """Iterate an array; the stream sits on each element."""
+        self._expect("[")
+        if self.peek() == "]":
+            self.i += 1
+            return
+        while True:
+            start = self.offset()
+            yield
+            if self.offset() == start:
+                self.skip()
+            sep = self.peek()
+            self.i += 1
+            if sep == "]":
+                return
+            if sep != ",":
+                raise ValueError(f"Expected ',' or ']' at offset {self.offset() - 1}, found {sep!r}")
+
+    def members(self):
+        """Skip through an object, returning {key: position} for later seek()."""
+        positions = {}
+        for key in self.items():
+            self.peek()
+            positions[key] = self.tell()
+            self.skip()
+        return positions
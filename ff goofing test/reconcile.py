@@ -0,0 +1,148 @@
+# Reconcile ESPN lineup fpts with points scored from Raw Stats.
+# Usage: python reconcile.py <LEAGUE_ID> <SEASON> [--input fantasy.json] [--rules ppr|half_ppr|standard|rules.json]
+#                            [--tolerance 0.5] [--fuzzy-suffix] [--report discrepancies.jsonl]
+#
+# One pass per season: the season's Raw Stats are scored once (scoring.py),
+# keyed by (WeekN, player_id); every lineup slot is resolved to a player_id
+# through the Players identity index and looked up in that hash table.
+# Slots whose ESPN fpts differ from the computed points by more than the
+# tolerance are reported, with per-team and per-week rollups.
+
+import json
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+import scoring
+from etl import lineup_rows, open_season_stream
+from json_stream import JsonStream
+import shared  # noqa: F401 (puts names on the path)
+from names import PlayerIndex, norm
+
+TOLERANCE = 0.5
+UNSCORED_POSITIONS = {"D/ST", "DST", "K"}  # Raw Stats has no defense / kicking lines
+
+def load_stats_inputs(src: Path, stats_key: str):
+    """(Raw Stats season node, Players registry) read straight from the master."""
+    raw, registry = {}, {}
+    with open(src, "r", encoding="utf-8") as f:
+        js = JsonStream(f)
+        for top in js.items():
+            if top == "Players":
+                registry = js.value() or {}
+            elif top == "Raw Stats":
+                for section in js.items():
+                    if section == "season by ID":
+                        for key in js.items():
+                            if key == stats_key:
+                                raw = js.value() or {}
+    return raw, registry
+
+def load_rule_set(name_or_path: str) -> dict:
+    if name_or_path in scoring.RULE_SETS:
+        return scoring.RULE_SETS[name_or_path]
+    with open(name_or_path, "r", encoding="utf-8") as f:
+        rules = json.load(f)
+    if not isinstance(rules, dict) or "per" not in rules:
+        raise ValueError(f"{name_or_path} must hold one rule set: {{'per': {{...}}, 'bonus': [...]}}")
+    return rules
+
+def classify(row, computed, tolerance):
+    """'ok' | 'mismatch' | 'no_stats' | 'unresolved' | 'unscored' for one joined slot."""
+    espn = row["points"] if isinstance(row["points"], (int, float)) else 0.0
+    if (row["position"] or "").upper() in UNSCORED_POSITIONS:
+        return "unscored"
+    if not row["player_id"]:
+        return "unresolved"
+    if computed is None:
+        return "ok" if espn == 0 else "no_stats"  # no line + 0 pts = didn't play
+    return "mismatch" if abs(espn - computed) > tolerance else "ok"
+
+def reconcile_season(season, league_id, season_key, raw, index, rules, tolerance=TOLERANCE):
+    """
+    → (slots, rollups). Every lineup slot of the season, each with "computed",
+    "delta" and "status"; rollups = {"team": {...}, "week": {...}}.
+    """
+    table = scoring.StatTable(raw)
+    points = scoring.score(table, rules)
+    id_by_name_norm = {norm(t["name"]): t["team_id"] for t in season.value("teams", [])}
+    meta = {"league_id": league_id, "league_name": season.league_name, "season": season_key}
+
+    slots = []
+    rollups = {"team": defaultdict(lambda: defaultdict(float)), "week": defaultdict(lambda: defaultdict(float))}
+    for week, wk in season.weeks():
+        for g in wk.get("games", []):
+            for row in lineup_rows(meta, week, g, id_by_name_norm, index):
+                at = table.index.get((f"Week{int(week)}", row["player_id"])) if row["player_id"] else None
+                computed = points[at] if at is not None else None
+                status = classify(row, computed, tolerance)
+                espn = float(row["points"]) if isinstance(row["points"], (int, float)) else 0.0
+                row.update(computed=computed, status=status,
+                           delta=round(espn - computed, 2) if computed is not None else None)
+                slots.append(row)
+
+                for kind, key in (("team", row["team_id"] or row["team_name_snapshot"]), ("week", row["week"])):
+                    r = rollups[kind][key]
+                    r["slots"] += 1
+                    r[status] += 1
+                    if computed is not None:
+                        r["joined"] += 1
+                        r["espn"] += espn
+                        r["computed"] += computed
+                        r["abs_delta"] += abs(espn - computed)
+    return slots, rollups
+
+def print_rollup(title, rollup):
+    print(f"  {title:<10} {'slots':>6} {'joined':>7} {'mismatch':>9} {'no stats':>9} {'unresolved':>10} "
+          f"{'ESPN':>9} {'computed':>9} {'|Δ|':>8}")
+    for key in sorted(rollup, key=str):
+        r = rollup[key]
+        print(f"  {str(key)[:10]:<10} {int(r['slots']):6d} {int(r['joined']):7d} {int(r['mismatch']):9d} "
+              f"{int(r['no_stats']):9d} {int(r['unresolved']):10d} "
+              f"{r['espn']:9.2f} {r['computed']:9.2f} {r['abs_delta']:8.2f}")
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1].startswith("--"):
+        print("Usage: python reconcile.py <LEAGUE_ID> <SEASON> [--input fantasy.json] [--rules ppr|rules.json] "
+              "[--tolerance 0.5] [--fuzzy-suffix] [--report discrepancies.jsonl]")
+        sys.exit(1)
+
+    def opt(flag, default=None):
+        return sys.argv[sys.argv.index(flag) + 1] if flag in sys.argv else default
+
+    league_id, season_key = sys.argv[1], sys.argv[2]
+    src = Path(opt("--input", "fantasy.json"))
+    tolerance = float(opt("--tolerance", TOLERANCE))
+    rules = load_rule_set(opt("--rules", "ppr"))
+
+    raw, registry = load_stats_inputs(src, f"S{season_key}")
+    if not raw:
+        sys.exit(f"❌ No Raw Stats for S{season_key} in {src}")
+    index = PlayerIndex(registry, fuzzy="--fuzzy-suffix" in sys.argv)
+
+    with open(src, "r", encoding="utf-8") as f:
+        season = open_season_stream(f, league_id, season_key)
+        slots, rollups = reconcile_season(season, league_id, season_key, raw, index, rules, tolerance)
+
+    counts = defaultdict(int)
+    for s in slots:
+        counts[s["status"]] += 1
+    print(f"🔍 {league_id} {season_key}: {len(slots)} lineup slot(s), tolerance {tolerance} — "
+          + ", ".join(f"{n} {status}" for status, n in sorted(counts.items())))
+    print_rollup("team", rollups["team"])
+    print_rollup("week", rollups["week"])
+
+    flagged = [s for s in slots if s["status"] in ("mismatch", "no_stats", "unresolved")]
+    for s in sorted(flagged, key=lambda s: -abs(s["delta"] or 0))[:10]:
+        print(f"  ⚠️ W{s['week']} {s['team_name_snapshot']}: {s['player_snapshot']} ({s['status']}) "
+              f"ESPN {s['points']} vs computed {s['computed']}")
+
+    if "--report" in sys.argv:
+        path = opt("--report")
+        with open(path, "w", encoding="utf-8") as f:
+            for s in flagged:
+                f.write(json.dumps(s, ensure_ascii=False) + "\n")
+        print(f"📝 Wrote {len(flagged)} discrepanc(ies) → {path}")
+
+if __name__ == "__main__":
+    main()
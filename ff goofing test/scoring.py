@@ -0,0 +1,225 @@
+# Fantasy scoring over Raw Stats.
+#
+# A week (or a whole season) of stat lines becomes one players × stat-columns
+# matrix; each rule set becomes one column of a weight matrix, so
+#
+#   points = stats @ weights + bonus_flags @ bonus_weights     (players × rule sets)
+#
+# scores every player under every rule set in one matrix product. NumPy is
+# used when installed; otherwise the same products run in plain Python.
+#
+# A rule set is {"per": {stat: points per unit}, "bonus": [[stat, threshold, points], ...]}
+# e.g. a 100-yard rushing bonus is ["rush_yards", 100, 3].
+#
+# Usage:
+#   python scoring.py <fantasy.json> <S2025> [--week Week1] [--rules rules.json] [--top N] [--candidates N]
+
+import json
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:  # optional
+    np = None
+
+# stat_parser field names; rows missing a column score 0 for it
+STAT_COLUMNS = (
+    "pass_yards", "pass_td", "interceptions",
+    "rush_yards", "rush_td",
+    "receptions", "rec_yards", "rec_td",
+    "fumbles_lost", "two_pt",
+)
+CATEGORIES = ("Passing", "Rushing", "Receiving")
+
+STANDARD = {
+    "per": {"pass_yards": 0.04, "pass_td": 4, "interceptions": -2,
+            "rush_yards": 0.1, "rush_td": 6,
+            "rec_yards": 0.1, "rec_td": 6,
+            "fumbles_lost": -2, "two_pt": 2},
+    "bonus": [],
+}
+RULE_SETS = {
+    "standard": STANDARD,
+    "half_ppr": {"per": {**STANDARD["per"], "receptions": 0.5}, "bonus": []},
+    "ppr": {"per": {**STANDARD["per"], "receptions": 1}, "bonus": []},
+}
+
+# --------------------------------------
+# Stat table
+# --------------------------------------
+def week_keys(raw_season):
+    return sorted((k for k in raw_season if k.startswith("Week")), key=lambda k: int(k[len("Week"):]))
+
+class StatTable:
+    """
+    One row per (week, player_id), one column per STAT_COLUMNS entry. A
+    player's passing/rushing/receiving lines for the same week share a row.
+    """
+    def __init__(self, raw_season, weeks=None):
+        self.columns = STAT_COLUMNS
+        self.rows = []   # (week, player_id)
+        self.info = []   # {"name", "position", "team"} per row
+        values = []
+        col_at = {c: i for i, c in enumerate(self.columns)}
+        where = {}
+
+        for week in weeks or week_keys(raw_season):
+            for category in CATEGORIES:
+                for pid, line in (raw_season.get(week, {}).get(category) or {}).items():
+                    key = (week, pid)
+                    if key not in where:
+                        where[key] = len(self.rows)
+                        self.rows.append(key)
+                        self.info.append({k: line.get(k) for k in ("name", "position", "team")})
+                        values.append([0.0] * len(self.columns))
+                    row = values[where[key]]
+                    for stat, v in line.items():
+                        i = col_at.get(stat)
+                        if i is not None and isinstance(v, (int, float)):
+                            row[i] = float(v)  # same stat in two categories: last one wins
+
+        self.index = where
+        self.values = np.array(values, dtype=np.float64).reshape(len(values), len(self.columns)) if np else values
+
+    def __len__(self):
+        return len(self.rows)
+
+# --------------------------------------
+# Rule sets
+# --------------------------------------
+def compile_rules(rule_sets):
+    """
+    {name: rules} → (names, weights[stat][k], bonus features [(col, threshold)],
+    bonus_weights[feature][k]).
+    """
+    names = list(rule_sets)
+    col_at = {c: i for i, c in enumerate(STAT_COLUMNS)}
+    weights = [[0.0] * len(names) for _ in STAT_COLUMNS]
+    features, bonus_weights = [], []
+
+    for k, name in enumerate(names):
+        rules = rule_sets[name]
+        for stat, pts in (rules.get("per") or {}).items():
+            if stat not in col_at:
+                raise ValueError(f"Rule set '{name}': unknown stat '{stat}' (known: {', '.join(STAT_COLUMNS)})")
+            weights[col_at[stat]][k] = float(pts)
+        for stat, threshold, pts in rules.get("bonus") or []:
+            if stat not in col_at:
+                raise ValueError(f"Rule set '{name}': unknown bonus stat '{stat}'")
+            feature = (col_at[stat], float(threshold))
+            if feature not in features:
+                features.append(feature)
+                bonus_weights.append([0.0] * len(names))
+            bonus_weights[features.index(feature)][k] += float(pts)
+    return names, weights, features, bonus_weights
+
+def load_rules(path):
+    with open(path, "r", encoding="utf-8") as f:
+        rules = json.load(f)
+    if not isinstance(rules, dict) or not all(isinstance(r, dict) for r in rules.values()):
+        raise ValueError(f"{path} must map rule-set names to {{'per': {{...}}, 'bonus': [...]}}")
+    return rules
+
+# --------------------------------------
+# Scoring
+# --------------------------------------
+def score_many(table, rule_sets):
+    """Points for every row under every rule set → (names, rows × rule sets)."""
+    names, weights, features, bonus_weights = compile_rules(rule_sets)
+    if np is not None:
+        X = table.values
+        points = X @ np.array(weights)
+        if features:
+            cols = np.array([c for c, _ in features])
+            thresholds = np.array([t for _, t in features])
+            points += (X[:, cols] >= thresholds).astype(np.float64) @ np.array(bonus_weights)
+        return names, np.round(points, 2)
+
+    # same products column by column: one pass over a stat column per nonzero weight
+    columns = list(zip(*table.values)) or [()] * len(STAT_COLUMNS)
+    per_rule = []
+    for k in range(len(names)):
+        acc = [0.0] * len(table)
+        for col, w in zip(columns, weights):
+            if w[k]:
+                wk = w[k]
+                acc = [a + x * wk for a, x in zip(acc, col)]
+        for (c, threshold), w in zip(features, bonus_weights):
+            if w[k]:
+                wk = w[k]
+                acc = [a + wk if x >= threshold else a for a, x in zip(acc, columns[c])]
+        per_rule.append([round(a, 2) for a in acc])
+    return names, [list(row) for row in zip(*per_rule)]
+
+def score(table, rules):
+    """Points for every row under one rule set (a list, row order of the table)."""
+    _, points = score_many(table, {"rules": rules})
+    return [float(row[0]) for row in points]
+
+def candidate_rule_sets(n, base=None):
+    """n variations on a base rule set (reception value, TD value, bonuses) for what-if runs."""
+    base = base or RULE_SETS["ppr"]
+    out = {}
+    for i in range(n):
+        per = dict(base["per"])
+        per["receptions"] = round(0.25 * (i % 5), 2)
+        per["pass_td"] = 4 + 2 * (i % 2)
+        bonus = list(base.get("bonus") or [])
+        if i % 3 == 0:
+            bonus += [["rush_yards", 100, 3], ["rec_yards", 100, 3], ["pass_yards", 300, 3]]
+        out[f"cand{i + 1:02d}"] = {"per": per, "bonus": bonus}
+    return out
+
+# --------------------------------------
+# CLI
+# --------------------------------------
+def main():
+    args = [a for i, a in enumerate(sys.argv[1:], 1)
+            if not a.startswith("--") and not sys.argv[i - 1].startswith("--")]
+    if len(args) < 2:
+        print("Usage: python scoring.py <fantasy.json> <S2025> [--week Week1] [--rules rules.json] "
+              "[--top N] [--candidates N]")
+        sys.exit(1)
+
+    def opt(flag, default=None):
+        return sys.argv[sys.argv.index(flag) + 1] if flag in sys.argv else default
+
+    path, season = args[0], args[1]
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    raw_season = data.get("Raw Stats", {}).get("season by ID", {}).get(season)
+    if not raw_season:
+        sys.exit(f"❌ No Raw Stats for {season} in {path}")
+
+    week = opt("--week")
+    rule_sets = load_rules(opt("--rules")) if opt("--rules") else dict(RULE_SETS)
+    rule_sets.update(candidate_rule_sets(int(opt("--candidates", 0))))
+    top = int(opt("--top", 10))
+
+    start = time.perf_counter()
+    table = StatTable(raw_season, [week] if week else None)
+    loaded = time.perf_counter()
+    if not len(table):
+        sys.exit(f"❌ No stat lines for {season}{' ' + week if week else ''}")
+    names, points = score_many(table, rule_sets)
+    scored = time.perf_counter()
+
+    print(f"🧮 {len(table)} stat lines × {len(names)} rule set(s) "
+          f"[{'numpy' if np is not None else 'pure python'}]: "
+          f"load {(loaded - start) * 1000:.1f} ms, score {(scored - loaded) * 1000:.2f} ms")
+
+    # season totals per player under the first rule set, top N
+    totals, player_names = {}, {}
+    for (wk, pid), info, row in zip(table.rows, table.info, points):
+        player_names.setdefault(pid, info.get("name") or pid)
+        t = totals.setdefault(pid, [0.0] * len(names))
+        for k in range(len(names)):
+            t[k] += float(row[k])
+    shown = names[:6]
+    print(f"  {'player':<24} " + " ".join(f"{n[:10]:>10}" for n in shown))
+    for pid, t in sorted(totals.items(), key=lambda kv: -kv[1][0])[:top]:
+        print(f"  {player_names[pid][:24]:<24} " + " ".join(f"{v:10.2f}" for v in t[:len(shown)]))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+# Puts "fantasy football goofing/" on sys.path so the scripts here import the
+# one copy of its shared modules (names, storage) instead of keeping their own:
+#
+#   import shared  # noqa: F401
+#   from names import norm
+
+import os
+import sys
+
+SHARED_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                          "fantasy football goofing")
+# appended, so a same-named script in this folder still wins
+if SHARED_DIR not in sys.path:
+    sys.path.append(SHARED_DIR)
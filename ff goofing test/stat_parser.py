@@ -1,22 +1,63 @@
 import csv
 import json
 import argparse
+import glob
+import os
 import re
-from collections import OrderedDict
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import shared  # noqa: F401 (puts names and storage on the path)
+import storage
+from names import PlayerIndex, base_player_id, lookup_summary
 
 # ---------- helpers ----------
 
 seen_ids = {}
-
-def make_player_id(name, position):
-    """Generate a stable player_id from name + position (season mode only)."""
-    parts = name.split()
-    if len(parts) == 0:
-        base = "unknown"
-    else:
-        base = (parts[0] + parts[-1]).lower()
-    base = re.sub(r'[^a-z0-9]', '', base)
-    pid = f"{base}_{position.lower()}"
+INTERACTIVE = True  # batch workers have no stdin; run_batch requires a policy instead
+
+def ask(question):
+    if not INTERACTIVE:
+        return "n"  # nobody to ask: abort rather than guess
+    return input(question).strip().lower()
+
+# ---------- conflict policies ----------
+# None = ask on the terminal (the old behaviour); set from --on-* flags.
+POLICY_CHOICES = {
+    "on_duplicate_id": ("suffix", "abort", "use-site-key"),
+    "on_unknown_player": ("skip", "create", "abort"),
+    "on_existing": ("overwrite", "merge", "skip"),
+}
+policy = {kind: None for kind in POLICY_CHOICES}
+decisions = []     # every conflict + what was done, for the --report JSONL
+report_context = {}  # file/season/week of the file being parsed
+created = []       # players registered by --on-unknown-player=create in this parse
+# batch runs can't prompt, so these must come from --on-* flags
+BATCH_POLICIES = ("on_duplicate_id", "on_unknown_player")
+
+def decide(kind, question, on_yes, **info):
+    """Action for a conflict: the policy if one is set, otherwise ask (y → on_yes)."""
+    action, how = policy[kind], "policy"
+    if action is None:
+        action = on_yes if ask(question) == "y" else "abort"
+        how = "prompt" if INTERACTIVE else "default"
+    record(kind, action, how, **info)
+    return action
+
+def record(kind, action, how, **info):
+    decisions.append({"ts": time.strftime("%Y-%m-%dT%H:%M:%S"), "kind": kind,
+                      "action": action, "decided_by": how, **report_context, **info})
+
+def write_report(path, entries):
+    with open(path, "w", encoding="utf-8") as f:
+        for e in entries:
+            f.write(json.dumps(e, ensure_ascii=False) + "\n")
+    print(f"📝 Wrote {len(entries)} decision(s) → {path}")
+
+def make_player_id(name, position, key=""):
+    """Generate a stable player_id from name + position (key: site key for use-site-key)."""
+    pid = base_player_id(name, position)
 
     if pid in seen_ids:
         other_name = seen_ids[pid]
@@ -24,16 +65,22 @@ def make_player_id(name, position):
             print(f"⚠️ Duplicate player_id detected: {pid}")
             print(f" - Existing: {other_name}")
             print(f" - New:      {name}")
-            confirm = input("Proceed and append suffix to resolve? [y/N]: ").strip().lower()
-            if confirm != "y":
+            action = decide("on_duplicate_id", "Proceed and append suffix to resolve? [y/N]: ", "suffix",
+                            player_id=pid, name=name, existing=other_name, site_key=key or None)
+            if action == "abort":
                 print("❌ Aborted due to duplicate ID.")
                 raise SystemExit(1)
-            counter = 2
-            new_pid = f"{pid}{counter}"
-            while new_pid in seen_ids:
-                counter += 1
+            keyed = f"{re.sub(r'[^a-z0-9]', '', key.lower())}_{position.lower()}" if key else ""
+            if action == "use-site-key" and keyed and keyed not in seen_ids:
+                pid = keyed
+            else:
+                counter = 2
                 new_pid = f"{pid}{counter}"
-            pid = new_pid
+                while new_pid in seen_ids:
+                    counter += 1
+                    new_pid = f"{pid}{counter}"
+                pid = new_pid
+            decisions[-1]["assigned"] = pid
             print(f"✅ Resolved duplicate, assigned ID: {pid}")
     seen_ids[pid] = name
     return pid
@@ -50,6 +97,16 @@ def safe_float(val, default=0.0):
     except:
         return default
 
+# Sports-Reference's stable player key ("DarnSa00"); older exports label it -9999
+SITE_KEY_COLUMNS = ("Player-additional", "-9999")
+
+def site_key(row):
+    for col in SITE_KEY_COLUMNS:
+        key = (row.get(col) or "").strip()
+        if key:
+            return key
+    return ""
+
 expected_pos = {
     "passing": ["QB"],
     "rushing": ["RB", "FB"],
@@ -61,6 +118,7 @@ expected_pos = {
 
 # ---------- SEASON PARSING ----------
 def parse_season_csv(file_path, stat_type, season):
+    report_context.update(file=file_path, stat_type=stat_type, season=season, week=None)
     with open(file_path, "r", encoding="utf-8", newline="") as f:
         lines = f.readlines()
 
@@ -85,7 +143,7 @@ def parse_season_csv(file_path, stat_type, season):
             continue
 
         team = (row.get("Team") or "").strip()
-        pid = make_player_id(name, pos)
+        pid = make_player_id(name, pos, site_key(row))
 
         player = {
             "player_id": pid,
@@ -98,6 +156,8 @@ def parse_season_csv(file_path, stat_type, season):
             "season": season,
             "week": None,
         }
+        if site_key(row):
+            player["site_key"] = site_key(row)
 
         if stat_type == "passing":
             record = row.get("QBrec") or row.get("Record") or "0-0-0"
@@ -133,7 +193,16 @@ def parse_season_csv(file_path, stat_type, season):
     return players
 
 # ---------- WEEKLY PARSING ----------
-def parse_weekly_csv(file_path, stat_type, players_registry, season, week):
+def parse_weekly_csv(file_path, stat_type, players_registry, season, week, index=None):
+    """index: a PlayerIndex over players_registry (built here if not given)."""
+    if index is None:
+        index = PlayerIndex(players_registry)
+    hits_before, misses_before = Counter(index.hits), index.misses
+    report_context.update(file=file_path, stat_type=stat_type, season=season, week=week)
+    if policy["on_unknown_player"] == "create":
+        # new IDs must not collide with ones already in the registry
+        for reg_pid, info in players_registry.items():
+            seen_ids.setdefault(reg_pid, info.get("name", ""))
     with open(file_path, "r", encoding="utf-8", newline="") as f:
         lines = f.readlines()
 
@@ -157,18 +226,25 @@ def parse_weekly_csv(file_path, stat_type, players_registry, season, week):
             continue
 
         team = (row.get("Team") or "").strip()
-        pid = None
-        for reg_pid, info in players_registry.items():
-            if info["name"] == name:
-                pid = reg_pid
-                break
+        pid = index.resolve(name, site_key(row))
         if not pid:
             print(f"⚠️ No player_id found in Players registry for: {name}")
-            confirm = input("Proceed by skipping this player? [y/N]: ").strip().lower()
-            if confirm != "y":
+            action = decide("on_unknown_player", "Proceed by skipping this player? [y/N]: ", "skip",
+                            name=name, team=team, site_key=site_key(row) or None)
+            if action == "abort":
                 print("❌ Aborted due to missing player_id.")
                 raise SystemExit(1)
-            continue
+            if action == "skip":
+                continue
+            pos = (row.get("Pos.") or row.get("Pos") or expected_pos[stat_type][0]).strip().upper()
+            pid = make_player_id(name, pos, site_key(row))
+            players_registry[pid] = {"name": name, "position": pos, "team": team, "age": 0}
+            if site_key(row):
+                players_registry[pid]["site_key"] = site_key(row)
+            index.add(pid, players_registry[pid])
+            decisions[-1]["player_id"] = pid
+            created.append({"player_id": pid, "decision": len(decisions) - 1, **players_registry[pid]})
+            print(f"➕ Registered new player {name} as {pid}")
 
         pos = players_registry[pid]["position"]
 
@@ -214,86 +290,393 @@ def parse_weekly_csv(file_path, stat_type, players_registry, season, week):
 
         players.append(player)
 
+    print(lookup_summary(index.hits - hits_before, index.misses - misses_before))
     return players
 
-# ---------- MAIN ----------
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Parse stat CSV into fantasy.json")
-    parser.add_argument("--season", required=True, help="Season year")
-    parser.add_argument("--week", help="Week number (for weekly stats)")
-    parser.add_argument("--date", help="Week date in MM/DD/YYYY format")
-    parser.add_argument("--file", required=True, help="CSV stat file to parse")
-    parser.add_argument("stat_type", choices=expected_pos.keys(), help="Stat category")
-    args = parser.parse_args()
+# ---------- MERGE / IO ----------
+touched = set()       # (season, section) Raw Stats nodes merged since load_fantasy
+loaded_players = {}   # Players registry as loaded, to send only what changed
+
+def load_fantasy(path="fantasy.json"):
+    """(store, document) for fantasy.json, a .db or a shard directory."""
+    store = storage.open_store(path)
+    fantasy_data = store.load()
+    touched.clear()
+    loaded_players.clear()
+    loaded_players.update((pid, dict(p)) for pid, p in fantasy_data.get("Players", {}).items())
+    return store, fantasy_data
+
+def save_fantasy(store, fantasy_data):
+    """
+    Commit the merged Raw Stats sections and changed Players as change records,
+    so games/transactions another script committed since load_fantasy are kept.
+    """
+    order_raw_stats(fantasy_data)
+    raw = fantasy_data.get("Raw Stats", {}).get("season by ID", {})
+    changes = [{"op": "set_raw_stats", "season_key": season,
+                "sections": {sec: raw[season][sec] for s, sec in sorted(touched) if s == season}}
+               for season in sorted({s for s, _ in touched})]
+    players = {pid: p for pid, p in fantasy_data.get("Players", {}).items() if loaded_players.get(pid) != p}
+    if players:
+        changes.append({"op": "set_players", "players": players})
+    if changes:
+        store.commit(fantasy_data, changes)
+
+def season_node(fantasy_data, season):
+    return fantasy_data.setdefault("Raw Stats", {}).setdefault("season by ID", {}).setdefault(season, {})
+
+def merge_category(node, key, parsed_stats, mode="overwrite"):
+    """overwrite replaces the category; merge keeps existing players not in this file."""
+    rows = {p["player_id"]: p for p in parsed_stats}
+    if mode == "merge" and isinstance(node.get(key), dict):
+        node[key].update(rows)
+    else:
+        node[key] = rows
 
-    season = f"S{args.season}"
+def merge_weekly(fantasy_data, season, week, stat_type, parsed_stats, mode="overwrite"):
+    week_path = season_node(fantasy_data, season).setdefault(week, {})
+    week_path["week_id"] = week
+    touched.add((season, week))
+    merge_category(week_path, stat_type.capitalize(), parsed_stats, mode)
+
+    # players created by --on-unknown-player=create
+    players_registry = fantasy_data.setdefault("Players", {})
+    for p in parsed_stats:
+        if p["player_id"] not in players_registry:
+            players_registry[p["player_id"]] = {"name": p["name"], "position": p["position"],
+                                                "team": p["team"], "age": p["age"]}
+
+def merge_season(fantasy_data, season, stat_type, parsed_stats, mode="overwrite"):
+    players_registry = fantasy_data.setdefault("Players", {})
+    for p in parsed_stats:
+        pid = p["player_id"]
+        if pid not in players_registry:
+            players_registry[pid] = {
+                "name": p["name"],
+                "position": p["position"],
+                "team": p["team"],
+                "age": p["age"],
+            }
+        else:
+            players_registry[pid]["team"] = p["team"]
+            players_registry[pid]["age"] = p["age"]
+        if p.get("site_key"):
+            players_registry[pid]["site_key"] = p["site_key"]
+
+    totals_path = season_node(fantasy_data, season).setdefault("Totals", {})
+    touched.add((season, "Totals"))
+    totals_path["season_id"] = season
+    totals_path["stat_type"] = stat_type
+    merge_category(totals_path, stat_type.capitalize(), parsed_stats, mode)
+
+def existing_category(fantasy_data, season, week, stat_type):
+    """True if this season/week (or Totals when week is None) already has the category."""
+    node = fantasy_data.get("Raw Stats", {}).get("season by ID", {}).get(season, {})
+    return stat_type.capitalize() in node.get(week or "Totals", {})
+
+def order_raw_stats(fantasy_data):
+    """Enforce ordering: Weeks first, then Totals."""
+    for season_id, season_data in fantasy_data.get("Raw Stats", {}).get("season by ID", {}).items():
+        ordered = {}  # plain dict: insertion-ordered, and the snapshot cache can marshal it
+        for k in sorted([wk for wk in season_data.keys() if wk.startswith("Week")], key=lambda x: int(x.replace("Week", ""))):
+            ordered[k] = season_data[k]
+        if "Totals" in season_data:
+            ordered["Totals"] = season_data["Totals"]
+        fantasy_data["Raw Stats"]["season by ID"][season_id] = ordered
+
+# ---------- BATCH ----------
+# 'week3', 'wk_03', 'w-3' at the start of a word: not the 'w' in 'new2' or 'draw3'
+WEEK_IN_NAME = re.compile(r"(?<![a-z])(?:week|wk|w)[ _-]?0*(\d{1,2})(?!\d)", re.I)
+
+def infer_job(path, season):
+    """Stat type + week from a filename like 'passing_week3.csv' (no week → season totals)."""
+    name = os.path.basename(path).lower()
+    stat_type = next((t for t in expected_pos if t in name), None)
+    if stat_type is None:
+        raise ValueError(f"Can't infer stat type from filename: {path}")
+    weeks = {int(w) for w in WEEK_IN_NAME.findall(name)}
+    if len(weeks) > 1:
+        raise ValueError(f"Ambiguous week in filename (weeks {sorted(weeks)}): {path} - list it in a --batch manifest.json")
+    return {"file": path, "stat_type": stat_type, "season": season,
+            "week": weeks.pop() if weeks else None}
+
+def load_manifest(path, season):
+    """
+    JSON list of {"file", "stat_type", "week"?, "season"?}; files are relative
+    to the manifest. Missing week → season totals.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+    base = os.path.dirname(os.path.abspath(path))
+    jobs = []
+    for e in entries:
+        stat_type = e["stat_type"].lower()
+        if stat_type not in expected_pos:
+            raise ValueError(f"Unknown stat type '{e['stat_type']}' in manifest")
+        jobs.append({"file": os.path.join(base, e["file"]), "stat_type": stat_type,
+                     "season": f"S{e['season']}" if e.get("season") else season,
+                     "week": int(e["week"]) if e.get("week") not in (None, "") else None})
+    return jobs
+
+_worker_registry = {}
+_worker_index = None
+_worker_fuzzy = False
+
+def _init_worker(registry, fuzzy=False, policies=None):
+    global INTERACTIVE, _worker_registry, _worker_index, _worker_fuzzy
+    INTERACTIVE = False
+    policy.update(policies or {})
+    _worker_registry, _worker_fuzzy = registry, fuzzy
+    _worker_index = PlayerIndex(registry, fuzzy=fuzzy)
+
+def _forget_created():
+    """Drop a job's provisional players so the next job in this worker can't resolve to them."""
+    global _worker_index
+    if created:
+        for p in created:
+            _worker_registry.pop(p["player_id"], None)
+        _worker_index = PlayerIndex(_worker_registry, fuzzy=_worker_fuzzy)
+
+def _parse_job(job):
+    """
+    Parse one file → (rows, error, decisions, created). Season files get their
+    own seen_ids, same as a single run. Players this job created carry
+    provisional IDs; the parent assigns the real ones (assign_created).
+    """
+    seen_ids.clear()
+    del decisions[:]
+    del created[:]
+    try:
+        if job["week"] is None:
+            rows = parse_season_csv(job["file"], job["stat_type"], job["season"])
+        else:
+            rows = parse_weekly_csv(job["file"], job["stat_type"], _worker_registry,
+                                    job["season"], f"Week{job['week']}", index=_worker_index)
+        return rows, None, list(decisions), list(created)
+    except (Exception, SystemExit) as e:
+        return None, str(e) or type(e).__name__, list(decisions), list(created)
+    finally:
+        _forget_created()
+
+def parse_jobs(jobs, registry, workers=None, fuzzy=False):
+    if workers == 1 or len(jobs) < 2:
+        # a copy, like a worker's: new players are registered by the parent
+        _init_worker(dict(registry), fuzzy, dict(policy))
+        return [_parse_job(j) for j in jobs]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(registry, fuzzy, dict(policy))) as pool:
+        return list(pool.map(_parse_job, jobs))
+
+def print_summary(results):
+    print("\n📊 Batch summary")
+    print(f"  {'file':<32} {'category':<10} {'week':<7} {'rows':>6}")
+    for job, rows, err in results:
+        week = f"W{job['week']}" if job["week"] is not None else "Totals"
+        count = len(rows) if rows is not None else f"❌ {err}"
+        print(f"  {os.path.basename(job['file']):<32} {job['stat_type']:<10} {week:<7} {count:>6}")
+
+def job_label(job):
+    return f"Week{job['week']}" if job["week"] is not None else "Totals"
+
+def assign_created(job, rows, made, new_players, registry, index):
+    """
+    Give a job's created players their final IDs against the shared registry,
+    in job order: a player an earlier file already created is reused, anyone
+    else gets a fresh ID (collisions go through --on-duplicate-id). Rewrites
+    the rows and the job's decision records to match.
+    """
+    if not new_players:
+        return
+    report_context.update(file=job["file"], stat_type=job["stat_type"], season=job["season"],
+                          week=f"Week{job['week']}")
+    seen_ids.clear()
+    for reg_pid, info in registry.items():
+        seen_ids[reg_pid] = info.get("name", "")
+    final = {}
+    for p in new_players:
+        info = {k: v for k, v in p.items() if k not in ("player_id", "decision")}
+        pid = index.resolve(info["name"], info.get("site_key", ""))
+        if not pid:
+            pid = make_player_id(info["name"], info["position"], info.get("site_key", ""))
+            registry[pid] = info
+            index.add(pid, info)
+            print(f"➕ Registered new player {info['name']} as {pid}")
+        final[p["player_id"]] = pid
+        made[p["decision"]]["player_id"] = pid
+    for row in rows:
+        row["player_id"] = final.get(row["player_id"], row["player_id"])
+
+def print_decisions(entries):
+    """One line per (conflict, action) so batch runs show what was decided for them."""
+    if not entries:
+        return
+    counts = Counter((e["kind"], e["action"], e["decided_by"]) for e in entries)
+    print("\n🧾 Conflict decisions")
+    for (kind, action, how), n in sorted(counts.items()):
+        print(f"  {kind:<18} {action:<13} {n:>5}  ({how})")
+
+def run_batch(jobs, workers=None, assume_yes=False, path="fantasy.json", fuzzy=False, report=None):
+    """
+    Parse every job and write fantasy.json once. Season totals go first
+    (they register players), then weekly files resolve against that registry.
+    Any failed file aborts the batch before anything is written.
+    """
+    missing = [k for k in BATCH_POLICIES if policy[k] is None]
+    if missing:
+        print("❌ --batch can't prompt; choose " + " and ".join(
+            f"--{k.replace('_', '-')}={'|'.join(POLICY_CHOICES[k])}" for k in missing))
+        raise SystemExit(1)
+    store, fantasy_data = load_fantasy(path)
+
+    # Existing stats: --on-existing decides per file, otherwise one prompt up front (or --yes)
+    clashes = [j for j in jobs if existing_category(fantasy_data, j["season"], j["week"] and f"Week{j['week']}", j["stat_type"])]
+    if clashes and policy["on_existing"] is None and not assume_yes:
+        print(f"⚠️ {len(clashes)} file(s) would overwrite existing stats:")
+        for j in clashes:
+            print(f"  - {j['season']} {job_label(j)} {j['stat_type']}")
+        if input("Overwrite with new data? [y/N]: ").strip().lower() != "y":
+            print("❌ Aborted.")
+            raise SystemExit(1)
+    for j in clashes:
+        j["mode"] = policy["on_existing"] or "overwrite"
+        how = "policy" if policy["on_existing"] else ("flag" if assume_yes else "prompt")
+        report_context.update(file=j["file"], stat_type=j["stat_type"], season=j["season"],
+                              week=j["week"] and f"Week{j['week']}")
+        record("on_existing", j["mode"], how)
+        if j["mode"] == "skip":
+            print(f"⏭️ Skipping {os.path.basename(j['file'])}: {j['season']} {job_label(j)} {j['stat_type']} already exists.")
+    jobs = [j for j in jobs if j.get("mode") != "skip"]
+    report_entries = list(decisions)
+
+    season_jobs = [j for j in jobs if j["week"] is None]
+    weekly_jobs = [j for j in jobs if j["week"] is not None]
+    results = []
+
+    for job, (rows, err, made, _) in zip(season_jobs, parse_jobs(season_jobs, {}, workers)):
+        results.append((job, rows, err))
+        report_entries.extend(made)
+        if rows is not None:
+            merge_season(fantasy_data, job["season"], job["stat_type"], rows, job.get("mode", "overwrite"))
+
+    registry = fantasy_data.setdefault("Players", {})
+    parsed = parse_jobs(weekly_jobs, registry, workers, fuzzy)
+    del decisions[:]  # each job's are in its results; collect what assign_created adds
+    index = PlayerIndex(registry, fuzzy=fuzzy)
+    for job, (rows, err, made, new_players) in zip(weekly_jobs, parsed):
+        results.append((job, rows, err))
+        if rows is not None:
+            assign_created(job, rows, made, new_players, registry, index)
+        report_entries.extend(made)
+        report_entries.extend(decisions)
+        del decisions[:]
+        if rows is not None:
+            merge_weekly(fantasy_data, job["season"], f"Week{job['week']}", job["stat_type"], rows,
+                         job.get("mode", "overwrite"))
+
+    print_summary(results)
+    print_decisions(report_entries)
+    if report:
+        write_report(report, report_entries)
+    failed = [r for r in results if r[1] is None]
+    if failed:
+        print(f"❌ {len(failed)} file(s) failed. Nothing written.")
+        raise SystemExit(1)
+
+    save_fantasy(store, fantasy_data)
+    print(f"✅ Wrote {sum(len(r[1]) for r in results)} rows from {len(results)} file(s) to {path}")
+
+def run_single(args, season):
     file_path = args.file
     stat_type = args.stat_type.lower()
 
-    with open("fantasy.json", "r", encoding="utf-8") as f:
-        fantasy_data = json.load(f)
+    store, fantasy_data = load_fantasy(args.input)
 
     players_registry = fantasy_data.setdefault("Players", {})
 
     if args.week:
         week = f"Week{args.week}"
-        parsed_stats = parse_weekly_csv(file_path, stat_type, players_registry, season, week)
-        season_path = fantasy_data.setdefault("Raw Stats", {}).setdefault("season by ID", {}).setdefault(season, OrderedDict())
-        week_path = season_path.setdefault(week, {})
-        week_path["week_id"] = week
+        index = PlayerIndex(players_registry, fuzzy=args.fuzzy_suffix)
+        parsed_stats = parse_weekly_csv(file_path, stat_type, players_registry, season, week, index=index)
         category_key = stat_type.capitalize()
 
-        
-        if category_key in week_path:
+        mode = "overwrite"
+        if existing_category(fantasy_data, season, week, stat_type):
             print(f"⚠️ {category_key} stats already exist for {season} {week}.")
-            confirm = input("Overwrite with new data? [y/N]: ").strip().lower()
-            if confirm != "y":
+            mode = decide("on_existing", "Overwrite with new data? [y/N]: ", "overwrite")
+            if mode == "abort":
                 print("❌ Aborted.")
                 raise SystemExit(1)
+            if mode == "skip":
+                print(f"⏭️ Left existing {category_key} stats for {season} {week} untouched.")
+                return
 
-        week_path[category_key] = {p["player_id"]: p for p in parsed_stats}
+        merge_weekly(fantasy_data, season, week, stat_type, parsed_stats, mode)
         print(f"✅ Updated {season} {week} with {len(parsed_stats)} {stat_type} players.")
 
     else:
         parsed_stats = parse_season_csv(file_path, stat_type, season)
-        for p in parsed_stats:
-            pid = p["player_id"]
-            if pid not in players_registry:
-                players_registry[pid] = {
-                    "name": p["name"],
-                    "position": p["position"],
-                    "team": p["team"],
-                    "age": p["age"],
-                }
-            else:
-                players_registry[pid]["team"] = p["team"]
-                players_registry[pid]["age"] = p["age"]
-
-        season_path = fantasy_data.setdefault("Raw Stats", {}).setdefault("season by ID", {}).setdefault(season, OrderedDict())
         category_key = stat_type.capitalize()
-        totals_path = season_path.setdefault("Totals", {})
-        totals_path["season_id"] = season
-        totals_path["stat_type"] = stat_type
 
         # ⚠️ Warn on duplicate overwrite (season totals)
-        if category_key in totals_path:
+        mode = "overwrite"
+        if existing_category(fantasy_data, season, None, stat_type):
             print(f"⚠️ {category_key} Totals already exist for {season}.")
-            confirm = input("Overwrite with new data? [y/N]: ").strip().lower()
-            if confirm != "y":
+            mode = decide("on_existing", "Overwrite with new data? [y/N]: ", "overwrite")
+            if mode == "abort":
                 print("❌ Aborted to avoid overwrite.")
                 raise SystemExit(1)
+            if mode == "skip":
+                print(f"⏭️ Left existing {category_key} Totals for {season} untouched.")
+                return
 
-        totals_path[category_key] = {p["player_id"]: p for p in parsed_stats}
+        merge_season(fantasy_data, season, stat_type, parsed_stats, mode)
         print(f"✅ Updated {season} Totals with {len(parsed_stats)} {stat_type} players.")
 
-    # enforce ordering: Weeks first, then Totals
-    for season_id, season_data in fantasy_data.get("Raw Stats", {}).get("season by ID", {}).items():
-        ordered = OrderedDict()
-        for k in sorted([wk for wk in season_data.keys() if wk.startswith("Week")], key=lambda x: int(x.replace("Week", ""))):
-            ordered[k] = season_data[k]
-        if "Totals" in season_data:
-            ordered["Totals"] = season_data["Totals"]
-        fantasy_data["Raw Stats"]["season by ID"][season_id] = ordered
+    save_fantasy(store, fantasy_data)
+
+# ---------- MAIN ----------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parse stat CSV into fantasy.json")
+    parser.add_argument("--season", required=True, help="Season year")
+    parser.add_argument("--week", help="Week number (for weekly stats)")
+    parser.add_argument("--date", help="Week date in MM/DD/YYYY format")
+    parser.add_argument("--file", help="CSV stat file to parse")
+    parser.add_argument("--input", default="fantasy.json", help="Master file: fantasy.json, a .db or a shard directory")
+    parser.add_argument("--batch", help="Manifest (.json) or glob of CSVs; stat type/week inferred from filenames")
+    parser.add_argument("--workers", type=int, help="Parallel parsers for --batch (default: CPU count)")
+    parser.add_argument("--yes", action="store_true", help="With --batch: overwrite existing stats without asking")
+    parser.add_argument("--fuzzy-suffix", action="store_true", help="Match names ignoring Jr./Sr./II/III suffixes as a last resort")
+    for kind, choices in POLICY_CHOICES.items():
+        parser.add_argument("--" + kind.replace("_", "-"), choices=choices,
+                            help="Resolve without prompting (default: ask)")
+    parser.add_argument("--report", help="Write every conflict decision to this JSONL file")
+    parser.add_argument("stat_type", nargs="?", choices=expected_pos.keys(), help="Stat category")
+    args = parser.parse_args()
 
-    with open("fantasy.json", "w", encoding="utf-8") as f:
-        json.dump(fantasy_data, f, indent=2)
+    season = f"S{args.season}"
+    for kind in POLICY_CHOICES:
+        policy[kind] = getattr(args, kind)
+
+    if args.batch:
+        if args.batch.lower().endswith(".json"):
+            jobs = load_manifest(args.batch, season)
+        else:
+            files = sorted(glob.glob(args.batch))
+            if not files:
+                parser.error(f"No files match {args.batch}")
+            try:
+                jobs = [infer_job(f, season) for f in files]
+            except ValueError as e:
+                parser.error(str(e))
+        run_batch(jobs, workers=args.workers, assume_yes=args.yes, path=args.input, fuzzy=args.fuzzy_suffix,
+                  report=args.report)
+        raise SystemExit(0)
+
+    if not (args.file and args.stat_type):
+        parser.error("--file and stat_type are required (or use --batch)")
+
+    try:
+        run_single(args, season)
+    finally:
+        if args.report:
+            write_report(args.report, decisions)